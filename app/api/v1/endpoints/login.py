@@ -3,18 +3,23 @@ from datetime import date
 
 from app.models.schema import LoginResponse, SearchRequest, SearchResponse
 from app.services.fpg_http_client import FpgHttpClient
+from app.services.fpg_session_cache import FpgSessionCache
 from app.services.taiwan_case_filter import filter_taiwan_cases
 
 router = APIRouter()
 
+# API 行程內沿用登入 session，避免每個請求都跑驗證碼
+_session_cache = FpgSessionCache.in_memory()
+
 
 @router.post("/login", response_model=LoginResponse)
 async def login():
     """HTTP 登入探測（不開瀏覽器）。"""
     try:
-        async with FpgHttpClient() as fpg:
-            await fpg.login()
-        return {"status": "success", "message": "HTTP 登入成功"}
+        async with FpgHttpClient(session_cache=_session_cache) as fpg:
+            reused = await fpg.ensure_login()
+        message = "HTTP 登入成功（沿用 session）" if reused else "HTTP 登入成功"
+        return {"status": "success", "message": message}
     except Exception as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
@@ -34,8 +39,8 @@ async def search_bulletins(search_params: SearchRequest = None):
     end = (search_params.end_date or date.today()).strftime("%Y/%m/%d")
 
     try:
-        async with FpgHttpClient() as fpg:
-            await fpg.login()
+        async with FpgHttpClient(session_cache=_session_cache) as fpg:
+            await fpg.ensure_login()
             bases = await fpg.search_bulletin_by_announce_date(start, end)
         kept, skipped = filter_taiwan_cases(bases)
         return {
@@ -22,6 +22,51 @@ class Settings(BaseSettings):
     FPG_USERNAME: str
     FPG_PASSWORD: str
     LOGIN_URL: str
+    # 案件同時擷取數（每案一個獨立登入 session，pool 至少開這麼多；1=逐案）；
+    # FPG 站台總請求速率上限（0=不限）
+    FPG_ENRICH_CONCURRENCY: int = 1
+    FPG_MAX_RPS: float = 4.0
+    # 暫時性錯誤重試（冪等讀取）：次數、指數退避起始／上限秒數
+    FPG_RETRY_ATTEMPTS: int = 3
+    FPG_RETRY_BACKOFF: float = 1.0
+    FPG_RETRY_BACKOFF_MAX: float = 20.0
+    # 斷路器：連續失敗幾次跳脫、暫停秒數、連續跳脫幾次放棄（0=不放棄）
+    FPG_BREAKER_THRESHOLD: int = 8
+    FPG_BREAKER_COOLDOWN: float = 60.0
+    FPG_BREAKER_MAX_TRIPS: int = 3
+    # 報價單擷取用的獨立登入 session 數（1=單一 session）
+    FPG_SESSION_POOL_SIZE: int = 1
+    # 公報分頁（第 2 頁起）併發抓取上限
+    FPG_BULLETIN_CONCURRENCY: int = 4
+    # 本機快取（登入 session 等）目錄；session 快取有效秒數
+    FPG_CACHE_DIR: str = "app/utils/screenshots/cache"
+    FPG_SESSION_MAX_AGE: int = 6 * 3600
+    # 單日公報解析結果快取秒數（僅前天以前的公告日；今天／昨天一律重抓；0=停用）
+    FPG_BULLETIN_CACHE_TTL: int = 30 * 86400
+
+    # HTTP 連線池（FPG／PCC client 共用設定）：keep-alive 秒數、總連線／每主機上限、DNS 快取秒數
+    HTTP_KEEPALIVE_SECONDS: float = 30.0
+    HTTP_POOL_LIMIT: int = 100
+    HTTP_LIMIT_PER_HOST: int = 8
+    HTTP_DNS_TTL: int = 300
+    # 連線建立／單次讀取逾時秒數（總逾時仍由各 client 決定）
+    HTTP_CONNECT_TIMEOUT: float = 15.0
+    HTTP_READ_TIMEOUT: float = 60.0
+    # 同一行程內 FPG 與 PCC client 共用一個 connector（API 行程、同時跑兩套歸檔）
+    HTTP_SHARE_CONNECTOR: bool = False
+    # HTTP 錄製／重播：cassette 路徑（空＝停用）、模式 record／replay、重播延遲倍率（0＝不等待）
+    HTTP_CASSETTE: str = ""
+    HTTP_CASSETTE_MODE: str = "replay"
+    HTTP_CASSETTE_LATENCY: float = 0.0
+
+    # 原始 HTML 快照（gzip＋每次執行一個 JSONL 索引）；預設關閉，--snapshots 或此設定開啟
+    HTML_SNAPSHOT_ENABLED: bool = False
+    HTML_SNAPSHOT_DIR: str = "app/utils/screenshots/snapshots"
+    # --from-snapshots 離線重新解析的行程數（0＝CPU 核心數）
+    HTML_REPARSE_WORKERS: int = 0
+    # HTML 解析執行器：inline／thread／process（見 parse_executor）；池大小 0＝CPU 核心數
+    PARSE_EXECUTOR: str = "thread"
+    PARSE_WORKERS: int = 0
 
     # Telegram 設定
     TELEGRAM_BOT_TOKEN: Optional[str] = None
@@ -3,6 +3,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1.router import api_router
 from app.core.config import settings
 from app.core.logging import setup_logging
+from app.services.http_connector import close_shared_connector
+from app.services.parse_executor import shutdown_parse_executor
 from dotenv import load_dotenv
 
 setup_logging()
@@ -24,6 +26,14 @@ app.include_router(api_router, prefix="/api/v1")
 
 load_dotenv()  # 加載 .env 文件
 
+@app.on_event("shutdown")
+async def close_http_connector():
+    # HTTP_SHARE_CONNECTOR 開啟時，FPG／PCC client 共用的連線池
+    await close_shared_connector()
+    # FPG／PCC client 共用的 HTML 解析執行緒／行程池
+    shutdown_parse_executor()
+
+
 @app.get("/health")
 async def health_check():
     return {"status": "ok"}
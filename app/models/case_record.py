@@ -1,8 +1,10 @@
 """標售案件歸檔用資料模型。"""
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Optional
+import hashlib
+import json
+from dataclasses import asdict, dataclass, field, fields
+from typing import Any, Optional
 
 
 @dataclass
@@ -20,6 +22,20 @@ class QuoteItem:
         return "｜".join(parts)
 
 
+# 公報清單可取得的欄位；enrichment 前後皆相同才算「公報資料未變」
+BULLETIN_FINGERPRINT_FIELDS = (
+    "tndsalno",
+    "inqcnt",
+    "bid_channel",
+    "location",
+    "announce_date",
+    "quote_deadline",
+    "plant_contact",
+    "plant_phone",
+    "eco_code",
+)
+
+
 @dataclass
 class CaseRecord:
     """一筆標售案（案號 + 詢價次數）。"""
@@ -44,6 +60,8 @@ class CaseRecord:
     zip_path: Optional[str] = None
     zip_sha256: str = ""
     source_url: str = ""
+    # 公報摘要欄位的指紋（enrichment 前計算），用於判斷與上次歸檔是否相同
+    bulletin_fingerprint: str = ""
     status: str = "new"
     error: str = ""
 
@@ -51,6 +69,26 @@ class CaseRecord:
     def case_key(self) -> str:
         return f"{self.tndsalno}/{self.inqcnt}"
 
+    def compute_bulletin_fingerprint(self) -> str:
+        payload = [getattr(self, name) for name in BULLETIN_FINGERPRINT_FIELDS]
+        payload.append([[i.description, i.quantity] for i in self.items])
+        raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:24]
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "CaseRecord":
+        """由 to_dict() 結果還原；未知欄位忽略（快取檔可跨版本讀取）。"""
+        known = {f.name for f in fields(cls)}
+        values = {key: value for key, value in data.items() if key in known}
+        values["items"] = [
+            item if isinstance(item, QuoteItem) else QuoteItem(**item)
+            for item in values.get("items") or []
+        ]
+        return cls(**values)
+
     @property
     def is_incomplete_shell(self) -> bool:
         """僅有案號、缺截止日與內容 → 寫入 Notion 會被截止日篩選藏起。"""
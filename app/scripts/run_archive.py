@@ -5,6 +5,16 @@
   python -m app.scripts.run_archive --date 2026/07/22
   python -m app.scripts.run_archive --start 2026/07/22 --end 2026/07/22
   python -m app.scripts.run_archive --skip-claim
+  python -m app.scripts.run_archive --concurrency 4 --max-rps 3
+  python -m app.scripts.run_archive --fresh-login
+  python -m app.scripts.run_archive --sessions 3
+  python -m app.scripts.run_archive --metrics-file fpg_metrics.json
+  python -m app.scripts.run_archive --delta
+  python -m app.scripts.run_archive --snapshots
+  python -m app.scripts.run_archive --from-snapshots
+  python -m app.scripts.run_archive --from-snapshots 20260722T080000-fpg --workers 8
+  python -m app.scripts.run_archive --pipeline --sessions 2
+  python -m app.scripts.run_archive --backfill --start 2026/06/01 --end 2026/06/30 --sessions 3
 """
 from __future__ import annotations
 
@@ -16,8 +26,18 @@ from datetime import date, datetime
 from pathlib import Path
 
 from app.core.config import settings
+from app.services.archive_delta import split_unchanged
+from app.services.bulletin_cache import BulletinCache
+from app.services.channel_routes import ChannelRouteBook
+from app.services.fpg_backfill import BackfillCheckpoint, day_shards, run_day_shards
 from app.services.fpg_http_client import FpgHttpClient
+from app.services.fpg_parser import to_iso_date
+from app.services.fpg_session_pool import FpgSessionPool
+from app.services.html_snapshot_store import HtmlSnapshotStore
+from app.services.http_connector import close_shared_connector
 from app.services.notion_archive_service import NotionArchiveService
+from app.services.request_policy import RateLimiter
+from app.services.snapshot_reparse import latest_run_id, reparse_fpg_run
 from app.services.taiwan_case_filter import filter_taiwan_cases
 from app.utils.telegram_digest import (
     DEFAULT_DIGEST_PATH,
@@ -62,14 +82,101 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         action="store_true",
         help="略過公報「轉報價」（預設會對尚未選取的台灣案先 goSave）",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help=(
+            "同時擷取的案件數，每案各用一個獨立登入 session（預設 FPG_ENRICH_CONCURRENCY；"
+            "session 數取此值與 --sessions 較大者）"
+        ),
+    )
+    parser.add_argument(
+        "--max-rps",
+        type=float,
+        default=None,
+        help="FPG 站台每秒請求上限（預設 FPG_MAX_RPS；0=不限）",
+    )
+    parser.add_argument(
+        "--sessions",
+        type=int,
+        default=None,
+        help="報價單擷取用的獨立登入 session 數（預設 FPG_SESSION_POOL_SIZE）",
+    )
+    parser.add_argument(
+        "--fresh-login",
+        action="store_true",
+        help="不沿用快取的 FPG 登入 session，強制驗證碼登入",
+    )
+    parser.add_argument(
+        "--backfill",
+        action="store_true",
+        help="依公告日逐日回填：各日交給空閒 session 併發處理，完成日寫入 checkpoint 可接續",
+    )
+    parser.add_argument(
+        "--reset-checkpoint",
+        action="store_true",
+        help="回填時忽略既有 checkpoint，整個區間重跑",
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help=(
+            "轉報價與 enrichment 管線化：每批 goSave 完成即由其他 session 擷取該批報價單"
+            "（需 FPG_SESSION_POOL_SIZE > 1 才會重疊）"
+        ),
+    )
+    parser.add_argument(
+        "--delta",
+        action="store_true",
+        help="公報資料與上次歸檔相同的案略過 enrichment，只更新 Notion「最後確認」",
+    )
+    parser.add_argument(
+        "--no-bulletin-cache",
+        action="store_true",
+        help="不讀寫單日公報快取，過去公告日也重新查 FPG",
+    )
+    parser.add_argument(
+        "--snapshots",
+        action="store_true",
+        help="保存抓到的原始 HTML（gzip，HTML_SNAPSHOT_DIR），供離線重新解析",
+    )
+    parser.add_argument(
+        "--from-snapshots",
+        nargs="?",
+        const="latest",
+        default=None,
+        metavar="RUN_ID",
+        help="不連 FPG：以某次 --snapshots 保存的 HTML 重新解析後寫入 Notion（預設最近一次）",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="--from-snapshots 解析行程數（預設 HTML_REPARSE_WORKERS；0=CPU 核心數）",
+    )
     parser.add_argument(
         "--digest-file",
         default=str(DEFAULT_DIGEST_PATH),
         help="Telegram 速覽輸出路徑（預設 telegram_digest.txt）",
     )
+    parser.add_argument(
+        "--metrics-file",
+        default=None,
+        help="FPG 請求統計 JSON 輸出路徑（預設與 digest 同目錄的 fpg_metrics.json）",
+    )
     return parser.parse_args(argv)
 
 
+def _session_count(args: argparse.Namespace) -> int:
+    """報價單表單狀態綁在 session 上，併發擷取只能靠多開 session。"""
+    sessions = settings.FPG_SESSION_POOL_SIZE if args.sessions is None else args.sessions
+    concurrency = settings.FPG_ENRICH_CONCURRENCY
+    if args.concurrency is not None:
+        concurrency = args.concurrency
+    return max(1, sessions, concurrency)
+
+
 def resolve_date_range(args: argparse.Namespace) -> tuple[str, str]:
     if args.date:
         return args.date, args.date
@@ -91,6 +198,7 @@ def _emit_digest(
     err: int,
     elapsed_s: float,
     shells: list | None = None,
+    unchanged: int = 0,
 ) -> None:
     urls = [(p or {}).get("url") if p else None for p in pages]
     text = build_fpg_digest(
@@ -101,86 +209,323 @@ def _emit_digest(
         err=err,
         elapsed_s=elapsed_s,
         shells=shells,
+        unchanged=unchanged,
     )
     write_digest(text, path)
     logger.info("已寫入 Telegram digest → %s（%s 字）", path, len(text))
 
 
+def _emit_metrics(
+    pool: FpgSessionPool,
+    *,
+    path: Path,
+    announce_label: str,
+    elapsed_s: float,
+) -> None:
+    metrics = pool.metrics
+    metrics.log_summary()
+    if pool.snapshots is not None:
+        pool.snapshots.log_summary()
+    decoding = pool.decoder.stats()
+    logger.info(
+        "[HTTP] 編碼偵測 %s 次、已知編碼失敗改偵測 %s 次：%s",
+        decoding["detections"],
+        decoding["fallbacks"],
+        decoding["encodings"],
+    )
+    try:
+        metrics.write(
+            path,
+            announce=announce_label,
+            finished_at=datetime.now().isoformat(timespec="seconds"),
+            elapsed_s=round(elapsed_s, 1),
+            decoding=decoding,
+        )
+    except OSError:
+        logger.exception("寫入請求統計失敗 %s", path)
+        return
+    logger.info("已寫入 FPG 請求統計 → %s", path)
+
+
+async def _search_bases(
+    args: argparse.Namespace,
+    fpg: FpgHttpClient,
+    start: str,
+    end: str,
+) -> list:
+    bases = await fpg.search_bulletin_by_announce_date(start, end)
+    if not args.include_mainland:
+        bases, skipped = filter_taiwan_cases(bases)
+        logger.info(
+            "台灣案篩選：保留 %s、排除大陸/非台灣 %s",
+            len(bases),
+            len(skipped),
+        )
+        for record in skipped:
+            logger.info(
+                "[SKIP] %s 電話=%s 聯絡人=%s",
+                record.case_key,
+                record.plant_phone or "(空)",
+                record.contact_display,
+            )
+    if args.limit and args.limit > 0:
+        bases = bases[: args.limit]
+    logger.info("待擷取案件數（%s~%s）：%s", start, end, len(bases))
+    return bases
+
+
+async def _claim(fpg: FpgHttpClient, start: str, end: str, bases: list) -> None:
+    allowed = {(r.tndsalno, r.inqcnt) for r in bases}
+    claimed = await fpg.claim_unselected_cases(
+        start,
+        end,
+        allowed_keys=allowed,
+    )
+    _log_claimed(claimed)
+
+
+def _log_claimed(claimed: list[tuple[str, str, str]]) -> None:
+    logger.info("轉報價完成：實際送出 %s 案", len(claimed))
+    for blocid, tnd, inq in claimed:
+        logger.info("[CLAIM] %s/%s blocid=%s", tnd, inq, blocid)
+
+
+async def _prepare_notion(
+    args: argparse.Namespace,
+    notion: NotionArchiveService,
+) -> None:
+    await notion.ensure_schema()
+    if not args.skip_notion_view:
+        try:
+            await notion.configure_desktop_table()
+        except Exception:
+            logger.exception("調整 Notion view 失敗（不中斷歸檔）")
+
+
+async def _upsert(notion: NotionArchiveService, records: list) -> list:
+    """空殼不寫入 Notion；回傳與 records 對齊的 pages（空殼對應 None）。"""
+    to_upsert = []
+    for record in records:
+        if record.mark_incomplete_shell():
+            logger.error(
+                "[SHELL] 不寫入 Notion %s 聯絡人=%s 截止=%s %s",
+                record.case_key,
+                record.contact_display or "(空)",
+                record.quote_deadline or "(空)",
+                record.error,
+            )
+            continue
+        to_upsert.append(record)
+    pages = await notion.upsert_many(to_upsert)
+    page_by_key = {r.case_key: p for r, p in zip(to_upsert, pages)}
+    return [page_by_key.get(r.case_key) for r in records]
+
+
+async def _skip_unchanged(
+    notion: NotionArchiveService,
+    bases: list,
+    start: str,
+    end: str,
+) -> tuple[list, int]:
+    """差異模式：回傳需 enrichment 的案與未變更（僅更新最後確認）的案數。"""
+    archived = await notion.archived_fingerprints(to_iso_date(start), to_iso_date(end))
+    changed, unchanged = split_unchanged(bases, archived)
+    confirmed = 0
+    for record, page in unchanged:
+        try:
+            await notion.confirm_unchanged(page["page_id"])
+        except Exception:
+            logger.exception("更新最後確認失敗，改為完整擷取 %s", record.case_key)
+            changed.append(record)
+            continue
+        confirmed += 1
+        logger.info("[SAME] %s 公報未變更，僅更新最後確認", record.case_key)
+    logger.info("差異模式：需擷取 %s 案、未變更 %s 案", len(changed), confirmed)
+    return changed, confirmed
+
+
+async def _run_backfill(
+    args: argparse.Namespace,
+    pool: FpgSessionPool,
+    notion: NotionArchiveService,
+    start: str,
+    end: str,
+) -> tuple[list, list, int, list[str]]:
+    """逐日 shard：搜尋 → 轉報價 → enrichment → Notion，同一日全程用同一個 session。
+
+    回傳 (records, pages, 未變更案數, 中斷的公告日)；各日內案件全數成功才寫入 checkpoint。
+    """
+    days = day_shards(start, end)
+    checkpoint = BackfillCheckpoint.from_settings(start, end)
+    if args.reset_checkpoint:
+        checkpoint.clear()
+    logger.info(
+        "回填 %s 日（sessions=%s，checkpoint=%s）",
+        len(days),
+        len(pool.clients),
+        checkpoint.path,
+    )
+    await _prepare_notion(args, notion)
+
+    async def process_day(
+        fpg: FpgHttpClient, day: str
+    ) -> tuple[tuple[list, list, int], bool]:
+        searched = bases = await _search_bases(args, fpg, day, day)
+        same = 0
+        if bases and args.delta:
+            bases, same = await _skip_unchanged(notion, bases, day, day)
+        if not bases:
+            return ([], [], same), True
+        if not args.skip_claim:
+            # 未變更的案也留在轉報價清單：尚未選取的照樣轉
+            await _claim(fpg, day, day, searched)
+        day_records = await fpg.fetch_cases(bases)
+        day_pages = await _upsert(notion, day_records)
+        complete = all(r.status != "error" for r in day_records)
+        return (day_records, day_pages, same), complete
+
+    results = await run_day_shards(pool, days, process_day, checkpoint=checkpoint)
+    records: list = []
+    pages: list = []
+    unchanged = 0
+    for day in days:
+        if day in results:
+            day_records, day_pages, same = results[day]
+            records.extend(day_records)
+            pages.extend(day_pages)
+            unchanged += same
+    failed = [day for day in days if day not in results and day not in checkpoint.done]
+    return records, pages, unchanged, failed
+
+
+async def _run_from_snapshots(args: argparse.Namespace, digest_path: Path) -> int:
+    """離線重新解析某次執行的 HTML 快照並 upsert；不登入、不連 FPG。"""
+    started = datetime.now()
+    store = HtmlSnapshotStore.from_settings()
+    run_id = args.from_snapshots
+    if run_id == "latest":
+        run_id = latest_run_id(store, "fpg")
+    if not run_id or run_id not in store.run_ids():
+        logger.error("找不到 FPG 快照 %s（%s）", args.from_snapshots, store.index_dir)
+        return 2
+    workers = args.workers if args.workers is not None else settings.HTML_REPARSE_WORKERS
+    records = reparse_fpg_run(store, run_id, workers=workers)
+    if not args.include_mainland:
+        records, skipped = filter_taiwan_cases(records)
+        logger.info("台灣案篩選：保留 %s、排除 %s", len(records), len(skipped))
+    if args.limit and args.limit > 0:
+        records = records[: args.limit]
+    logger.info(
+        "快照 %s 重新解析 %s 案（%.1fs）",
+        run_id,
+        len(records),
+        (datetime.now() - started).total_seconds(),
+    )
+    pages: list = []
+    if records:
+        async with NotionArchiveService() as notion:
+            await _prepare_notion(args, notion)
+            pages = await _upsert(notion, records)
+    ok = sum(1 for r in records if r.status != "error")
+    err = sum(1 for r in records if r.status == "error")
+    elapsed = (datetime.now() - started).total_seconds()
+    logger.info(
+        "完成（快照 %s）：成功 %s、失敗 %s、Notion pages %s、耗時 %.1fs",
+        run_id,
+        ok,
+        err,
+        sum(1 for p in pages if p),
+        elapsed,
+    )
+    _emit_digest(
+        path=digest_path,
+        announce_label=f"快照 {run_id}",
+        records=records,
+        pages=pages,
+        ok=ok,
+        err=err,
+        elapsed_s=elapsed,
+        shells=[r for r in records if r.is_incomplete_shell],
+    )
+    return 0 if err == 0 else 1
+
+
 async def run_archive(args: argparse.Namespace) -> int:
+    try:
+        return await _run_archive(args)
+    finally:
+        # HTTP_SHARE_CONNECTOR 的共用連線池不隨 session 關閉，結束前收掉
+        await close_shared_connector()
+
+
+async def _run_archive(args: argparse.Namespace) -> int:
     start, end = resolve_date_range(args)
     announce_label = start if start == end else f"{start}~{end}"
     digest_path = Path(args.digest_file)
+    metrics_path = (
+        Path(args.metrics_file)
+        if args.metrics_file
+        else digest_path.with_name("fpg_metrics.json")
+    )
     started = datetime.now()
-    logger.info("開始歸檔公告日 %s ~ %s", start, end)
 
     if not settings.NOTION_TOKEN or not settings.NOTION_DATABASE_ID:
         logger.error("請先設定 NOTION_TOKEN / NOTION_DATABASE_ID")
         return 2
+    if args.from_snapshots:
+        return await _run_from_snapshots(args, digest_path)
+    logger.info("開始歸檔公告日 %s ~ %s", start, end)
 
     records = []
     pages: list = []
+    failed_days: list[str] = []
+    unchanged = 0
+    rate_limiter = (
+        RateLimiter(args.max_rps) if args.max_rps is not None else None
+    )
+    pool = FpgSessionPool(
+        _session_count(args),
+        rate_limiter=rate_limiter,
+        use_session_cache=not args.fresh_login,
+        channel_routes=ChannelRouteBook.from_settings(),
+        bulletin_cache=(
+            None if args.no_bulletin_cache else BulletinCache.from_settings()
+        ),
+        snapshots=HtmlSnapshotStore.for_run("fpg", enabled=args.snapshots),
+    )
 
     try:
-        async with FpgHttpClient() as fpg, NotionArchiveService() as notion:
-            await fpg.login()
-            bases = await fpg.search_bulletin_by_announce_date(start, end)
-            if not args.include_mainland:
-                bases, skipped = filter_taiwan_cases(bases)
-                logger.info(
-                    "台灣案篩選：保留 %s、排除大陸/非台灣 %s",
-                    len(bases),
-                    len(skipped),
+        async with pool, NotionArchiveService() as notion:
+            await pool.login_all()
+            if args.backfill:
+                records, pages, unchanged, failed_days = await _run_backfill(
+                    args, pool, notion, start, end
                 )
-                for record in skipped:
-                    logger.info(
-                        "[SKIP] %s 電話=%s 聯絡人=%s",
-                        record.case_key,
-                        record.plant_phone or "(空)",
-                        record.contact_display,
-                    )
-            if args.limit and args.limit > 0:
-                bases = bases[: args.limit]
-            logger.info("待擷取案件數：%s", len(bases))
-
-            if bases and not args.skip_claim:
-                allowed = {(r.tndsalno, r.inqcnt) for r in bases}
-                claimed = await fpg.claim_unselected_cases(
-                    start,
-                    end,
-                    allowed_keys=allowed,
-                )
-                logger.info("轉報價完成：實際送出 %s 案", len(claimed))
-                for blocid, tnd, inq in claimed:
-                    logger.info("[CLAIM] %s/%s blocid=%s", tnd, inq, blocid)
-
-            if bases:
-                await notion.ensure_schema()
-                if not args.skip_notion_view:
-                    try:
-                        await notion.configure_desktop_table()
-                    except Exception:
-                        logger.exception("調整 Notion view 失敗（不中斷歸檔）")
-                records = await fpg.fetch_cases(bases)
-                to_upsert = []
-                for record in records:
-                    if record.mark_incomplete_shell():
-                        logger.error(
-                            "[SHELL] 不寫入 Notion %s 聯絡人=%s 截止=%s %s",
-                            record.case_key,
-                            record.contact_display or "(空)",
-                            record.quote_deadline or "(空)",
-                            record.error,
-                        )
-                        continue
-                    to_upsert.append(record)
-                pages = await notion.upsert_many(to_upsert)
-                # digest 需要與 records 對齊：空殼對應 None
-                page_by_key = {
-                    r.case_key: p for r, p in zip(to_upsert, pages)
-                }
-                pages = [page_by_key.get(r.case_key) for r in records]
             else:
-                logger.warning("今日無（台灣）公告案件")
+                fpg = pool.primary
+                searched = bases = await _search_bases(args, fpg, start, end)
+                if bases:
+                    await _prepare_notion(args, notion)
+                    if args.delta:
+                        bases, unchanged = await _skip_unchanged(
+                            notion, bases, start, end
+                        )
+                if bases and args.pipeline and not args.skip_claim:
+                    records, claimed = await pool.claim_and_fetch(
+                        start,
+                        end,
+                        bases,
+                        claim_keys=[(r.tndsalno, r.inqcnt) for r in searched],
+                    )
+                    _log_claimed(claimed)
+                    pages = await _upsert(notion, records)
+                elif bases:
+                    if not args.skip_claim:
+                        await _claim(fpg, start, end, searched)
+                    records = await pool.fetch_cases(bases)
+                    pages = await _upsert(notion, records)
+                elif not unchanged:
+                    logger.warning("今日無（台灣）公告案件")
     except Exception as exc:
         elapsed = (datetime.now() - started).total_seconds()
         logger.exception("歸檔中斷：%s", exc)
@@ -192,17 +537,26 @@ async def run_archive(args: argparse.Namespace) -> int:
             ),
             digest_path,
         )
+        _emit_metrics(
+            pool,
+            path=metrics_path,
+            announce_label=announce_label,
+            elapsed_s=elapsed,
+        )
         return 1
 
     shells = [r for r in records if r.is_incomplete_shell]
     ok = sum(1 for r in records if r.status != "error")
     err = sum(1 for r in records if r.status == "error")
     elapsed = (datetime.now() - started).total_seconds()
+    if failed_days:
+        logger.error("回填中斷的公告日（未寫入 checkpoint）：%s", "、".join(failed_days))
     logger.info(
-        "完成：成功 %s、失敗 %s、空殼略過 %s、Notion pages %s、耗時 %.1fs",
+        "完成：成功 %s、失敗 %s、空殼略過 %s、未變更 %s、Notion pages %s、耗時 %.1fs",
         ok,
         err,
         len(shells),
+        unchanged,
         sum(1 for p in pages if p),
         elapsed,
     )
@@ -232,8 +586,15 @@ async def run_archive(args: argparse.Namespace) -> int:
         err=err,
         elapsed_s=elapsed,
         shells=shells,
+        unchanged=unchanged,
     )
-    return 0 if err == 0 else 1
+    _emit_metrics(
+        pool,
+        path=metrics_path,
+        announce_label=announce_label,
+        elapsed_s=elapsed,
+    )
+    return 0 if err == 0 and not failed_days else 1
 
 
 def main(argv: list[str] | None = None) -> None:
@@ -5,6 +5,8 @@
   python -m app.scripts.run_pcc_archive --date 2026/07/22
   python -m app.scripts.run_pcc_archive --start 2026/07/22 --end 2026/07/29
   python -m app.scripts.run_pcc_archive --days 3
+  python -m app.scripts.run_pcc_archive --snapshots
+  python -m app.scripts.run_pcc_archive --from-snapshots   # 以最近一次快照離線重新解析
 
 歷史回填（依截止投標）:
   python -m app.scripts.run_pcc_archive --deadline-from 2026/07/29
@@ -19,8 +21,11 @@ from datetime import date, datetime, timedelta
 from pathlib import Path
 
 from app.core.config import settings
+from app.services.html_snapshot_store import HtmlSnapshotStore
+from app.services.http_connector import close_shared_connector
 from app.services.pcc_http_client import DEFAULT_DEADLINE_END, PccHttpClient
 from app.services.pcc_notion_archive_service import PccNotionArchiveService
+from app.services.snapshot_reparse import latest_run_id, reparse_pcc_run
 from app.utils.telegram_digest import (
     DEFAULT_DIGEST_PATH,
     build_pcc_digest,
@@ -67,6 +72,25 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         action="store_true",
         help="略過調整桌面／月 view",
     )
+    parser.add_argument(
+        "--snapshots",
+        action="store_true",
+        help="保存抓到的原始 HTML（gzip，HTML_SNAPSHOT_DIR），供離線重新解析",
+    )
+    parser.add_argument(
+        "--from-snapshots",
+        nargs="?",
+        const="latest",
+        default=None,
+        metavar="RUN_ID",
+        help="不連 PCC：以某次 --snapshots 保存的 HTML 重新解析後寫入 Notion（預設最近一次）",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="--from-snapshots 解析行程數（預設 HTML_REPARSE_WORKERS；0=CPU 核心數）",
+    )
     parser.add_argument(
         "--digest-file",
         default=str(DEFAULT_DIGEST_PATH),
@@ -128,7 +152,73 @@ def _emit_digest(
     logger.info("已寫入 Telegram digest → %s（%s 字）", path, len(text))
 
 
+async def _prepare_notion(
+    args: argparse.Namespace, notion: PccNotionArchiveService
+) -> None:
+    await notion.ensure_schema()
+    if not args.skip_notion_view:
+        try:
+            await notion.configure_desktop_table()
+        except Exception:
+            logger.exception("調整 PCC Notion view 失敗（不中斷歸檔）")
+
+
+async def _run_from_snapshots(args: argparse.Namespace, digest_path: Path) -> int:
+    """離線重新解析某次執行的 HTML 快照並 upsert；不連 PCC。"""
+    started = datetime.now()
+    store = HtmlSnapshotStore.from_settings()
+    run_id = args.from_snapshots
+    if run_id == "latest":
+        run_id = latest_run_id(store, "pcc")
+    if not run_id or run_id not in store.run_ids():
+        logger.error("找不到 PCC 快照 %s（%s）", args.from_snapshots, store.index_dir)
+        return 2
+    workers = args.workers if args.workers is not None else settings.HTML_REPARSE_WORKERS
+    records = reparse_pcc_run(store, run_id, workers=workers)
+    if args.limit and args.limit > 0:
+        records = records[: args.limit]
+    pages: list = []
+    if records:
+        async with PccNotionArchiveService() as notion:
+            await _prepare_notion(args, notion)
+            pages = await notion.upsert_many(records)
+    ok = sum(1 for r in records if r.status != "error")
+    err = sum(1 for r in records if r.status == "error")
+    elapsed = (datetime.now() - started).total_seconds()
+    logger.info(
+        "完成（快照 %s）：成功 %s、失敗 %s、Notion pages %s、耗時 %.1fs",
+        run_id,
+        ok,
+        err,
+        sum(1 for p in pages if p),
+        elapsed,
+    )
+    _emit_digest(
+        path=digest_path,
+        range_label=f"快照 {run_id}",
+        records=records,
+        ok=ok,
+        err=err,
+        elapsed_s=elapsed,
+    )
+    return 0 if err == 0 else 1
+
+
 async def run_pcc_archive(args: argparse.Namespace) -> int:
+    try:
+        return await _run_pcc_archive(args)
+    finally:
+        # HTTP_SHARE_CONNECTOR 的共用連線池不隨 session 關閉，結束前收掉
+        await close_shared_connector()
+
+
+async def _run_pcc_archive(args: argparse.Namespace) -> int:
+    if args.from_snapshots:
+        if not settings.NOTION_TOKEN or not settings.PCC_NOTION_DATABASE_ID:
+            logger.error("請先設定 NOTION_TOKEN / PCC_NOTION_DATABASE_ID")
+            return 2
+        return await _run_from_snapshots(args, Path(args.digest_file))
+
     use_deadline = bool(args.deadline_from)
     if use_deadline and (args.date or args.start or args.end or args.days is not None):
         logger.error("請勿同時指定公告日參數與 --deadline-from")
@@ -157,7 +247,11 @@ async def run_pcc_archive(args: argparse.Namespace) -> int:
     records = []
     pages: list = []
 
-    async with PccHttpClient() as pcc, PccNotionArchiveService() as notion:
+    snapshots = HtmlSnapshotStore.for_run("pcc", enabled=args.snapshots)
+
+    async with PccHttpClient(
+        snapshots=snapshots
+    ) as pcc, PccNotionArchiveService() as notion:
         if use_deadline:
             bases = await pcc.search_by_tender_deadline(start, end)
         else:
@@ -167,16 +261,20 @@ async def run_pcc_archive(args: argparse.Namespace) -> int:
         logger.info("待擷取案件數：%s", len(bases))
 
         if bases:
-            await notion.ensure_schema()
-            if not args.skip_notion_view:
-                try:
-                    await notion.configure_desktop_table()
-                except Exception:
-                    logger.exception("調整 PCC Notion view 失敗（不中斷歸檔）")
+            await _prepare_notion(args, notion)
             records = await pcc.fetch_cases(bases)
             pages = await notion.upsert_many(records)
         else:
             logger.warning("區間內無財物變賣案件")
+        decoding = pcc.decoder.stats()
+        logger.info(
+            "PCC 回應編碼：偵測 %s 次、已知編碼失敗改偵測 %s 次 %s",
+            decoding["detections"],
+            decoding["fallbacks"],
+            decoding["encodings"],
+        )
+    if snapshots is not None:
+        snapshots.log_summary()
 
     ok = sum(1 for r in records if r.status != "error")
     err = sum(1 for r in records if r.status == "error")
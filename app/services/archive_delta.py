@@ -0,0 +1,42 @@
+"""差異歸檔：公報指紋與上次歸檔相同的案不再跑 enrichment（goList/goQuo/goInq＋ZIP）。"""
+from __future__ import annotations
+
+from urllib.parse import urlsplit
+
+from app.models.case_record import CaseRecord
+from app.services.fpg_urls import BID_POST_PATH, CMP_BID_POST_PATH
+
+# enrichment 找到報價單時「來源 URL」是標案／競標管理 servlet；只有公報摘要時是公報頁
+QUOTATION_PATHS = (BID_POST_PATH, CMP_BID_POST_PATH)
+
+
+def has_quotation(page: dict) -> bool:
+    return urlsplit(page.get("source_url") or "").path in QUOTATION_PATHS
+
+
+def split_unchanged(
+    bases: list[CaseRecord],
+    archived: dict[str, dict],
+) -> tuple[list[CaseRecord], list[tuple[CaseRecord, dict]]]:
+    """回傳 (需 enrichment 的案, [(未變更的案, 已歸檔頁資訊)])。
+
+    上次歸檔為 error、只有公報摘要（尚未轉報價或報價單未出現）、
+    或當時尚未記錄指紋的頁面一律重跑。
+    """
+    changed: list[CaseRecord] = []
+    unchanged: list[tuple[CaseRecord, dict]] = []
+    for base in bases:
+        fingerprint = base.bulletin_fingerprint or base.compute_bulletin_fingerprint()
+        base.bulletin_fingerprint = fingerprint
+        page = archived.get(base.case_key)
+        if (
+            page
+            and page.get("page_id")
+            and page.get("fingerprint") == fingerprint
+            and page.get("status") != "error"
+            and has_quotation(page)
+        ):
+            unchanged.append((base, page))
+        else:
+            changed.append(base)
+    return changed, unchanged
@@ -0,0 +1,148 @@
+"""附件 content-addressed 儲存：blob 以 SHA-256 命名，另存 zip_url → (sha, size, last_seen) 索引。
+
+同一 zip_url 再次出現時，先以條件式請求（ETag／Last-Modified）或大小比對確認未變，
+就能略過下載 body；不同詢價輪次的附件也不會互相覆蓋。
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "index.json"
+
+
+@dataclass
+class AttachmentEntry:
+    sha256: str
+    size: int
+    last_seen: str
+    etag: str = ""
+    last_modified: str = ""
+
+    @property
+    def has_validators(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+
+class AttachmentStore:
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.blob_dir = root / "blobs"
+        self.index_path = root / INDEX_FILENAME
+        self._index: dict[str, AttachmentEntry] = self._load_index()
+
+    def _load_index(self) -> dict[str, AttachmentEntry]:
+        if not self.index_path.is_file():
+            return {}
+        try:
+            raw = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            logger.warning("附件索引無法讀取，重建 %s", self.index_path)
+            return {}
+        index: dict[str, AttachmentEntry] = {}
+        for url, data in raw.items():
+            try:
+                index[url] = AttachmentEntry(**data)
+            except TypeError:
+                continue
+        return index
+
+    def save(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_suffix(".json.tmp")
+        tmp.write_text(
+            json.dumps(
+                {url: asdict(entry) for url, entry in self._index.items()},
+                ensure_ascii=False,
+                indent=1,
+            ),
+            encoding="utf-8",
+        )
+        tmp.replace(self.index_path)
+
+    def blob_path(self, sha256: str) -> Path:
+        return self.blob_dir / sha256[:2] / f"{sha256}.zip"
+
+    def lookup(self, zip_url: str) -> Optional[AttachmentEntry]:
+        """已下載過且 blob 仍在才回傳。"""
+        entry = self._index.get(zip_url)
+        if entry and self.blob_path(entry.sha256).is_file():
+            return entry
+        return None
+
+    def lookup_sha(self, zip_url: str) -> str:
+        entry = self.lookup(zip_url)
+        return entry.sha256 if entry else ""
+
+    @staticmethod
+    def conditional_headers(entry: AttachmentEntry) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def temp_path(self, name: str) -> Path:
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        return self.blob_dir / f"{name}.part"
+
+    def touch(self, zip_url: str) -> AttachmentEntry:
+        entry = self._index[zip_url]
+        entry.last_seen = _now()
+        self.save()
+        return entry
+
+    def commit(
+        self,
+        zip_url: str,
+        tmp_path: Path,
+        *,
+        sha256: str,
+        size: int,
+        etag: str = "",
+        last_modified: str = "",
+    ) -> AttachmentEntry:
+        """把下載完成的暫存檔移入 blob（內容相同則直接丟棄暫存檔）並更新索引。"""
+        blob = self.blob_path(sha256)
+        if blob.is_file():
+            tmp_path.unlink()
+        else:
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp_path, blob)
+        entry = AttachmentEntry(
+            sha256=sha256,
+            size=size,
+            last_seen=_now(),
+            etag=etag,
+            last_modified=last_modified,
+        )
+        self._index[zip_url] = entry
+        self.save()
+        return entry
+
+    def materialize(self, sha256: str, dest: Path) -> Path:
+        """以易讀檔名（Notion 附件名）連結到 blob；不支援 hardlink 時改複製。"""
+        blob = self.blob_path(sha256)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        if dest.exists() or dest.is_symlink():
+            if dest.is_file() and os.path.samefile(dest, blob):
+                return dest
+            dest.unlink()
+        try:
+            os.link(blob, dest)
+        except OSError:
+            shutil.copyfile(blob, dest)
+        return dest
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
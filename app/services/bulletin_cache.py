@@ -0,0 +1,130 @@
+"""單日標售公報解析結果的本機快取：以公告日為 key，一日一個 JSON。
+
+過去公告日的公報幾乎不再變動，回填或重跑時直接讀快取，不必再翻 FPG 分頁；
+今天與昨天仍可能新增／修改公告，一律重抓。
+
+同檔另記當日尚未選取（可轉報價）的 checkbox，goSave 後隨之更新：快取命中且
+待轉報價的案都不在本次清單內時，轉報價也不必重抓公報。
+"""
+from __future__ import annotations
+
+import json
+import logging
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+from app.core.config import settings
+from app.models.case_record import CaseRecord
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIRNAME = "bulletins"
+# 今天往前幾天內的公告日不讀快取
+VOLATILE_DAYS = 1
+
+
+class BulletinCache:
+    def __init__(self, root: Path, *, ttl_seconds: int) -> None:
+        self.root = root
+        self.ttl_seconds = ttl_seconds
+
+    @classmethod
+    def from_settings(cls) -> "BulletinCache":
+        return cls(
+            Path(settings.FPG_CACHE_DIR) / CACHE_DIRNAME,
+            ttl_seconds=settings.FPG_BULLETIN_CACHE_TTL,
+        )
+
+    @staticmethod
+    def _day(announce_date: str) -> Optional[date]:
+        try:
+            return datetime.strptime(announce_date.strip(), "%Y/%m/%d").date()
+        except ValueError:
+            return None
+
+    def _path(self, day: date) -> Path:
+        return self.root / f"{day.isoformat()}.json"
+
+    def cacheable(self, announce_date: str) -> bool:
+        """僅 TTL 啟用且公告日早於昨天才使用快取。"""
+        day = self._day(announce_date)
+        if day is None or self.ttl_seconds <= 0:
+            return False
+        return day < date.today() - timedelta(days=VOLATILE_DAYS)
+
+    def _read(self, announce_date: str) -> Optional[dict]:
+        if not self.cacheable(announce_date):
+            return None
+        path = self._path(self._day(announce_date))
+        if not path.is_file():
+            return None
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if time.time() - float(data.get("fetched_at", 0)) > self.ttl_seconds:
+                return None
+        except (OSError, ValueError, TypeError, AttributeError):
+            logger.warning("公報快取無法讀取，改為重抓 %s", path)
+            return None
+        return data
+
+    def _write(self, announce_date: str, data: dict) -> None:
+        path = self._path(self._day(announce_date))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(path)
+
+    def get(self, announce_date: str) -> Optional[list[CaseRecord]]:
+        data = self._read(announce_date)
+        if data is None:
+            return None
+        try:
+            records = [CaseRecord.from_dict(item) for item in data["records"]]
+        except (ValueError, KeyError, TypeError):
+            logger.warning("公報快取無法讀取，改為重抓 %s", announce_date)
+            return None
+        logger.info("公報快取命中 %s：%s 案", announce_date, len(records))
+        return records
+
+    def get_claim_items(
+        self, announce_date: str
+    ) -> Optional[list[tuple[str, str, str]]]:
+        """快取中尚未選取的 (blocid, tndsalno, inqcnt)；沒有快取或舊格式時為 None。"""
+        data = self._read(announce_date)
+        if data is None or "claim_items" not in data:
+            return None
+        try:
+            return [(blocid, tnd, inq) for blocid, tnd, inq in data["claim_items"]]
+        except (ValueError, TypeError):
+            return None
+
+    def put(
+        self,
+        announce_date: str,
+        records: list[CaseRecord],
+        claim_items: Optional[list[tuple[str, str, str]]] = None,
+    ) -> None:
+        if not self.cacheable(announce_date):
+            return
+        data = {
+            "announce_date": announce_date,
+            "fetched_at": time.time(),
+            "records": [record.to_dict() for record in records],
+        }
+        if claim_items is not None:
+            data["claim_items"] = [list(item) for item in claim_items]
+        self._write(announce_date, data)
+
+    def put_claim_items(
+        self,
+        announce_date: str,
+        claim_items: list[tuple[str, str, str]],
+    ) -> None:
+        """更新已快取公告日的尚未選取清單（goSave 後或重抓公報後）；不延長 TTL。"""
+        data = self._read(announce_date)
+        if data is None:
+            return
+        data["claim_items"] = [list(item) for item in claim_items]
+        self._write(announce_date, data)
@@ -0,0 +1,108 @@
+"""單次執行內的標售公報快照：搜尋與轉報價共用同一批分頁，不重抓。"""
+from __future__ import annotations
+
+import dataclasses
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from app.models.case_record import CaseRecord
+from app.services.fpg_parser import (
+    parse_bulletin_case_keys,
+    parse_bulletin_cases,
+    parse_bulletin_claim_items,
+)
+
+
+def bulletin_page_records(html: str) -> list[CaseRecord]:
+    """單頁公報案件；細部 parser 漏案時至少保留案號。"""
+    records = parse_bulletin_cases(html)
+    known = {(r.tndsalno, r.inqcnt) for r in records}
+    for tnd, inq in parse_bulletin_case_keys(html):
+        if (tnd, inq) not in known:
+            known.add((tnd, inq))
+            records.append(CaseRecord(tndsalno=tnd, inqcnt=inq))
+    return records
+
+
+@dataclass
+class BulletinPage:
+    """公報單頁：原始 HTML 與解析後的案件／尚未選取 checkbox。"""
+
+    page: int
+    html: str
+    cases: list[CaseRecord] = field(default_factory=list)
+    claim_items: list[tuple[str, str, str]] = field(default_factory=list)
+    # goSave 後頁面狀態已變（已選取列不再有 checkbox），下次使用前需重抓
+    stale: bool = False
+
+    @classmethod
+    def parse(cls, page: int, html: str) -> "BulletinPage":
+        return cls(
+            page=page,
+            html=html,
+            cases=bulletin_page_records(html),
+            claim_items=parse_bulletin_claim_items(html),
+        )
+
+
+@dataclass
+class BulletinSnapshot:
+    """某公告日區間的全部公報分頁（依頁序）。"""
+
+    start_date: str
+    end_date: str
+    itemnum: str
+    pages: list[BulletinPage] = field(default_factory=list)
+
+    def matches(self, start_date: str, end_date: str) -> bool:
+        return (self.start_date, self.end_date) == (start_date, end_date)
+
+    @property
+    def stale_pages(self) -> list[int]:
+        return [p.page for p in self.pages if p.stale]
+
+    def replace_page(self, page: BulletinPage) -> None:
+        for index, current in enumerate(self.pages):
+            if current.page == page.page:
+                self.pages[index] = page
+                return
+        self.pages.append(page)
+        self.pages.sort(key=lambda p: p.page)
+
+    def records(self) -> list[CaseRecord]:
+        """依頁序合併、(tndsalno, inqcnt) 去重；回傳複本，後續 enrichment 不污染快照。"""
+        records: list[CaseRecord] = []
+        seen: set[tuple[str, str]] = set()
+        for page in self.pages:
+            for record in page.cases:
+                key = (record.tndsalno, record.inqcnt)
+                if key in seen:
+                    continue
+                seen.add(key)
+                records.append(dataclasses.replace(record))
+        return records
+
+    def claim_items(
+        self,
+        allowed_keys: Optional[set[tuple[str, str]]] = None,
+    ) -> list[tuple[str, str, str]]:
+        """尚未選取的 (blocid, tndsalno, inqcnt)，依頁序去重；allowed_keys=None 表示不篩選。"""
+        items: list[tuple[str, str, str]] = []
+        seen: set[tuple[str, str, str]] = set()
+        for page in self.pages:
+            for triple in page.claim_items:
+                if triple in seen:
+                    continue
+                if allowed_keys is not None and (triple[1], triple[2]) not in allowed_keys:
+                    continue
+                seen.add(triple)
+                items.append(triple)
+        return items
+
+    def mark_claimed(self, items: Iterable[tuple[str, str, str]]) -> None:
+        """goSave 成功後：移除已轉報價的 checkbox，並標記所在頁需重抓。"""
+        claimed = set(items)
+        for page in self.pages:
+            if claimed.intersection(page.claim_items):
+                page.claim_items = [t for t in page.claim_items if t not in claimed]
+                page.stale = True
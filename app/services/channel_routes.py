@@ -0,0 +1,69 @@
+"""標案／競標管理 channel 路由記憶：記下每個案號實際在哪個 channel 找到報價單。
+
+下次同案號直接走該 channel，省下 gen ↔ cmp 備援時多出的 GET＋清單 POST。
+"""
+from __future__ import annotations
+
+import json
+import logging
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+ROUTES_FILENAME = "channel_routes.json"
+# 超過此天數未再出現的案號不再保留
+ROUTE_RETENTION_DAYS = 180
+
+
+class ChannelRouteBook:
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path
+        self._routes: dict[str, dict[str, str]] = self._load()
+        self._dirty = False
+
+    @classmethod
+    def from_settings(cls) -> "ChannelRouteBook":
+        return cls(Path(settings.FPG_CACHE_DIR) / ROUTES_FILENAME)
+
+    def _load(self) -> dict[str, dict[str, str]]:
+        if self.path is None or not self.path.is_file():
+            return {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            logger.warning("channel 路由檔無法讀取，忽略 %s", self.path)
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def get(self, tndsalno: str) -> str:
+        return (self._routes.get(tndsalno) or {}).get("channel", "")
+
+    def record(self, tndsalno: str, channel: str) -> None:
+        today = date.today().isoformat()
+        current = self._routes.get(tndsalno) or {}
+        if current.get("channel") == channel and current.get("seen") == today:
+            return
+        self._routes[tndsalno] = {"channel": channel, "seen": today}
+        self._dirty = True
+
+    def save(self) -> None:
+        if self.path is None or not self._dirty:
+            return
+        cutoff = (date.today() - timedelta(days=ROUTE_RETENTION_DAYS)).isoformat()
+        self._routes = {
+            tnd: route
+            for tnd, route in self._routes.items()
+            if route.get("seen", "") >= cutoff
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".json.tmp")
+        tmp.write_text(
+            json.dumps(self._routes, ensure_ascii=False, indent=1),
+            encoding="utf-8",
+        )
+        tmp.replace(self.path)
+        self._dirty = False
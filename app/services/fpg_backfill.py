@@ -0,0 +1,126 @@
+"""公告日區間回填：拆成單日 shard，各 shard 交給空閒 session 併發處理，完成日寫入 checkpoint。
+
+單日搜尋的公報頁數少，且 fill_missing_announce_dates 只在單日搜尋時補公告日；
+中斷後重跑同一區間，會從第一個尚未完成的日期接續。
+"""
+from __future__ import annotations
+
+import json
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from app.core.config import settings
+from app.services.fpg_http_client import FpgHttpClient
+from app.services.fpg_session_pool import FpgSessionPool
+from app.services.request_policy import CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DATE_FORMAT = "%Y/%m/%d"
+
+
+def day_shards(start_date: str, end_date: str) -> list[str]:
+    """YYYY/MM/DD 區間（含頭尾）→ 逐日清單；起迄顛倒時自動對調。"""
+    start = datetime.strptime(start_date.strip(), DATE_FORMAT).date()
+    end = datetime.strptime(end_date.strip(), DATE_FORMAT).date()
+    if end < start:
+        start, end = end, start
+    return [
+        (start + timedelta(days=offset)).strftime(DATE_FORMAT)
+        for offset in range((end - start).days + 1)
+    ]
+
+
+class BackfillCheckpoint:
+    """已完成的公告日；每完成一日立即落盤（path=None 則只存記憶體）。"""
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path
+        self.done: set[str] = self._load()
+
+    @classmethod
+    def from_settings(cls, start_date: str, end_date: str) -> "BackfillCheckpoint":
+        name = f"backfill_{start_date.replace('/', '')}_{end_date.replace('/', '')}.json"
+        return cls(Path(settings.FPG_CACHE_DIR) / name)
+
+    def _load(self) -> set[str]:
+        if self.path is None or not self.path.is_file():
+            return set()
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            logger.warning("回填 checkpoint 無法讀取，從頭開始 %s", self.path)
+            return set()
+        return set(data.get("done") or []) if isinstance(data, dict) else set()
+
+    def pending(self, days: list[str]) -> list[str]:
+        return [day for day in days if day not in self.done]
+
+    def mark_done(self, day: str) -> None:
+        self.done.add(day)
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".json.tmp")
+        tmp.write_text(
+            json.dumps(
+                {
+                    "done": sorted(self.done),
+                    "updated_at": datetime.now().isoformat(timespec="seconds"),
+                },
+                ensure_ascii=False,
+                indent=1,
+            ),
+            encoding="utf-8",
+        )
+        tmp.replace(self.path)
+
+    def clear(self) -> None:
+        self.done.clear()
+        if self.path is not None and self.path.exists():
+            self.path.unlink()
+
+
+async def run_day_shards(
+    pool: FpgSessionPool,
+    days: list[str],
+    process_day: Callable[[FpgHttpClient, str], Awaitable[tuple[T, bool]]],
+    *,
+    checkpoint: BackfillCheckpoint,
+) -> dict[str, T]:
+    """每個公告日交給空閒 session；process_day 回傳 (結果, 是否可標記完成)。
+
+    單日例外只記錄、不寫 checkpoint，下次重跑會再處理；回傳成功日的結果（依日期序）。
+    斷路器放棄（CircuitOpenError）則中止整個回填。
+    """
+    pending = checkpoint.pending(days)
+    skipped = len(days) - len(pending)
+    if skipped:
+        logger.info(
+            "回填：checkpoint 已完成 %s 日，從 %s 接續",
+            skipped,
+            pending[0] if pending else "—",
+        )
+
+    async def shard(client: FpgHttpClient, day: str) -> Optional[T]:
+        try:
+            result, complete = await process_day(client, day)
+        except CircuitOpenError:
+            # 站台已放棄：其餘公告日也不會成功，中止回填
+            raise
+        except Exception:
+            logger.exception("回填公告日 %s 失敗（未寫入 checkpoint）", day)
+            return None
+        if complete:
+            checkpoint.mark_done(day)
+            logger.info("回填公告日 %s 完成", day)
+        else:
+            logger.warning("回填公告日 %s 有失敗案件，下次重跑會再處理", day)
+        return result
+
+    results = await pool.run_each(pending, shard)
+    return {day: result for day, result in zip(pending, results) if result is not None}
@@ -7,27 +7,33 @@ import logging
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 from urllib.parse import urljoin
 
 import aiohttp
 
 from app.core.config import settings
 from app.models.case_record import CaseRecord
+from app.services.attachment_store import AttachmentStore
+from app.services.bulletin_cache import BulletinCache
+from app.services.bulletin_snapshot import BulletinPage, BulletinSnapshot
 from app.services.captcha_service import CaptchaService
+from app.services.channel_routes import ChannelRouteBook
 from app.services.fpg_parser import (
     fill_missing_announce_dates,
+    is_login_page,
     merge_records,
     parse_bid_go_detail,
-    parse_bulletin_case_keys,
-    parse_bulletin_cases,
-    parse_bulletin_claim_items,
     parse_bulletin_itemnum,
     parse_bulletin_total_pages,
     parse_fromjsp,
     parse_inquiry_form,
     parse_quote_form,
 )
+from app.services.html_snapshot_store import HtmlSnapshotStore, snapshot_case
+from app.services.http_connector import create_session
+from app.services.http_metrics import DOWNLOAD_ENDPOINT, HttpMetrics, endpoint_label
+from app.services.parse_executor import ParseExecutor, shared_parse_executor
 from app.services.fpg_urls import (
     BID_PAGE_PATH,
     BID_POST_PATH,
@@ -40,10 +46,44 @@ from app.services.fpg_urls import (
     fpg_base_url,
     fpg_url,
 )
+from app.services.fpg_session_cache import (
+    FpgSessionCache,
+    dump_cookies,
+    restore_cookies,
+)
+from app.services.response_decoder import ResponseDecoder
+from app.services.request_policy import (
+    RETRYABLE_STATUS,
+    TRANSIENT_ERRORS,
+    CircuitBreaker,
+    CircuitOpenError,
+    RateLimiter,
+    RetryPolicy,
+    TransientStatusError,
+)
 
 logger = logging.getLogger(__name__)
 
 
+ZIP_CHUNK_SIZE = 64 * 1024
+# goSave 批次間隔秒數
+CLAIM_BATCH_PAUSE = 0.5
+DEFAULT_DOWNLOAD_DIR = Path("app/utils/screenshots/archive_downloads")
+
+
+class FpgSessionExpired(RuntimeError):
+    """session 逾時且重新登入後仍無法取得頁面。"""
+
+
+@dataclass(frozen=True)
+class ZipDownload:
+    path: Path
+    sha256: str
+    size: int
+    # True = 伺服器確認未變更，沿用 store 內既有 blob
+    reused: bool = False
+
+
 @dataclass(frozen=True)
 class BidChannelConfig:
     page: str
@@ -75,6 +115,20 @@ def _bid_channels() -> dict[str, BidChannelConfig]:
     }
 
 
+def _parse_first_bulletin_page(html: str) -> tuple[BulletinPage, int, str]:
+    """公報第 1 頁：(頁面, 總頁數, itemnum)。"""
+    return (
+        BulletinPage.parse(1, html),
+        parse_bulletin_total_pages(html),
+        parse_bulletin_itemnum(html),
+    )
+
+
+def _parse_case_forms(inquiry_html: str, quote_html: str, record: CaseRecord) -> CaseRecord:
+    parse_inquiry_form(inquiry_html, record)
+    return parse_quote_form(quote_html, record)
+
+
 class FpgHttpClient:
     def __init__(
         self,
@@ -82,17 +136,60 @@ class FpgHttpClient:
         captcha_service: Optional[CaptchaService] = None,
         download_dir: Optional[Path] = None,
         login_retries: int = 20,
+        attachment_store: Optional[AttachmentStore] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        session_cache: Optional[FpgSessionCache] = None,
+        channel_routes: Optional[ChannelRouteBook] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        metrics: Optional[HttpMetrics] = None,
+        connector: Optional[aiohttp.BaseConnector] = None,
+        bulletin_cache: Optional[BulletinCache] = None,
+        decoder: Optional[ResponseDecoder] = None,
+        snapshots: Optional[HtmlSnapshotStore] = None,
+        parser: Optional[ParseExecutor] = None,
     ) -> None:
         self.captcha_service = captcha_service or CaptchaService()
-        self.download_dir = download_dir or Path("app/utils/screenshots/archive_downloads")
+        self.download_dir = download_dir or DEFAULT_DOWNLOAD_DIR
         self.login_retries = login_retries
+        self.attachment_store = attachment_store or AttachmentStore(
+            self.download_dir / "store"
+        )
+        # 同一 FPG 站台的請求預算；可由多個 client 共用
+        self.rate_limiter = rate_limiter or RateLimiter(settings.FPG_MAX_RPS)
+        self.retry_policy = retry_policy or RetryPolicy.from_settings()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker.from_settings()
+        # 依 endpoint 統計延遲／位元組／重試；session pool 共用同一份
+        self.metrics = metrics or HttpMetrics()
+        # 各 endpoint 已知的回應編碼；session pool 共用同一份
+        self.decoder = decoder or ResponseDecoder()
+        # 原始 HTML 快照；None = 不存
+        self.snapshots = snapshots
+        # 公報／報價單解析移出 event loop；預設行程內共用（PARSE_EXECUTOR）
+        self.parser = parser or shared_parse_executor()
+        # None = 不沿用登入 session，每次都走驗證碼登入
+        self.session_cache = session_cache
+        # 單日公報解析結果的本機快取；None = 每次都查 FPG
+        self.bulletin_cache = bulletin_cache
+        # 最近一次公報搜尋的分頁快照（搜尋 → 轉報價共用）
+        self.bulletin_snapshot: Optional[BulletinSnapshot] = None
+        # 案號 → 實際有報價單的 channel；None = 每案都先試公報判定的 channel
+        self.channel_routes = channel_routes
+        # 目前 session 停留的標案／競標管理頁（gen/cmp）；離開後重設
+        self._channel_page: Optional[str] = None
+        # 每次登入成功 +1；逾時重登以此判斷是否已有其他請求先重登
+        self._login_generation = 0
+        self._relogin_lock: Optional[asyncio.Lock] = None
+        self._relogin_error: Optional[BaseException] = None
+        # 共用 connector（session pool／API 行程）；None = 依 HTTP_SHARE_CONNECTOR
+        self.connector = connector
         self._session: Optional[aiohttp.ClientSession] = None
 
     async def __aenter__(self) -> "FpgHttpClient":
-        timeout = aiohttp.ClientTimeout(total=120)
-        self._session = aiohttp.ClientSession(
+        self._session = create_session(
+            total_timeout=120,
+            connector=self.connector,
             cookie_jar=aiohttp.CookieJar(unsafe=True),
-            timeout=timeout,
             headers={
                 "User-Agent": (
                     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
@@ -115,27 +212,164 @@ class FpgHttpClient:
             raise RuntimeError("FpgHttpClient 尚未進入 async context")
         return self._session
 
-    async def _get(self, url: str, **kwargs) -> str:
-        async with self.session.get(url, **kwargs) as resp:
-            return await resp.text(errors="replace")
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        *,
+        idempotent: bool = True,
+        **kwargs,
+    ) -> tuple[int, str, str]:
+        """送出單一請求，回傳 (status, html, 最終 URL)。
+
+        冪等請求遇連線中斷／逾時／5xx 依 retry_policy 退避重試；每次失敗計入斷路器。
+        """
+        endpoint = endpoint_label(url)
+        async for attempt in self.retry_policy.retrying(idempotent=idempotent):
+            with attempt:
+                if attempt.retry_state.attempt_number > 1:
+                    self.metrics.record_retry(endpoint)
+                return await self._send_once(method, url, endpoint=endpoint, **kwargs)
+        raise AssertionError("unreachable")  # pragma: no cover
 
-    async def _post_form(self, url: str, data: dict, *, referer: str) -> str:
+    async def _send_once(
+        self,
+        method: str,
+        url: str,
+        *,
+        endpoint: str,
+        **kwargs,
+    ) -> tuple[int, str, str]:
+        await self.circuit_breaker.wait_until_closed()
+        await self.rate_limiter.acquire()
+        status: Optional[int] = None
+        nbytes = 0
+        started = time.perf_counter()
+        try:
+            async with self.session.request(method, url, **kwargs) as resp:
+                status = resp.status
+                if status in RETRYABLE_STATUS:
+                    raise TransientStatusError(status, url)
+                body = await resp.read()
+                nbytes = len(body)
+                html = self.decoder.decode(endpoint, body, resp.charset)
+                result = status, html, str(resp.url)
+                if self.snapshots is not None:
+                    self.snapshots.record(
+                        source="fpg",
+                        endpoint=endpoint,
+                        url=url,
+                        status=status,
+                        html=html,
+                        method=method,
+                        form=kwargs.get("data"),
+                    )
+        except TRANSIENT_ERRORS:
+            self.circuit_breaker.record_failure()
+            raise
+        finally:
+            self.metrics.observe(
+                endpoint,
+                seconds=time.perf_counter() - started,
+                status=status,
+                nbytes=nbytes,
+            )
+        self.circuit_breaker.record_success()
+        return result
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        *,
+        check_session: bool = True,
+        idempotent: bool = True,
+        **kwargs,
+    ) -> tuple[int, str]:
+        """送出請求；回應若是登入頁（session 逾時）則重新登入一次後重送。"""
+        generation = self._login_generation
+        status, html, final_url = await self._send(
+            method, url, idempotent=idempotent, **kwargs
+        )
+        if not check_session or not is_login_page(html, final_url):
+            return status, html
+        logger.warning("FPG session 已逾時（%s），重新登入後重送", url)
+        await self._relogin(generation)
+        status, html, final_url = await self._send(
+            method, url, idempotent=idempotent, **kwargs
+        )
+        if is_login_page(html, final_url):
+            raise FpgSessionExpired(f"FPG 重新登入後仍被導回登入頁：{url}")
+        return status, html
+
+    async def _relogin(self, generation: int) -> None:
+        """single-flight：多個請求同時發現逾時，只有第一個真的登入，其餘等它完成。"""
+        if self._relogin_lock is None:
+            self._relogin_lock = asyncio.Lock()
+        async with self._relogin_lock:
+            if self._login_generation != generation:
+                return
+            if self._relogin_error is not None:
+                raise FpgSessionExpired(
+                    f"FPG 重新登入已失敗：{self._relogin_error}"
+                ) from self._relogin_error
+            if self.session_cache:
+                self.session_cache.clear()
+            self.session.cookie_jar.clear()
+            try:
+                await self.login()
+            except Exception as exc:
+                self._relogin_error = exc
+                raise
+
+    async def _get(self, url: str, *, check_session: bool = True, **kwargs) -> str:
+        _, html = await self._request(
+            "GET", url, check_session=check_session, **kwargs
+        )
+        return html
+
+    async def _post_form(
+        self,
+        url: str,
+        data: dict,
+        *,
+        referer: str,
+        check_session: bool = True,
+        idempotent: bool = True,
+    ) -> str:
+        """表單 POST；FPG 的清單／報價單查詢皆為唯讀，預設可重試。"""
         headers = {
             "Content-Type": "application/x-www-form-urlencoded",
             "Referer": referer,
         }
-        async with self.session.post(url, data=data, headers=headers) as resp:
-            return await resp.text(errors="replace")
+        _, html = await self._request(
+            "POST",
+            url,
+            data=data,
+            headers=headers,
+            check_session=check_session,
+            idempotent=idempotent,
+        )
+        return html
 
     async def login(self) -> None:
-        await self._get(settings.LOGIN_URL)
+        self._channel_page = None
+        await self._get(settings.LOGIN_URL, check_session=False)
         captcha_url = fpg_url(CAPTCHA_PATH)
         login_servlet = fpg_url(LOGIN_SERVLET_PATH)
         for attempt in range(1, self.login_retries + 1):
+            await self.rate_limiter.acquire()
+            started = time.perf_counter()
             async with self.session.get(
                 f"{captcha_url}?rrr={int(time.time() * 1000)}"
             ) as resp:
                 image = await resp.read()
+            self.metrics.observe(
+                endpoint_label(captcha_url),
+                seconds=time.perf_counter() - started,
+                status=resp.status,
+                nbytes=len(image),
+            )
             code = await self.captcha_service.solve_captcha(image)
             logger.info("登入驗證碼 attempt=%s ocr=%r", attempt, code)
             if not code or code == "error" or len(str(code)) != 4:
@@ -153,6 +387,8 @@ class FpgHttpClient:
                     "vcode": str(code),
                 },
                 referer=settings.LOGIN_URL,
+                check_session=False,
+                idempotent=False,
             )
             if "驗證碼錯誤" in html:
                 await asyncio.sleep(2)
@@ -163,56 +399,68 @@ class FpgHttpClient:
                 )
             if "標售公報" in html or "標案管理" in html:
                 logger.info("FPG 登入成功")
+                self._login_generation += 1
+                self._relogin_error = None
+                if self.session_cache:
+                    self.session_cache.save(dump_cookies(self.session.cookie_jar))
                 return
             logger.warning("登入回應未辨識成功，繼續重試 attempt=%s", attempt)
             await asyncio.sleep(2)
         raise RuntimeError("FPG 登入失敗：驗證碼重試耗盡")
 
+    async def is_session_valid(self) -> bool:
+        """以公報搜尋頁探測目前 cookie 是否仍在登入狀態（一次 GET）。"""
+        self._channel_page = None
+        try:
+            status, html, final_url = await self._send("GET", fpg_url(BULLETIN_PAGE_PATH))
+        except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+            logger.warning("FPG session 探測失敗：%s", exc)
+            return False
+        return status == 200 and not is_login_page(html, final_url)
+
+    async def ensure_login(self) -> bool:
+        """快取 session 仍有效則沿用，否則 login()。回傳是否沿用快取。"""
+        cookies = self.session_cache.load() if self.session_cache else None
+        if cookies:
+            restore_cookies(
+                self.session.cookie_jar,
+                cookies,
+                response_url=fpg_base_url(),
+            )
+            if await self.is_session_valid():
+                logger.info("沿用 FPG 登入 session（略過驗證碼登入）")
+                return True
+            logger.info("FPG session 快取已失效，重新登入")
+            self.session.cookie_jar.clear()
+            self.session_cache.clear()
+        await self.login()
+        return False
+
     async def search_bulletin_by_announce_date(
         self,
         start_date: str,
         end_date: str,
+        *,
+        page_concurrency: Optional[int] = None,
     ) -> list[CaseRecord]:
-        """依公告日搜尋，回傳公報摘要 CaseRecord（已去重）。"""
-        bulletin_page = fpg_url(BULLETIN_PAGE_PATH)
-        bulletin_post = fpg_url(BULLETIN_POST_PATH)
-        await self._get(bulletin_page)
-        first = await self._bulletin_list(start_date, end_date, page="1", itemnum="")
-        records = parse_bulletin_cases(first)
-        # 若細部 parser 漏案，至少保留案號
-        for tnd, inq in parse_bulletin_case_keys(first):
-            if not any(r.tndsalno == tnd and r.inqcnt == inq for r in records):
-                records.append(CaseRecord(tndsalno=tnd, inqcnt=inq))
-        pages = parse_bulletin_total_pages(first)
-        itemnum = parse_bulletin_itemnum(first)
-        logger.info(
-            "公報搜尋 %s~%s：第 1/%s 頁，本頁 %s 案，itemnum=%s",
+        """依公告日搜尋，回傳公報摘要 CaseRecord（已去重）。
+
+        分頁快照留在 self.bulletin_snapshot，供同區間的轉報價直接沿用。
+        單日搜尋且設有 bulletin_cache 時，過去公告日直接讀快取（此時不留快照，
+        轉報價改看快取記下的尚未選取清單，見 plan_claims）。
+        """
+        single_day = start_date == end_date
+        if self.bulletin_cache and single_day:
+            cached = self.bulletin_cache.get(start_date)
+            if cached is not None:
+                return cached
+        snapshot = await self.load_bulletin_snapshot(
             start_date,
             end_date,
-            pages,
-            len(records),
-            itemnum,
+            page_concurrency=page_concurrency,
         )
-        seen = {(r.tndsalno, r.inqcnt) for r in records}
-        for page in range(2, pages + 1):
-            html = await self._bulletin_list(
-                start_date,
-                end_date,
-                page=str(page),
-                itemnum=itemnum,
-                btn="goPage",
-            )
-            page_records = parse_bulletin_cases(html)
-            for tnd, inq in parse_bulletin_case_keys(html):
-                if not any(r.tndsalno == tnd and r.inqcnt == inq for r in page_records):
-                    page_records.append(CaseRecord(tndsalno=tnd, inqcnt=inq))
-            logger.info("公報第 %s 頁：%s 案", page, len(page_records))
-            for record in page_records:
-                key = (record.tndsalno, record.inqcnt)
-                if key in seen:
-                    continue
-                seen.add(key)
-                records.append(record)
+        records = snapshot.records()
+        bulletin_post = fpg_url(BULLETIN_POST_PATH)
         for record in records:
             record.source_url = bulletin_post
         filled = fill_missing_announce_dates(records, start_date, end_date)
@@ -222,8 +470,107 @@ class FpgHttpClient:
                 start_date,
                 filled,
             )
+        for record in records:
+            record.bulletin_fingerprint = record.compute_bulletin_fingerprint()
+        if self.bulletin_cache and single_day:
+            self.bulletin_cache.put(start_date, records, snapshot.claim_items())
         return records
 
+    async def load_bulletin_snapshot(
+        self,
+        start_date: str,
+        end_date: str,
+        *,
+        page_concurrency: Optional[int] = None,
+    ) -> BulletinSnapshot:
+        """抓取公報全部分頁並解析成快照。
+
+        第 1 頁取得總頁數與 itemnum 後，其餘分頁彼此獨立，併發抓取後依頁序排列。
+        """
+        await self._get(fpg_url(BULLETIN_PAGE_PATH))
+        first_html = await self._bulletin_list(
+            start_date, end_date, page="1", itemnum=""
+        )
+        first, pages, itemnum = await self.parser.run(_parse_first_bulletin_page, first_html)
+        logger.info(
+            "公報搜尋 %s~%s：第 1/%s 頁，本頁 %s 案，itemnum=%s",
+            start_date,
+            end_date,
+            pages,
+            len(first.cases),
+            itemnum,
+        )
+        snapshot = BulletinSnapshot(
+            start_date=start_date,
+            end_date=end_date,
+            itemnum=itemnum,
+            pages=[first],
+        )
+        rest = await self._bulletin_pages(
+            start_date,
+            end_date,
+            range(2, pages + 1),
+            itemnum=itemnum,
+            concurrency=page_concurrency,
+        )
+        parsed_pages = await asyncio.gather(
+            *(
+                self.parser.run(BulletinPage.parse, page, html)
+                for page, html in zip(range(2, pages + 1), rest)
+            )
+        )
+        for parsed in parsed_pages:
+            logger.info("公報第 %s 頁：%s 案", parsed.page, len(parsed.cases))
+            snapshot.pages.append(parsed)
+        self.bulletin_snapshot = snapshot
+        return snapshot
+
+    async def refresh_stale_pages(self, snapshot: BulletinSnapshot) -> None:
+        """只重抓 goSave 後狀態已變的分頁。"""
+        stale = snapshot.stale_pages
+        if not stale:
+            return
+        logger.info("公報快照：重抓已變動分頁 %s", stale)
+        htmls = await self._bulletin_pages(
+            snapshot.start_date,
+            snapshot.end_date,
+            stale,
+            itemnum=snapshot.itemnum,
+        )
+        parsed_pages = await asyncio.gather(
+            *(
+                self.parser.run(BulletinPage.parse, page, html)
+                for page, html in zip(stale, htmls)
+            )
+        )
+        for parsed in parsed_pages:
+            snapshot.replace_page(parsed)
+
+    async def _bulletin_pages(
+        self,
+        start_date: str,
+        end_date: str,
+        pages: Iterable[int],
+        *,
+        itemnum: str,
+        concurrency: Optional[int] = None,
+    ) -> list[str]:
+        """併發抓取公報分頁（goPage），回傳 HTML 依傳入頁序排列。"""
+        limit = concurrency if concurrency is not None else settings.FPG_BULLETIN_CONCURRENCY
+        semaphore = asyncio.Semaphore(max(1, limit))
+
+        async def fetch(page: int) -> str:
+            async with semaphore:
+                return await self._bulletin_list(
+                    start_date,
+                    end_date,
+                    page=str(page),
+                    itemnum=itemnum,
+                    btn="goPage",
+                )
+
+        return list(await asyncio.gather(*(fetch(page) for page in pages)))
+
     async def claim_unselected_cases(
         self,
         start_date: str,
@@ -231,58 +578,27 @@ class FpgHttpClient:
         *,
         allowed_keys: set[tuple[str, str]],
         batch_size: int = 40,
+        snapshot: Optional[BulletinSnapshot] = None,
     ) -> list[tuple[str, str, str]]:
         """對公報「尚未選取」且在 allowed_keys 內的案執行轉報價（BTN=goSave）。
 
         allowed_keys 為 (tndsalno, inqcnt)。已選取列無 checkbox，會自動略過。
+        優先沿用同區間的公報快照（含搜尋時留下的 self.bulletin_snapshot），
+        只在快照頁被先前 goSave 變動過時才重抓該頁。
         回傳實際送出的 (blocid, tndsalno, inqcnt)。
         """
         if not allowed_keys:
             return []
-
-        await self._get(fpg_url(BULLETIN_PAGE_PATH))
-        first = await self._bulletin_list(start_date, end_date, page="1", itemnum="")
-        pages = parse_bulletin_total_pages(first)
-        itemnum = parse_bulletin_itemnum(first)
-
-        selectable: list[tuple[str, str, str]] = []
-        seen: set[tuple[str, str, str]] = set()
-        page_htmls = [first]
-        for page in range(2, pages + 1):
-            html = await self._bulletin_list(
-                start_date,
-                end_date,
-                page=str(page),
-                itemnum=itemnum,
-                btn="goPage",
-            )
-            page_htmls.append(html)
-            await asyncio.sleep(0.2)
-
-        for html in page_htmls:
-            for blocid, tnd, inq in parse_bulletin_claim_items(html):
-                if (tnd, inq) not in allowed_keys:
-                    continue
-                triple = (blocid, tnd, inq)
-                if triple in seen:
-                    continue
-                seen.add(triple)
-                selectable.append(triple)
-
-        if not selectable:
-            logger.info("轉報價：無需處理（無尚未選取／不在允許清單）")
-            return []
-
-        logger.info("轉報價：將送出 %s 案（分批 %s）", len(selectable), batch_size)
+        snapshot, selectable = await self.plan_claims(
+            start_date,
+            end_date,
+            allowed_keys=allowed_keys,
+            snapshot=snapshot,
+        )
         claimed: list[tuple[str, str, str]] = []
         for offset in range(0, len(selectable), batch_size):
             batch = selectable[offset : offset + batch_size]
-            await self._post_go_save(
-                start_date,
-                end_date,
-                batch,
-                itemnum=itemnum,
-            )
+            await self.claim_batch(snapshot, batch)
             claimed.extend(batch)
             logger.info(
                 "轉報價批次 %s–%s／%s 完成",
@@ -290,9 +606,79 @@ class FpgHttpClient:
                 offset + len(batch),
                 len(selectable),
             )
-            await asyncio.sleep(0.5)
+            await asyncio.sleep(CLAIM_BATCH_PAUSE)
         return claimed
 
+    async def plan_claims(
+        self,
+        start_date: str,
+        end_date: str,
+        *,
+        allowed_keys: set[tuple[str, str]],
+        snapshot: Optional[BulletinSnapshot] = None,
+    ) -> tuple[BulletinSnapshot, list[tuple[str, str, str]]]:
+        """取得（或沿用）公報快照，回傳 (快照, 待轉報價的 (blocid, tndsalno, inqcnt))。
+
+        沒有可沿用的快照時，若公報快取記下的尚未選取案都不在 allowed_keys 內，
+        直接回傳空快照，不重抓公報分頁。
+        """
+        if snapshot is None and self.bulletin_snapshot is not None:
+            if self.bulletin_snapshot.matches(start_date, end_date):
+                snapshot = self.bulletin_snapshot
+        if snapshot is None and self._cached_claims_settled(
+            start_date, end_date, allowed_keys
+        ):
+            logger.info("轉報價：公報快取顯示無待轉報價案，略過公報重抓")
+            empty = BulletinSnapshot(start_date=start_date, end_date=end_date, itemnum="")
+            return empty, []
+        if snapshot is None:
+            snapshot = await self.load_bulletin_snapshot(start_date, end_date)
+            self._cache_claim_items(snapshot)
+        else:
+            await self.refresh_stale_pages(snapshot)
+
+        selectable = snapshot.claim_items(allowed_keys)
+        if selectable:
+            logger.info("轉報價：將送出 %s 案", len(selectable))
+        else:
+            logger.info("轉報價：無需處理（無尚未選取／不在允許清單）")
+        return snapshot, selectable
+
+    async def claim_batch(
+        self,
+        snapshot: BulletinSnapshot,
+        batch: list[tuple[str, str, str]],
+    ) -> None:
+        """對一批案送出 goSave，並在快照上標記已轉報價。"""
+        await self._post_go_save(
+            snapshot.start_date,
+            snapshot.end_date,
+            batch,
+            itemnum=snapshot.itemnum,
+        )
+        snapshot.mark_claimed(batch)
+        self._cache_claim_items(snapshot)
+
+    def _cached_claims_settled(
+        self,
+        start_date: str,
+        end_date: str,
+        allowed_keys: set[tuple[str, str]],
+    ) -> bool:
+        if not self.bulletin_cache or start_date != end_date:
+            return False
+        pending = self.bulletin_cache.get_claim_items(start_date)
+        if pending is None:
+            return False
+        return not any((tnd, inq) in allowed_keys for _, tnd, inq in pending)
+
+    def _cache_claim_items(self, snapshot: BulletinSnapshot) -> None:
+        """單日快照的尚未選取清單寫回公報快取（該日有快取時）。"""
+        if self.bulletin_cache and snapshot.start_date == snapshot.end_date:
+            self.bulletin_cache.put_claim_items(
+                snapshot.start_date, snapshot.claim_items()
+            )
+
     async def _post_go_save(
         self,
         start_date: str,
@@ -302,6 +688,7 @@ class FpgHttpClient:
         itemnum: str,
     ) -> str:
         """模擬清單頁 goSave（轉報價作業）。"""
+        self._channel_page = None
         form: list[tuple[str, str]] = [
             ("FROMJSP", "FJ202C1PA02"),
             ("BTN", "goSave"),
@@ -350,15 +737,16 @@ class FpgHttpClient:
             "Content-Type": "application/x-www-form-urlencoded",
             "Referer": fpg_url(BULLETIN_PAGE_PATH),
         }
-        async with self.session.post(
+        status, html = await self._request(
+            "POST",
             fpg_url(BULLETIN_POST_PATH),
             data=form,
             headers=headers,
-        ) as resp:
-            html = await resp.text(errors="replace")
-            if resp.status != 200:
-                raise RuntimeError(f"轉報價 HTTP {resp.status}")
-            return html
+            idempotent=False,
+        )
+        if status != 200:
+            raise RuntimeError(f"轉報價 HTTP {status}")
+        return html
 
     async def _bulletin_list(
         self,
@@ -369,6 +757,7 @@ class FpgHttpClient:
         itemnum: str,
         btn: str = "goList",
     ) -> str:
+        self._channel_page = None
         form = {
             "FROMJSP": "FJ202C1PA01" if page == "1" and btn == "goList" else "FJ202C1PA02",
             "BTN": btn,
@@ -406,12 +795,19 @@ class FpgHttpClient:
     async def enrich_case(self, base: CaseRecord) -> CaseRecord:
         """以標案／競標管理詢價／報價明細 enrichment；找不到則保留公報摘要。"""
         channels = _bid_channels()
-        primary = base.bid_channel if base.bid_channel in channels else "gen"
+        learned = self.channel_routes.get(base.tndsalno) if self.channel_routes else ""
+        if learned in channels:
+            primary = learned
+        else:
+            primary = base.bid_channel if base.bid_channel in channels else "gen"
         fallback = "cmp" if primary == "gen" else "gen"
         last_error = ""
         for channel in (primary, fallback):
             try:
                 enriched = await self._enrich_via_channel(base, channel)
+            except CircuitOpenError:
+                # 站台已放棄：中止整批，不把剩下的案逐一寫成 error
+                raise
             except Exception as exc:
                 last_error = str(exc)
                 logger.exception(
@@ -422,6 +818,8 @@ class FpgHttpClient:
                 )
                 continue
             if enriched is not None:
+                if self.channel_routes:
+                    self.channel_routes.record(base.tndsalno, channel)
                 return enriched
         if last_error:
             base.status = "error"
@@ -457,7 +855,10 @@ class FpgHttpClient:
             bid_channel=channel,
         )
         record.source_url = cfg.post
-        await self._get(cfg.page)
+        # 已停在此 channel 的搜尋頁時不必再 GET 一次（同一 session 一次只跑一案）
+        if self._channel_page != channel:
+            await self._get(cfg.page)
+            self._channel_page = channel
         list_html = await self._post_form(
             cfg.post,
             {
@@ -534,16 +935,13 @@ class FpgHttpClient:
                 referer=cfg.post,
             )
 
-        parse_inquiry_form(inquiry_html, record)
-        parse_quote_form(quote_html, record)
+        record = await self.parser.run(_parse_case_forms, inquiry_html, quote_html, record)
 
         if record.zip_url:
-            zip_path = await self.download_zip(record.zip_url, tnd)
-            if zip_path:
-                record.zip_path = str(zip_path)
-                record.zip_sha256 = hashlib.sha256(
-                    zip_path.read_bytes()
-                ).hexdigest()
+            download = await self.download_zip(record.zip_url, tnd, inq)
+            if download:
+                record.zip_path = str(download.path)
+                record.zip_sha256 = download.sha256
         record.status = "new"
         logger.info(
             "%s enrichment 成功 %s/%s items=%s",
@@ -554,25 +952,115 @@ class FpgHttpClient:
         )
         return merge_records(base, record)
 
-    async def download_zip(self, zip_url: str, tndsalno: str) -> Optional[Path]:
+    async def download_zip(
+        self,
+        zip_url: str,
+        tndsalno: str,
+        inqcnt: str = "",
+    ) -> Optional[ZipDownload]:
+        """下載附件到 content-addressed store，再以 {案號}_{次數}.ZIP 連結出來。
+
+        同一 zip_url 已有 blob 時送條件式請求；304，或伺服器不給 ETag／
+        Last-Modified 但 Content-Length 與上次相同，即略過 body 沿用舊檔。
+        body 以串流寫入暫存檔並邊算 SHA-256，記憶體用量與附件大小無關。
+        連線中斷／逾時依 retry_policy 重試整個下載。
+        """
         url = urljoin(fpg_base_url(), zip_url)
-        self.download_dir.mkdir(parents=True, exist_ok=True)
-        path = self.download_dir / f"{tndsalno}.ZIP"
+        name = f"{tndsalno}_{inqcnt}.ZIP" if inqcnt else f"{tndsalno}.ZIP"
+        tmp = self.attachment_store.temp_path(name)
         try:
-            async with self.session.get(url) as resp:
+            async for attempt in self.retry_policy.retrying():
+                with attempt:
+                    if attempt.retry_state.attempt_number > 1:
+                        self.metrics.record_retry(DOWNLOAD_ENDPOINT)
+                    return await self._download_zip_once(
+                        url, zip_url, self.download_dir / name, tmp
+                    )
+        except Exception:
+            logger.exception("ZIP 下載例外 %s", url)
+            return None
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+        return None  # pragma: no cover
+
+    async def _download_zip_once(
+        self,
+        url: str,
+        zip_url: str,
+        dest: Path,
+        tmp: Path,
+    ) -> Optional[ZipDownload]:
+        store = self.attachment_store
+        known = store.lookup(zip_url)
+        headers = store.conditional_headers(known) if known else {}
+        await self.circuit_breaker.wait_until_closed()
+        await self.rate_limiter.acquire()
+        status: Optional[int] = None
+        size = 0
+        started = time.perf_counter()
+        try:
+            async with self.session.get(url, headers=headers) as resp:
+                status = resp.status
+                if resp.status in RETRYABLE_STATUS:
+                    raise TransientStatusError(resp.status, url)
+                if known and (
+                    resp.status == 304
+                    or (
+                        resp.status == 200
+                        and not known.has_validators
+                        and resp.content_length == known.size
+                    )
+                ):
+                    self.circuit_breaker.record_success()
+                    entry = store.touch(zip_url)
+                    path = store.materialize(entry.sha256, dest)
+                    logger.info("ZIP 未變更，略過下載 %s (%s bytes)", path, entry.size)
+                    return ZipDownload(
+                        path=path, sha256=entry.sha256, size=entry.size, reused=True
+                    )
                 if resp.status != 200:
                     logger.warning("ZIP 下載失敗 %s status=%s", url, resp.status)
                     return None
-                data = await resp.read()
-            if not data.startswith(b"PK"):
-                logger.warning("ZIP 內容不像 zip: %s", url)
-                return None
-            path.write_bytes(data)
-            logger.info("ZIP 已存 %s (%s bytes)", path, len(data))
-            return path
-        except Exception:
-            logger.exception("ZIP 下載例外 %s", url)
+                digest = hashlib.sha256()
+                head = b""
+                with tmp.open("wb") as fh:
+                    async for chunk in resp.content.iter_chunked(ZIP_CHUNK_SIZE):
+                        if len(head) < 2:
+                            head += chunk[: 2 - len(head)]
+                            if len(head) == 2 and head != b"PK":
+                                logger.warning("ZIP 內容不像 zip: %s", url)
+                                return None
+                        digest.update(chunk)
+                        fh.write(chunk)
+                        size += len(chunk)
+                etag = resp.headers.get("ETag", "")
+                last_modified = resp.headers.get("Last-Modified", "")
+        except TRANSIENT_ERRORS:
+            self.circuit_breaker.record_failure()
+            raise
+        finally:
+            self.metrics.observe(
+                DOWNLOAD_ENDPOINT,
+                seconds=time.perf_counter() - started,
+                status=status,
+                nbytes=size,
+            )
+        self.circuit_breaker.record_success()
+        if head != b"PK":
+            logger.warning("ZIP 內容不像 zip: %s", url)
             return None
+        entry = store.commit(
+            zip_url,
+            tmp,
+            sha256=digest.hexdigest(),
+            size=size,
+            etag=etag,
+            last_modified=last_modified,
+        )
+        path = store.materialize(entry.sha256, dest)
+        logger.info("ZIP 已存 %s (%s bytes)", path, size)
+        return ZipDownload(path=path, sha256=entry.sha256, size=size)
 
     async def fetch_cases(
         self,
@@ -580,16 +1068,38 @@ class FpgHttpClient:
         *,
         delay_seconds: float = 0.4,
     ) -> list[CaseRecord]:
-        records: list[CaseRecord] = []
-        for index, base in enumerate(bases, start=1):
-            logger.info(
-                "擷取案件 %s/%s：%s/%s",
-                index,
-                len(bases),
-                base.tndsalno,
-                base.inqcnt,
-            )
-            records.append(await self.enrich_case(base))
-            if delay_seconds:
-                await asyncio.sleep(delay_seconds)
-        return records
+        """逐案 enrichment，結束後保存學到的 channel 路由。
+
+        goList → goQuo → goInq 綁在此 session 的表單狀態，同一 session 不併發；
+        要平行擷取請用 FpgSessionPool（每個 session 一次一案）。
+        """
+        try:
+            records: list[CaseRecord] = []
+            for index, base in enumerate(bases, start=1):
+                records.append(await self._fetch_one(base, index, len(bases)))
+                if delay_seconds:
+                    await asyncio.sleep(delay_seconds)
+            return records
+        finally:
+            if self.channel_routes:
+                self.channel_routes.save()
+
+    async def _fetch_one(self, base: CaseRecord, index: int, total: int) -> CaseRecord:
+        logger.info(
+            "擷取案件 %s/%s：%s/%s",
+            index,
+            total,
+            base.tndsalno,
+            base.inqcnt,
+        )
+        try:
+            with snapshot_case(base.case_key):
+                return await self.enrich_case(base)
+        except CircuitOpenError:
+            raise
+        except Exception as exc:
+            # enrich_case 已逐 channel 攔錯；此處只防意外例外拖垮其他案
+            logger.exception("擷取案件例外 %s/%s", base.tndsalno, base.inqcnt)
+            base.status = "error"
+            base.error = str(exc)
+            return base
@@ -1,28 +1,64 @@
 """從 FPG HTML 解析標售公報／詢價單／報價明細。"""
 from __future__ import annotations
 
+import bisect
 import html as html_lib
 import re
-from typing import Iterable
+from typing import Iterable, Optional
 
 from app.models.case_record import CaseRecord, QuoteItem
 
+# 各 parser 共用的 pattern 於載入時編譯一次；公報／報價明細專用的放在各自段落
+_TAG = re.compile(r"<[^>]+>")
+_SPACES = re.compile(r"\s+")
+_YMD = re.compile(r"^(\d{4})[/-](\d{1,2})[/-](\d{1,2})$")
+_CONTACT = re.compile(r"^(.+?)\((.+)\)$")
+_CASE_KEY = re.compile(r">([A-Z0-9]{2}-[A-Z0-9]+)/(\d{2})<")
+_TOTAL_PAGES = re.compile(r"/(\d+)頁")
+_PAGE_MARKERS = re.compile(r"(\d+)/(\d+)頁")
+_ITEMNUM = re.compile(r"goNPage\([^)]*'(\d+)'\s*,\s*'gtpage")
+_CLAIM_ITEMS = (
+    re.compile(r'<input[^>]*name=["\']item["\'][^>]*value=["\']([^"\']+)["\']', re.I),
+    re.compile(r'<input[^>]*value=["\']([^"\']+)["\'][^>]*name=["\']item["\']', re.I),
+)
+_GO_DETAIL = re.compile(
+    r"goDetail\(\s*this\.form\s*,\s*'([^']+)'\s*,\s*'([^']+)'\s*,\s*'([^']+)'\s*\)"
+)
+_FROMJSP = (
+    re.compile(r'name=["\']FROMJSP["\'][^>]*value=["\']([^"\']*)["\']', re.I),
+    re.compile(r'value=["\']([^"\']*)["\'][^>]*name=["\']FROMJSP["\']', re.I),
+)
+
 
 def strip_html(text: str) -> str:
-    text = re.sub(r"<[^>]+>", "", text)
+    text = _TAG.sub("", text)
     text = html_lib.unescape(text)
-    return re.sub(r"\s+", " ", text).replace("\xa0", " ").strip()
+    return _SPACES.sub(" ", text).replace("\xa0", " ").strip()
 
 
 def to_iso_date(raw: str) -> str:
     """YYYY/MM/DD → YYYY-MM-DD；已是 ISO 則原樣返回。"""
     raw = (raw or "").strip()
-    m = re.match(r"^(\d{4})[/-](\d{1,2})[/-](\d{1,2})$", raw)
+    m = _YMD.match(raw)
     if not m:
         return raw
     return f"{int(m.group(1)):04d}-{int(m.group(2)):02d}-{int(m.group(3)):02d}"
 
 
+# session 逾時頁特徵（未帶登入表單時）
+SESSION_EXPIRED_MARKERS = ("請重新登入", "連線逾時")
+
+
+def is_login_page(html: str, url: str = "") -> bool:
+    """回應是否為登入頁（session 已失效被導回 mgt_logon.jsp）。"""
+    if "mgt_logon.jsp" in (url or ""):
+        return True
+    text = html or ""
+    if 'name="passwd"' in text and 'name="vcode"' in text:
+        return True
+    return any(marker in text for marker in SESSION_EXPIRED_MARKERS)
+
+
 def fill_missing_announce_dates(
     records: list[CaseRecord],
     start_date: str,
@@ -50,145 +86,172 @@ def fill_missing_announce_dates(
 
 def parse_bulletin_case_keys(html: str) -> list[tuple[str, str]]:
     """從標售公報清單抽出 (tndsalno, inqcnt)，依出現順序去重。"""
-    found = re.findall(r">([A-Z0-9]{2}-[A-Z0-9]+)/(\d{2})<", html)
+    found = _CASE_KEY.findall(html)
     return list(dict.fromkeys(found))
 
 
 def _split_contact(raw: str) -> tuple[str, str]:
     raw = strip_html(raw)
-    m = re.match(r"^(.+?)\((.+)\)$", raw)
+    m = _CONTACT.match(raw)
     if m:
         return m.group(1).strip(), m.group(2).strip()
     return raw, ""
 
 
+# 標售公報清單：序號格（競標案會多 <br><font color=red>競標案件</font>）
+_BULLETIN_MARKER = re.compile(
+    r'<td width="8%">\s*<div align="center"><font size="2">\s*\d+\s*'
+    r"((?:<br>[\s\S]*?)?)</font>"
+)
+# 案號列：報價截止日、案號/詢價次數、存放地點、聯絡人(電話)
+_BULLETIN_CASE = re.compile(
+    r'<font size="2">(\d{4}/\d{2}/\d{2})\s*</font></div>\s*</td>\s*'
+    r'<td[^>]*>\s*<div align="center"><font size="2">'
+    r"([A-Z0-9]{2}-[A-Z0-9]+)/(\d{2})</font></div>\s*</td>\s*"
+    r'<td[^>]*>\s*<div align="center"><font size="2">([^<]*)</font></div>\s*</td>\s*'
+    r'<td[^>]*><font size="2">([^<]*)</font></td>'
+)
+# 公告列：公告日、供應商、數量
+_BULLETIN_ROW = re.compile(
+    r'<font size="2">(\d{4}/\d{2}/\d{2})</font></div>\s*</td>\s*'
+    r'<td[^>]*>\s*<div align="center"><font size="2">([^<]*)</font></div>\s*</td>\s*'
+    r'<td[^>]*>\s*<div align="center"><font size="2">([^<]*)</font></div>'
+)
+_BULLETIN_DESC = re.compile(r'<td colspan="5"><font size="2">\s*([\s\S]*?)<br>')
+_BULLETIN_ECO = re.compile(
+    r"環保法定代碼：</font></td>\s*<td[^>]*><font[^>]*>([^<]+)"
+)
+_AUCTION_MARK = re.compile("競標案件")
+# 每案只採用案號前這段距離內的公告列／品名／環保代碼，避免多案同段時欄位錯位
+BULLETIN_LOOKBACK = 6500
+
+
+class _Spans:
+    """某 pattern 在一個序號區塊內的全部比對（不重疊，起訖皆遞增），以 bisect 取視窗內的筆。"""
+
+    def __init__(self, pattern: re.Pattern, html: str, start: int, end: int) -> None:
+        self.matches = list(pattern.finditer(html, start, end))
+        self.starts = [m.start() for m in self.matches]
+        self.ends = [m.end() for m in self.matches]
+
+    def last(self, lo: int, hi: int) -> Optional[re.Match]:
+        """[lo, hi) 內最後一筆。"""
+        index = bisect.bisect_right(self.ends, hi) - 1
+        if index >= 0 and self.starts[index] >= lo:
+            return self.matches[index]
+        return None
+
+    def first(self, lo: int, hi: int) -> Optional[re.Match]:
+        """[lo, hi) 內第一筆。"""
+        index = bisect.bisect_left(self.starts, lo)
+        if index < len(self.matches) and self.ends[index] <= hi:
+            return self.matches[index]
+        return None
+
+
+class _BulletinItem:
+    """單一序號區塊：各欄位 pattern 在區塊內各掃一次。"""
+
+    def __init__(self, html: str, start: int, end: int, auction: bool) -> None:
+        self.start = start
+        self.auction = auction
+        self.rows = _Spans(_BULLETIN_ROW, html, start, end)
+        self.descs = _Spans(_BULLETIN_DESC, html, start, end)
+        self.ecos = _Spans(_BULLETIN_ECO, html, start, end)
+        self.marks = None if auction else _Spans(_AUCTION_MARK, html, start, end)
+
+
+def _bulletin_record(case_m: re.Match, item: _BulletinItem) -> CaseRecord:
+    deadline, tndsalno, inqcnt, location, contact_raw = case_m.groups()
+    lo = max(item.start, case_m.start() - BULLETIN_LOOKBACK)
+    hi = case_m.start()
+    if not item.auction and item.marks.last(lo, hi):
+        item.auction = True
+
+    announce = ""
+    quantity = ""
+    row = item.rows.last(lo, hi)
+    if row:
+        announce, _supplier, quantity = row.groups()
+
+    description = ""
+    desc = item.descs.last(lo, hi)
+    if desc:
+        description = strip_html(desc.group(1))
+
+    eco = ""
+    eco_m = item.ecos.first(lo, hi)
+    if eco_m:
+        eco = strip_html(eco_m.group(1))
+        if eco in {"--", "-"}:
+            eco = ""
+
+    contact_name, contact_phone = _split_contact(contact_raw)
+    items = []
+    if description or quantity:
+        items = [
+            QuoteItem(
+                description=description or "(公報品名未解析)",
+                quantity=strip_html(quantity),
+            )
+        ]
+    return CaseRecord(
+        tndsalno=tndsalno,
+        inqcnt=inqcnt,
+        bid_channel="cmp" if item.auction else "gen",
+        location=strip_html(location),
+        announce_date=to_iso_date(announce),
+        quote_deadline=to_iso_date(deadline),
+        plant_contact=contact_name,
+        plant_phone=contact_phone,
+        eco_code=eco,
+        items=items,
+    )
+
+
 def parse_bulletin_cases(html: str) -> list[CaseRecord]:
-    """從標售公報清單解析可取得的摘要欄位（標案／競標管理前備援）。"""
+    """從標售公報清單解析可取得的摘要欄位（標案／競標管理前備援）。
+
+    序號格只掃一次（同時取得區塊邊界與競標標記）；有案號的區塊內，公告列／品名／
+    環保代碼各掃一次，每案以 bisect 取案號前 BULLETIN_LOOKBACK 內的筆，不再回頭重掃。
+    """
     records: list[CaseRecord] = []
     seen: set[tuple[str, str]] = set()
-
-    # 依清單序號切開；競標案項次會多 <br><font color=red>競標案件</font>
-    parts = re.split(
-        r'<td width="8%">\s*<div align="center"><font size="2">\s*\d+\s*'
-        r"(?:<br>[\s\S]*?)?</font>",
-        html,
-    )
-    # 序號區塊（含是否標示競標案件）與 parts[1:] 對齊
-    markers = re.findall(
-        r'<td width="8%">\s*<div align="center"><font size="2">\s*\d+\s*'
-        r"((?:<br>[\s\S]*?)?)</font>",
-        html,
-    )
-    for index, chunk in enumerate(parts[1:]):
-        is_auction = index < len(markers) and "競標案件" in markers[index]
-        for case_m in re.finditer(
-            r'<font size="2">(\d{4}/\d{2}/\d{2})\s*</font></div>\s*</td>\s*'
-            r'<td[^>]*>\s*<div align="center"><font size="2">'
-            r"([A-Z0-9]{2}-[A-Z0-9]+)/(\d{2})</font></div>\s*</td>\s*"
-            r'<td[^>]*>\s*<div align="center"><font size="2">([^<]*)</font></div>\s*</td>\s*'
-            r'<td[^>]*><font size="2">([^<]*)</font></td>',
-            chunk,
-        ):
-            deadline, tndsalno, inqcnt, location, contact_raw = case_m.groups()
-            key = (tndsalno, inqcnt)
+    markers = list(_BULLETIN_MARKER.finditer(html))
+    for index, marker in enumerate(markers):
+        start = marker.end()
+        end = markers[index + 1].start() if index + 1 < len(markers) else len(html)
+        item: Optional[_BulletinItem] = None
+        for case_m in _BULLETIN_CASE.finditer(html, start, end):
+            key = (case_m.group(2), case_m.group(3))
             if key in seen:
                 continue
             seen.add(key)
-
-            # 每個案號往前取區塊，避免多案同段時欄位錯位
-            local = chunk[max(0, case_m.start() - 6500) : case_m.start()]
-            # 若本段開頭即本案說明，再以項次後全文補強
-            if is_auction or "競標案件" in local:
-                is_auction = True
-
-            announce = ""
-            quantity = ""
-            rows = re.findall(
-                r'<font size="2">(\d{4}/\d{2}/\d{2})</font></div>\s*</td>\s*'
-                r'<td[^>]*>\s*<div align="center"><font size="2">([^<]*)</font></div>\s*</td>\s*'
-                r'<td[^>]*>\s*<div align="center"><font size="2">([^<]*)</font></div>',
-                local,
-            )
-            if rows:
-                announce, _supplier, quantity = rows[-1]
-
-            description = ""
-            desc_matches = re.findall(
-                r'<td colspan="5"><font size="2">\s*([\s\S]*?)<br>',
-                local,
-            )
-            if desc_matches:
-                description = strip_html(desc_matches[-1])
-
-            eco = ""
-            eco_m = re.search(
-                r"環保法定代碼：</font></td>\s*<td[^>]*><font[^>]*>([^<]+)",
-                local,
-            )
-            if eco_m:
-                eco = strip_html(eco_m.group(1))
-                if eco in {"--", "-"}:
-                    eco = ""
-
-            contact_name, contact_phone = _split_contact(contact_raw)
-            items = []
-            if description or quantity:
-                items = [
-                    QuoteItem(
-                        description=description or "(公報品名未解析)",
-                        quantity=strip_html(quantity),
-                    )
-                ]
-
-            records.append(
-                CaseRecord(
-                    tndsalno=tndsalno,
-                    inqcnt=inqcnt,
-                    bid_channel="cmp" if is_auction else "gen",
-                    location=strip_html(location),
-                    announce_date=to_iso_date(announce),
-                    quote_deadline=to_iso_date(deadline),
-                    plant_contact=contact_name,
-                    plant_phone=contact_phone,
-                    eco_code=eco,
-                    items=items,
-                )
-            )
+            if item is None:
+                item = _BulletinItem(html, start, end, "競標案件" in marker.group(1))
+            records.append(_bulletin_record(case_m, item))
     return records
 
 
 def parse_bulletin_total_pages(html: str) -> int:
     # goNPage(...,'21','gtpage1') 或 /2頁
-    m = re.search(r"/(\d+)頁", html)
+    m = _TOTAL_PAGES.search(html)
     if m:
         return max(1, int(m.group(1)))
-    m = re.search(r"goNPage\([^)]*'(\d+)'\s*,\s*'gtpage", html)
-    if m:
-        # itemnum is total items, not pages — fallback
-        pass
-    markers = re.findall(r"(\d+)/(\d+)頁", html)
+    markers = _PAGE_MARKERS.findall(html)
     if markers:
         return max(int(b) for _, b in markers)
     return 1
 
 
 def parse_bulletin_itemnum(html: str) -> str:
-    m = re.search(r"goNPage\([^)]*'(\d+)'\s*,\s*'gtpage", html)
+    m = _ITEMNUM.search(html)
     return m.group(1) if m else ""
 
 
 def parse_bulletin_claim_items(html: str) -> list[tuple[str, str, str]]:
     """尚未選取列的 checkbox：value=blocid,tndsalno,inqcnt（依出現順序去重）。"""
-    found = re.findall(
-        r'<input[^>]*name=["\']item["\'][^>]*value=["\']([^"\']+)["\']',
-        html,
-        flags=re.I,
-    )
-    found += re.findall(
-        r'<input[^>]*value=["\']([^"\']+)["\'][^>]*name=["\']item["\']',
-        html,
-        flags=re.I,
-    )
+    found = [raw for pattern in _CLAIM_ITEMS for raw in pattern.findall(html)]
     items: list[tuple[str, str, str]] = []
     seen: set[tuple[str, str, str]] = set()
     for raw in found:
@@ -206,117 +269,196 @@ def parse_bulletin_claim_items(html: str) -> list[tuple[str, str, str]]:
 
 def parse_bid_go_detail(html: str) -> tuple[str, str, str] | None:
     """標案管理清單：goDetail(form, blocid, tndsalno, inqcnt)。"""
-    m = re.search(
-        r"goDetail\(\s*this\.form\s*,\s*'([^']+)'\s*,\s*'([^']+)'\s*,\s*'([^']+)'\s*\)",
-        html,
-    )
+    m = _GO_DETAIL.search(html)
     if not m:
         return None
     return m.group(1), m.group(2), m.group(3)
 
 
 def parse_fromjsp(html: str) -> str:
-    m = re.search(r'name=["\']FROMJSP["\'][^>]*value=["\']([^"\']*)["\']', html, re.I)
-    if m:
-        return m.group(1)
-    m = re.search(r'value=["\']([^"\']*)["\'][^>]*name=["\']FROMJSP["\']', html, re.I)
-    return m.group(1) if m else ""
+    for pattern in _FROMJSP:
+        m = pattern.search(html)
+        if m:
+            return m.group(1)
+    return ""
+
+
+# 詢價單「標籤：值」欄位；有編號的標籤優先，其次不帶編號
+_INQUIRY_LABELS = (
+    "二、委託公司",
+    "委託公司",
+    "三、存放地點",
+    "存放地點",
+    "四、公告日",
+    "公告日",
+    "五、報價截止日",
+    "報價截止日",
+    "提貨期限",
+)
+_INQUIRY_FIELDS = {
+    label: re.compile(rf"{re.escape(label)}：([^<]+)") for label in _INQUIRY_LABELS
+}
+_INQUIRY_DEPARTMENT = re.compile(r"委託部門：</font></td>\s*<td[^>]*><font[^>]*>([^<]+)")
+_INQUIRY_PICKUP = re.compile(r"七、提貨期限：(.+?)</font>", re.S)
+_INQUIRY_CONTACT = re.compile(
+    r"廠區</font></td>\s*<td[^>]*><font[^>]*>([^<]+)</font></td>\s*"
+    r"<td[^>]*><font[^>]*>聯絡電話</font></td>\s*"
+    r"<td[^>]*><font[^>]*>([^<]+)",
+    re.S,
+)
+_INQUIRY_CASE = re.compile(r"標售案號/詢價次數：\s*([^/\s]+)/(\d{2})")
+_INQUIRY_BLOCID = re.compile(
+    r'name=["\'](?:blocid|_u_gb04_cblocid)["\'][^>]*value=["\']([^"\']+)["\']', re.I
+)
 
 
 def parse_inquiry_form(html: str, record: CaseRecord) -> CaseRecord:
     """解析標售詢價單欄位。"""
 
     def field(label: str) -> str:
-        m = re.search(rf"{re.escape(label)}：([^<]+)", html)
+        m = _INQUIRY_FIELDS[label].search(html)
         return strip_html(m.group(1)) if m else ""
 
     record.company = field("二、委託公司") or field("委託公司")
-    dept = re.search(
-        r"委託部門：</font></td>\s*<td[^>]*><font[^>]*>([^<]+)",
-        html,
-    )
+    dept = _INQUIRY_DEPARTMENT.search(html)
     record.department = strip_html(dept.group(1)) if dept else ""
     record.location = field("三、存放地點") or field("存放地點")
     record.announce_date = to_iso_date(field("四、公告日") or field("公告日"))
     record.quote_deadline = to_iso_date(
         field("五、報價截止日") or field("報價截止日")
     )
-    pickup = re.search(r"七、提貨期限：(.+?)</font>", html, re.S)
+    pickup = _INQUIRY_PICKUP.search(html)
     if pickup:
         record.pickup_period = strip_html(pickup.group(1))
     else:
         record.pickup_period = field("提貨期限")
 
-    contact = re.search(
-        r"廠區</font></td>\s*<td[^>]*><font[^>]*>([^<]+)</font></td>\s*"
-        r"<td[^>]*><font[^>]*>聯絡電話</font></td>\s*"
-        r"<td[^>]*><font[^>]*>([^<]+)",
-        html,
-        re.S,
-    )
+    contact = _INQUIRY_CONTACT.search(html)
     if contact:
         record.plant_contact = strip_html(contact.group(1))
         record.plant_phone = strip_html(contact.group(2))
 
-    case_m = re.search(r"標售案號/詢價次數：\s*([^/\s]+)/(\d{2})", html)
+    case_m = _INQUIRY_CASE.search(html)
     if case_m:
         record.tndsalno = case_m.group(1).strip()
         record.inqcnt = case_m.group(2).strip()
 
-    bloc = re.search(
-        r'name=["\'](?:blocid|_u_gb04_cblocid)["\'][^>]*value=["\']([^"\']+)["\']',
-        html,
-        re.I,
-    )
+    bloc = _INQUIRY_BLOCID.search(html)
     if bloc:
         record.blocid = bloc.group(1)
     return record
 
 
+_QUOTE_ITEM_MARK = "材料編號:"
+_QUOTE_SECTION_END = "八、報價說明"
+_QUOTE_ITEM_HEAD = re.compile(
+    r"材料編號:([^<\s]+)<br>\s*((?:&lt;|<)[^<&]+(?:&gt;|>))\s*</font>"
+)
+_QUOTE_QTY_LABEL = re.compile(r"標售數量</font></div>\s*</td>")
+_QUOTE_ROW_END = re.compile(r"</tr>\s*")
+# 標題列之後的資料列首格；列前可隔一段註解
+_QUOTE_QTY_CELL = re.compile(
+    r'<tr>\s*<td[^>]*>\s*<div align="center"><font size="2">([^<]+)</font>'
+)
+_QUOTE_QTY_AFTER_COMMENT = re.compile(r"-->\s*" + _QUOTE_QTY_CELL.pattern)
+_QUOTE_QUALITY = re.compile(r"品質說明</font><font[^>]*>：([^<]+)")
+_QUOTE_ITEM_PLAIN = re.compile(r"材料編號:([^<\s]+)<br>\s*([\s\S]*?)</font>")
+_QUOTE_ZIP = re.compile(r'(/j202/share/j202_download/[^"\']+\.ZIP)', re.I)
+_QUOTE_VENDOR = re.compile(r"四、廠商配合事項[：:]?\s*(.*?)</font>", re.S)
+_QUOTE_ECO = re.compile(r"五、環保代碼[：:]?\s*([^<]+)")
+
+
+def _positions(html: str, needle: str) -> list[int]:
+    found: list[int] = []
+    index = html.find(needle)
+    while index >= 0:
+        found.append(index)
+        index = html.find(needle, index + len(needle))
+    return found
+
+
+def _quote_quantity(html: str, pos: int, end: int) -> str:
+    """標售數量標題後第一個 </tr> 接資料列（或註解後接資料列）的首格。
+
+    註解後的資料列只往前找一次：找不到時，之後任何 </tr> 接的註解也不會找到。
+    """
+    comment_missing = False
+    for row_end in _QUOTE_ROW_END.finditer(html, pos, end):
+        after = row_end.end()
+        if html.startswith("<!--", after, end):
+            if comment_missing:
+                continue
+            cell = _QUOTE_QTY_AFTER_COMMENT.search(html, after + 4, end)
+            if cell:
+                return strip_html(cell.group(1))
+            comment_missing = True
+            continue
+        cell = _QUOTE_QTY_CELL.match(html, after, end)
+        if cell:
+            return strip_html(cell.group(1))
+    return ""
+
+
+def _quote_items(html: str) -> Iterable[tuple[re.Match, str, str]]:
+    """報價明細逐品項：(品項標頭, 標售數量, 品質說明)。
+
+    材料編號與「八、報價說明」的位置各找一次；品項範圍到下一個材料編號或報價說明為止，
+    數量與品質說明只在該範圍內往前掃，不回溯到其他品項。
+    """
+    marks = _positions(html, _QUOTE_ITEM_MARK)
+    stops = _positions(html, _QUOTE_SECTION_END)
+    pos = 0
+    for mark in marks:
+        if mark < pos:
+            continue
+        head = _QUOTE_ITEM_HEAD.match(html, mark)
+        if not head:
+            continue
+        start = head.end()
+        end = len(html)
+        index = bisect.bisect_left(marks, start)
+        if index < len(marks):
+            end = marks[index]
+        index = bisect.bisect_left(stops, start)
+        if index < len(stops):
+            end = min(end, stops[index])
+
+        qty = ""
+        label = _QUOTE_QTY_LABEL.search(html, start, end)
+        if label:
+            qty = _quote_quantity(html, label.end(), end)
+        quality = ""
+        q_m = _QUOTE_QUALITY.search(html, start, end)
+        if q_m:
+            quality = strip_html(q_m.group(1))
+        yield head, qty, quality
+        pos = end
+
+
 def parse_quote_form(html: str, record: CaseRecord) -> CaseRecord:
     """解析報價單：品名規格、標售數量、品質說明、附件。"""
-    zips = re.findall(r'(/j202/share/j202_download/[^"\']+\.ZIP)', html, re.I)
-    if zips:
-        record.zip_url = zips[0]
+    zip_m = _QUOTE_ZIP.search(html)
+    if zip_m:
+        record.zip_url = zip_m.group(1)
 
-    vendor = re.search(r"四、廠商配合事項[：:]?\s*(.*?)</font>", html, re.S)
+    vendor = _QUOTE_VENDOR.search(html)
     if vendor:
         record.vendor_notes = strip_html(vendor.group(1))
 
-    eco = re.search(r"五、環保代碼[：:]?\s*([^<]+)", html)
+    eco = _QUOTE_ECO.search(html)
     if eco:
         record.eco_code = strip_html(eco.group(1))
         if record.eco_code in {"--", "-"}:
             record.eco_code = ""
 
-    items: list[QuoteItem] = []
-    for m in re.finditer(
-        r"材料編號:([^<\s]+)<br>\s*((?:&lt;|<)[^<&]+(?:&gt;|>))\s*</font>"
-        r"([\s\S]*?)(?=材料編號:|八、報價說明|$)",
-        html,
-    ):
-        desc = strip_html(m.group(2))
-        chunk = m.group(3)
-        qty = ""
-        qty_m = re.search(
-            r"標售數量</font></div>\s*</td>[\s\S]*?</tr>\s*(?:<!--[\s\S]*?-->\s*)?<tr>\s*"
-            r'<td[^>]*>\s*<div align="center"><font size="2">([^<]+)</font>',
-            chunk,
-        )
-        if qty_m:
-            qty = strip_html(qty_m.group(1))
-        quality = ""
-        q_m = re.search(r"品質說明</font><font[^>]*>：([^<]+)", chunk)
-        if q_m:
-            quality = strip_html(q_m.group(1))
-        items.append(QuoteItem(description=desc, quantity=qty, quality_note=quality))
+    items = [
+        QuoteItem(description=strip_html(head.group(2)), quantity=qty, quality_note=quality)
+        for head, qty, quality in _quote_items(html)
+    ]
 
     # 若沒有 <> 格式，退而求其次抓材料編號後文字
     if not items:
-        for m in re.finditer(
-            r"材料編號:([^<\s]+)<br>\s*([\s\S]*?)</font>",
-            html,
-        ):
+        for m in _QUOTE_ITEM_PLAIN.finditer(html):
             desc = strip_html(m.group(2))
             if desc:
                 items.append(QuoteItem(description=desc))
@@ -0,0 +1,149 @@
+"""FPG 登入 session 快取：保存登入後 cookie，下次先探測是否仍有效再決定要不要重登。
+
+排程腳本存檔於 FPG_CACHE_DIR，同一台機器後續執行可沿用：GitHub Actions 每次排程都是
+新 runner，只有同一 job 內的重試會沿用（cookie 不放進 actions/cache，避免登入狀態
+外流到其他 workflow）。API 行程則留在記憶體。
+"""
+from __future__ import annotations
+
+import json
+import logging
+import time
+from http.cookies import SimpleCookie
+from pathlib import Path
+from typing import Any, Optional
+
+from aiohttp.abc import AbstractCookieJar
+from yarl import URL
+
+from app.core.config import settings
+from app.services.fpg_urls import fpg_base_url
+
+logger = logging.getLogger(__name__)
+
+SESSION_CACHE_FILENAME = "fpg_session.json"
+
+# API 行程內共用（key = 帳號）
+_MEMORY: dict[str, dict[str, Any]] = {}
+
+
+def dump_cookies(jar: AbstractCookieJar) -> list[dict[str, Any]]:
+    """CookieJar → 可 JSON 化的 list（不含到期時間，以快取 max_age 控制）。"""
+    cookies: list[dict[str, Any]] = []
+    for morsel in jar:
+        cookies.append(
+            {
+                "name": morsel.key,
+                "value": morsel.value,
+                "domain": morsel["domain"],
+                "path": morsel["path"],
+                "secure": bool(morsel["secure"]),
+                "httponly": bool(morsel["httponly"]),
+            }
+        )
+    return cookies
+
+
+def restore_cookies(
+    jar: AbstractCookieJar,
+    cookies: list[dict[str, Any]],
+    *,
+    response_url: str,
+) -> None:
+    url = URL(response_url)
+    for item in cookies:
+        name = item.get("name")
+        if not name:
+            continue
+        cookie: SimpleCookie = SimpleCookie()
+        cookie[name] = item.get("value", "")
+        morsel = cookie[name]
+        if item.get("domain"):
+            morsel["domain"] = item["domain"]
+        if item.get("path"):
+            morsel["path"] = item["path"]
+        if item.get("secure"):
+            morsel["secure"] = True
+        if item.get("httponly"):
+            morsel["httponly"] = True
+        jar.update_cookies(cookie, response_url=url)
+
+
+class FpgSessionCache:
+    """登入 cookie 的存取；path=None 時只存在行程記憶體。"""
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        *,
+        max_age_seconds: float = 6 * 3600,
+        username: Optional[str] = None,
+    ) -> None:
+        self.path = path
+        self.max_age_seconds = max_age_seconds
+        self.username = username if username is not None else settings.FPG_USERNAME
+
+    @classmethod
+    def from_settings(cls, slot: int = 0) -> "FpgSessionCache":
+        """slot > 0 供 session pool 的其他 session 各存一份。"""
+        filename = SESSION_CACHE_FILENAME
+        if slot:
+            filename = filename.replace(".json", f"_{slot}.json")
+        return cls(
+            Path(settings.FPG_CACHE_DIR) / filename,
+            max_age_seconds=settings.FPG_SESSION_MAX_AGE,
+        )
+
+    @classmethod
+    def in_memory(cls) -> "FpgSessionCache":
+        return cls(None, max_age_seconds=settings.FPG_SESSION_MAX_AGE)
+
+    def _read(self) -> Optional[dict[str, Any]]:
+        if self.path is None:
+            return _MEMORY.get(self.username)
+        if not self.path.is_file():
+            return None
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            logger.warning("FPG session 快取無法讀取，忽略 %s", self.path)
+            return None
+
+    def load(self) -> Optional[list[dict[str, Any]]]:
+        """回傳仍在有效期內、同帳號同網域的 cookies；否則 None。"""
+        payload = self._read()
+        if not payload:
+            return None
+        if payload.get("username") != self.username:
+            return None
+        if payload.get("base_url") != fpg_base_url():
+            return None
+        age = time.time() - float(payload.get("saved_at") or 0)
+        if age > self.max_age_seconds:
+            logger.info("FPG session 快取已逾 %.0fs，需重新登入", age)
+            return None
+        return payload.get("cookies") or None
+
+    def save(self, cookies: list[dict[str, Any]]) -> None:
+        payload = {
+            "username": self.username,
+            "base_url": fpg_base_url(),
+            "saved_at": time.time(),
+            "cookies": cookies,
+        }
+        if self.path is None:
+            _MEMORY[self.username] = payload
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(self.path)
+
+    def clear(self) -> None:
+        if self.path is None:
+            _MEMORY.pop(self.username, None)
+            return
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
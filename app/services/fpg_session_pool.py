@@ -0,0 +1,267 @@
+"""多個獨立登入的 FPG session：報價單流程（goList → goQuo → goInq）綁在單一 session 的表單狀態，
+要平行擷取就開多個 session，各自一組 aiohttp.ClientSession／cookie jar，案件交給空閒者處理。
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextlib import AsyncExitStack
+from pathlib import Path
+from typing import Awaitable, Callable, Iterable, Optional, TypeVar
+
+import aiohttp
+
+from app.core.config import settings
+from app.models.case_record import CaseRecord
+from app.services.attachment_store import AttachmentStore
+from app.services.bulletin_cache import BulletinCache
+from app.services.captcha_service import CaptchaService
+from app.services.channel_routes import ChannelRouteBook
+from app.services.fpg_http_client import (
+    CLAIM_BATCH_PAUSE,
+    DEFAULT_DOWNLOAD_DIR,
+    FpgHttpClient,
+)
+from app.services.fpg_session_cache import FpgSessionCache
+from app.services.html_snapshot_store import HtmlSnapshotStore
+from app.services.http_connector import build_connector
+from app.services.http_metrics import HttpMetrics
+from app.services.response_decoder import ResponseDecoder
+from app.services.request_policy import CircuitBreaker, RateLimiter
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class FpgSessionPool:
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        *,
+        rate_limiter: Optional[RateLimiter] = None,
+        use_session_cache: bool = True,
+        channel_routes: Optional[ChannelRouteBook] = None,
+        download_dir: Optional[Path] = None,
+        connector: Optional[aiohttp.BaseConnector] = None,
+        bulletin_cache: Optional[BulletinCache] = None,
+        snapshots: Optional[HtmlSnapshotStore] = None,
+    ) -> None:
+        size = max(1, size if size is not None else settings.FPG_SESSION_POOL_SIZE)
+        # 全部 session 共用同一個站台請求預算、斷路器、請求統計、OCR 模型、channel 路由與附件索引
+        # （各自一份 AttachmentStore 時，後存的 index.json 會蓋掉其他 session 的條目）
+        limiter = rate_limiter or RateLimiter(settings.FPG_MAX_RPS)
+        breaker = CircuitBreaker.from_settings()
+        captcha = CaptchaService()
+        self.channel_routes = channel_routes
+        self.metrics = HttpMetrics()
+        self.decoder = ResponseDecoder()
+        self.snapshots = snapshots
+        self.attachment_store = AttachmentStore(
+            (download_dir or DEFAULT_DOWNLOAD_DIR) / "store"
+        )
+        self.clients = [
+            FpgHttpClient(
+                captcha_service=captcha,
+                download_dir=download_dir,
+                attachment_store=self.attachment_store,
+                rate_limiter=limiter,
+                circuit_breaker=breaker,
+                metrics=self.metrics,
+                decoder=self.decoder,
+                connector=connector,
+                bulletin_cache=bulletin_cache,
+                snapshots=snapshots,
+                session_cache=(
+                    FpgSessionCache.from_settings(slot) if use_session_cache else None
+                ),
+                channel_routes=channel_routes,
+            )
+            for slot in range(size)
+        ]
+        self._stack: Optional[AsyncExitStack] = None
+
+    async def __aenter__(self) -> "FpgSessionPool":
+        self._stack = AsyncExitStack()
+        if (
+            len(self.clients) > 1
+            and self.primary.connector is None
+            and not settings.HTTP_SHARE_CONNECTOR
+        ):
+            # 多個 session 連同一站台：共用 keep-alive 連線，pool 結束時關閉
+            connector = build_connector()
+            self._stack.push_async_callback(connector.close)
+            for client in self.clients:
+                client.connector = connector
+        for client in self.clients:
+            await self._stack.enter_async_context(client)
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        if self._stack:
+            await self._stack.aclose()
+            self._stack = None
+
+    @property
+    def primary(self) -> FpgHttpClient:
+        """公報搜尋／轉報價用的主 session。"""
+        return self.clients[0]
+
+    async def login_all(self) -> None:
+        """主 session 必須登入成功；其餘失敗者移出 pool，不中斷整批。"""
+        await self.primary.ensure_login()
+        others = self.clients[1:]
+        if not others:
+            return
+        results = await asyncio.gather(
+            *(client.ensure_login() for client in others),
+            return_exceptions=True,
+        )
+        alive = [self.primary]
+        for slot, (client, result) in enumerate(zip(others, results), start=1):
+            if isinstance(result, BaseException):
+                logger.error("FPG session #%s 登入失敗，移出 pool：%s", slot, result)
+                continue
+            alive.append(client)
+        self.clients = alive
+        logger.info("FPG session pool：%s 個 session 可用", len(self.clients))
+
+    async def fetch_cases(self, bases: list[CaseRecord]) -> list[CaseRecord]:
+        """案件交給空閒的 session；每個 session 一次只跑一案，輸出順序對齊 bases。
+
+        只有一個 session 時沿用 FpgHttpClient.fetch_cases（逐案）。
+        """
+        if len(self.clients) == 1:
+            return await self.primary.fetch_cases(bases)
+
+        logger.info("session pool 擷取 %s 案（sessions=%s）", len(bases), len(self.clients))
+        indexed = list(enumerate(bases, start=1))
+        try:
+            return await self.run_each(
+                indexed,
+                lambda client, item: client._fetch_one(item[1], item[0], len(bases)),
+            )
+        finally:
+            if self.channel_routes:
+                self.channel_routes.save()
+
+    async def claim_and_fetch(
+        self,
+        start_date: str,
+        end_date: str,
+        bases: list[CaseRecord],
+        *,
+        batch_size: int = 40,
+        claim_keys: Iterable[tuple[str, str]] = (),
+    ) -> tuple[list[CaseRecord], list[tuple[str, str, str]]]:
+        """轉報價與 enrichment 管線化：每批 goSave 完成就把該批案件交給擷取 worker。
+
+        已選取（不需轉報價）的案一開始就可擷取；主 session 送 goSave 的同時，
+        其他 session 已在抓報價單。主 session 等轉報價全部送完才加入擷取
+        （goList／goQuo 會換掉 goSave 依賴的公報表單狀態），單 session 時即先轉報價、後擷取。
+        claim_keys 為另外只轉報價、不擷取的 (tndsalno, inqcnt)（例如差異模式未變更的案）。
+        回傳 (與 bases 對齊的 records, 實際送出的 (blocid, tndsalno, inqcnt))。
+        """
+        primary = self.primary
+        index_of = {(b.tndsalno, b.inqcnt): i for i, b in enumerate(bases)}
+        snapshot, selectable = await primary.plan_claims(
+            start_date,
+            end_date,
+            allowed_keys=set(index_of).union(claim_keys),
+        )
+        waiting = {
+            index_of[(tnd, inq)] for _, tnd, inq in selectable if (tnd, inq) in index_of
+        }
+        ready: asyncio.Queue[Optional[int]] = asyncio.Queue()
+        for index in range(len(bases)):
+            if index not in waiting:
+                ready.put_nowait(index)
+
+        workers = self.clients[1:] + [primary]
+        claims_done = asyncio.Event()
+
+        claimed: list[tuple[str, str, str]] = []
+        records: list[Optional[CaseRecord]] = [None] * len(bases)
+
+        async def produce() -> None:
+            try:
+                for offset in range(0, len(selectable), batch_size):
+                    batch = selectable[offset : offset + batch_size]
+                    await primary.claim_batch(snapshot, batch)
+                    claimed.extend(batch)
+                    for _, tnd, inq in batch:
+                        if (tnd, inq) in index_of:
+                            ready.put_nowait(index_of[(tnd, inq)])
+                    logger.info(
+                        "轉報價批次 %s–%s／%s 完成，已交給擷取",
+                        offset + 1,
+                        offset + len(batch),
+                        len(selectable),
+                    )
+                    await asyncio.sleep(CLAIM_BATCH_PAUSE)
+            finally:
+                claims_done.set()
+                for _ in workers:
+                    ready.put_nowait(None)
+
+        async def consume(client: FpgHttpClient) -> None:
+            if client is primary:
+                await claims_done.wait()
+            while True:
+                index = await ready.get()
+                if index is None:
+                    return
+                records[index] = await client._fetch_one(
+                    bases[index], index + 1, len(bases)
+                )
+
+        logger.info(
+            "管線擷取 %s 案（待轉報價 %s、workers=%s）",
+            len(bases),
+            len(selectable),
+            len(workers),
+        )
+        try:
+            results = await asyncio.gather(
+                produce(),
+                *(consume(client) for client in workers),
+                return_exceptions=True,
+            )
+        finally:
+            if self.channel_routes:
+                self.channel_routes.save()
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        # goSave 失敗已在上面丟出；走到這裡每個 index 都已擷取
+        return [r for r in records if r is not None], claimed
+
+    async def run_each(
+        self,
+        items: Iterable[T],
+        func: Callable[[FpgHttpClient, T], Awaitable[R]],
+    ) -> list[R]:
+        """每個 item 交給空閒 session（每 session 同時只跑一件），結果順序對齊 items。
+
+        任一 item 丟出例外即取消其餘 item 並原樣丟出。
+        """
+        idle: asyncio.Queue[FpgHttpClient] = asyncio.Queue()
+        for client in self.clients:
+            idle.put_nowait(client)
+
+        async def run(item: T) -> R:
+            client = await idle.get()
+            # 失敗時不歸還 session：整批即將取消，等待中的 item 不該再拿到它
+            result = await func(client, item)
+            idle.put_nowait(client)
+            return result
+
+        tasks = [asyncio.ensure_future(run(item)) for item in items]
+        try:
+            return list(await asyncio.gather(*tasks))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
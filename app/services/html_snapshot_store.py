@@ -0,0 +1,180 @@
+"""原始 HTML 快照（選用）：每個抓到的頁面以 gzip 存檔，供 parser 修正後離線重新解析或做 benchmark。
+
+版面：
+  <root>/blobs/<sha[:2]>/<sha>.html.gz   內容以 SHA-256 命名，跨次執行自動去重
+  <root>/runs/<run_id>.jsonl              每次執行一個索引檔，一行一個請求
+
+案號由 contextvar 帶入（enrichment 期間設定），HTTP 層不必逐一傳參數。
+"""
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import gzip
+import hashlib
+import json
+import logging
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+GZIP_LEVEL = 6
+# 表單裡可辨識頁面種類的欄位（其餘欄位不存，避免寫入帳密）
+FORM_KEYS = (
+    "BTN",
+    "FROMJSP",
+    "page",
+    "date_f",
+    "date_e",
+    "tndsalno",
+    "inqcnt",
+    "pageModel.pagePosition",
+)
+
+current_case_key: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "current_case_key", default=""
+)
+
+
+@contextlib.contextmanager
+def snapshot_case(case_key: str) -> Iterator[None]:
+    """此區塊內的請求在快照索引上標記為 case_key。"""
+    token = current_case_key.set(case_key)
+    try:
+        yield
+    finally:
+        current_case_key.reset(token)
+
+
+def form_fields(data) -> dict[str, str]:
+    """從 dict 或 [(key, value)] 表單取出 FORM_KEYS。"""
+    if isinstance(data, dict):
+        pairs = data.items()
+    elif isinstance(data, (list, tuple)):
+        pairs = data
+    else:
+        return {}
+    return {str(k): str(v) for k, v in pairs if k in FORM_KEYS}
+
+
+@dataclass
+class SnapshotEntry:
+    run_id: str
+    fetched_at: str
+    source: str  # "fpg" / "pcc"
+    endpoint: str
+    method: str
+    url: str
+    status: int
+    sha256: str
+    size: int
+    case_key: str = ""
+    form: Optional[dict[str, str]] = None
+
+
+class HtmlSnapshotStore:
+    def __init__(self, root: Path, run_id: Optional[str] = None) -> None:
+        self.root = root
+        self.run_id = run_id or datetime.now().strftime("%Y%m%dT%H%M%S")
+        self.blob_dir = root / "blobs"
+        self.index_dir = root / "runs"
+        self.stored_bytes = 0
+        self.entries = 0
+
+    @classmethod
+    def from_settings(cls, run_id: Optional[str] = None) -> "HtmlSnapshotStore":
+        return cls(Path(settings.HTML_SNAPSHOT_DIR), run_id)
+
+    @classmethod
+    def for_run(cls, source: str, *, enabled: bool = False) -> Optional["HtmlSnapshotStore"]:
+        """歸檔腳本用：--snapshots 或 HTML_SNAPSHOT_ENABLED 才建立；run_id 帶上來源。"""
+        if not (enabled or settings.HTML_SNAPSHOT_ENABLED):
+            return None
+        return cls.from_settings(f"{datetime.now().strftime('%Y%m%dT%H%M%S')}-{source}")
+
+    def log_summary(self) -> None:
+        logger.info(
+            "HTML 快照：%s 筆，新增壓縮檔 %.1f KB，索引 %s",
+            self.entries,
+            self.stored_bytes / 1024,
+            self.index_path,
+        )
+
+    @property
+    def index_path(self) -> Path:
+        return self.index_dir / f"{self.run_id}.jsonl"
+
+    def blob_path(self, sha256: str) -> Path:
+        return self.blob_dir / sha256[:2] / f"{sha256}.html.gz"
+
+    def record(
+        self,
+        *,
+        source: str,
+        endpoint: str,
+        url: str,
+        status: int,
+        html: str,
+        method: str = "GET",
+        form=None,
+    ) -> Optional[SnapshotEntry]:
+        """寫入快照；失敗只記 log，不影響擷取流程。"""
+        raw = html.encode("utf-8")
+        sha = hashlib.sha256(raw).hexdigest()
+        entry = SnapshotEntry(
+            run_id=self.run_id,
+            fetched_at=datetime.now().isoformat(timespec="seconds"),
+            source=source,
+            endpoint=endpoint,
+            method=method,
+            url=url,
+            status=status,
+            sha256=sha,
+            size=len(raw),
+            case_key=current_case_key.get(),
+            form=form_fields(form) or None,
+        )
+        try:
+            blob = self.blob_path(sha)
+            if not blob.is_file():
+                blob.parent.mkdir(parents=True, exist_ok=True)
+                tmp = blob.with_suffix(".tmp")
+                tmp.write_bytes(gzip.compress(raw, compresslevel=GZIP_LEVEL))
+                tmp.replace(blob)
+                self.stored_bytes += blob.stat().st_size
+            self.index_dir.mkdir(parents=True, exist_ok=True)
+            with self.index_path.open("a", encoding="utf-8") as fh:
+                fh.write(json.dumps(asdict(entry), ensure_ascii=False) + "\n")
+        except OSError:
+            logger.exception("HTML 快照寫入失敗 %s", url)
+            return None
+        self.entries += 1
+        return entry
+
+    def read(self, sha256: str) -> str:
+        return gzip.decompress(self.blob_path(sha256).read_bytes()).decode("utf-8")
+
+    def run_ids(self) -> list[str]:
+        if not self.index_dir.is_dir():
+            return []
+        return sorted(p.stem for p in self.index_dir.glob("*.jsonl"))
+
+    def iter_entries(self, run_id: Optional[str] = None) -> Iterator[SnapshotEntry]:
+        """依寫入順序列出某次執行（預設本次）的快照索引。"""
+        path = self.index_dir / f"{run_id or self.run_id}.jsonl"
+        if not path.is_file():
+            return
+        with path.open(encoding="utf-8") as fh:
+            for line in fh:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield SnapshotEntry(**json.loads(line))
+                except (ValueError, TypeError):
+                    logger.warning("略過無法解析的快照索引行 %s", path)
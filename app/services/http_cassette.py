@@ -0,0 +1,283 @@
+"""HTTP 錄製／重播（cassette）：離線、可重現地跑完整歸檔流程並計時。
+
+HTTP_CASSETTE 設定檔案路徑後，http_connector.create_session 建立的 session 會被包一層：
+  record：照常連線，並把每個回應（狀態、必要 header、body、耗時）寫入 cassette
+  replay：完全不連線，依請求 key 依序回放；可依錄製時的耗時 × HTTP_CASSETTE_LATENCY 模擬延遲
+
+請求 key 由 method、URL 與表單欄位組成，帳密、驗證碼、CSRF 與時間戳參數不列入也不寫檔；
+同一 key 重複出現時依錄製順序回放，用完則重複最後一筆。
+"""
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import logging
+import re
+import time
+from collections import defaultdict, deque
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import AsyncIterator, Optional
+from urllib.parse import urlencode
+
+import aiohttp
+from aiohttp.abc import AbstractCookieJar
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MODES = ("record", "replay")
+# 不列入 key、也不寫入 cassette 的欄位（帳密／驗證碼／CSRF／防快取時間戳）
+VOLATILE_FIELDS = frozenset({"id", "passwd", "vcode", "_csrf", "rrr"})
+# 回放需要的回應 header；Set-Cookie 等 session 資訊不保存
+KEPT_HEADERS = ("Content-Type", "Content-Length", "ETag", "Last-Modified", "Location")
+_CHARSET = re.compile(r"charset=([^;\s]+)", re.I)
+
+
+class CassetteMiss(LookupError):
+    """replay 模式找不到對應的錄製回應。"""
+
+
+def _pairs(data) -> list[tuple[str, str]]:
+    if isinstance(data, dict):
+        items = data.items()
+    elif isinstance(data, (list, tuple)):
+        items = data
+    else:
+        return []
+    return sorted((str(k), str(v)) for k, v in items if k not in VOLATILE_FIELDS)
+
+
+def clean_url(url, params=None) -> str:
+    """去掉易變查詢參數；params 併入 query 後排序。"""
+    parsed = URL(str(url))
+    query = _pairs(list(parsed.query.items()) + _pairs(params))
+    base = str(parsed.with_query(None).with_fragment(None))
+    return f"{base}?{urlencode(query)}" if query else base
+
+
+def request_key(method: str, url, *, params=None, data=None) -> str:
+    """method + 清理後 URL + 表單欄位；JSON／multipart body 不列入（依順序回放）。"""
+    key = f"{method.upper()} {clean_url(url, params)}"
+    form = _pairs(data)
+    return f"{key} {urlencode(form)}" if form else key
+
+
+@dataclass
+class Interaction:
+    key: str
+    method: str
+    url: str
+    status: int
+    headers: dict[str, str]
+    body_b64: str
+    elapsed: float = 0.0
+
+    @property
+    def body(self) -> bytes:
+        return base64.b64decode(self.body_b64)
+
+
+class Cassette:
+    def __init__(
+        self,
+        path: Path,
+        *,
+        mode: str = "replay",
+        latency_scale: float = 0.0,
+    ) -> None:
+        if mode not in MODES:
+            raise ValueError(f"HTTP_CASSETTE_MODE 只能是 {MODES}：{mode!r}")
+        self.path = path
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self.interactions: list[Interaction] = []
+        self._queues: dict[str, deque[Interaction]] = defaultdict(deque)
+        self._last: dict[str, Interaction] = {}
+        self.replayed = 0
+        if mode == "replay":
+            self._load()
+
+    @classmethod
+    def from_settings(cls) -> Optional["Cassette"]:
+        if not settings.HTTP_CASSETTE:
+            return None
+        return cls(
+            Path(settings.HTTP_CASSETTE),
+            mode=settings.HTTP_CASSETTE_MODE,
+            latency_scale=settings.HTTP_CASSETTE_LATENCY,
+        )
+
+    def _load(self) -> None:
+        data = json.loads(self.path.read_text(encoding="utf-8"))
+        for raw in data.get("interactions", []):
+            interaction = Interaction(**raw)
+            self.interactions.append(interaction)
+            self._queues[interaction.key].append(interaction)
+        logger.info("載入 HTTP cassette %s：%s 筆", self.path, len(self.interactions))
+
+    def save(self) -> None:
+        if self.mode != "record":
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(
+            json.dumps(
+                {"interactions": [asdict(i) for i in self.interactions]},
+                ensure_ascii=False,
+            ),
+            encoding="utf-8",
+        )
+        tmp.replace(self.path)
+
+    def add(self, interaction: Interaction) -> None:
+        self.interactions.append(interaction)
+
+    def next(self, key: str) -> Interaction:
+        queue = self._queues.get(key)
+        if queue:
+            self._last[key] = queue.popleft()
+        elif key not in self._last:
+            raise CassetteMiss(f"cassette 沒有此請求：{key}")
+        self.replayed += 1
+        return self._last[key]
+
+
+class _Content:
+    def __init__(self, body: bytes) -> None:
+        self._body = body
+
+    async def iter_chunked(self, size: int) -> AsyncIterator[bytes]:
+        for start in range(0, len(self._body), size):
+            yield self._body[start : start + size]
+
+    async def read(self) -> bytes:
+        return self._body
+
+
+class CassetteResponse:
+    """回放用回應：提供 client 用到的 ClientResponse 介面子集。"""
+
+    def __init__(self, interaction: Interaction) -> None:
+        self.method = interaction.method
+        self.status = interaction.status
+        self.url = URL(interaction.url)
+        self.headers = CIMultiDictProxy(CIMultiDict(interaction.headers))
+        self._body = interaction.body
+        self.content = _Content(self._body)
+
+    @property
+    def charset(self) -> Optional[str]:
+        m = _CHARSET.search(self.headers.get("Content-Type", ""))
+        return m.group(1).strip("\"'") if m else None
+
+    @property
+    def content_length(self) -> Optional[int]:
+        raw = self.headers.get("Content-Length")
+        return int(raw) if raw and raw.isdigit() else None
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def text(self, encoding: Optional[str] = None) -> str:
+        return self._body.decode(encoding or self.charset or "utf-8", errors="replace")
+
+    async def json(self, **_kwargs):
+        return json.loads(self._body.decode(self.charset or "utf-8")) if self._body else None
+
+    def release(self) -> None:
+        return None
+
+
+class _RequestContext:
+    def __init__(self, owner: "CassetteSession", method: str, url, kwargs: dict) -> None:
+        self._owner = owner
+        self._method = method
+        self._url = url
+        self._kwargs = kwargs
+
+    async def __aenter__(self) -> CassetteResponse:
+        return await self._owner._perform(self._method, self._url, self._kwargs)
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+
+class CassetteSession:
+    """包住 aiohttp.ClientSession；cookie_jar／close 沿用底層 session。"""
+
+    def __init__(self, cassette: Cassette, session: aiohttp.ClientSession) -> None:
+        self.cassette = cassette
+        self._session = session
+
+    @property
+    def cookie_jar(self) -> AbstractCookieJar:
+        return self._session.cookie_jar
+
+    @property
+    def closed(self) -> bool:
+        return self._session.closed
+
+    async def close(self) -> None:
+        self.cassette.save()
+        await self._session.close()
+
+    def request(self, method: str, url, **kwargs) -> _RequestContext:
+        return _RequestContext(self, method, url, kwargs)
+
+    def get(self, url, **kwargs) -> _RequestContext:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs) -> _RequestContext:
+        return self.request("POST", url, **kwargs)
+
+    def patch(self, url, **kwargs) -> _RequestContext:
+        return self.request("PATCH", url, **kwargs)
+
+    async def _perform(self, method: str, url, kwargs: dict) -> CassetteResponse:
+        key = request_key(method, url, params=kwargs.get("params"), data=kwargs.get("data"))
+        if self.cassette.mode == "replay":
+            interaction = self.cassette.next(key)
+            delay = interaction.elapsed * self.cassette.latency_scale
+            if delay > 0:
+                await asyncio.sleep(delay)
+            return CassetteResponse(interaction)
+
+        started = time.perf_counter()
+        async with self._session.request(method, url, **kwargs) as resp:
+            body = await resp.read()
+            interaction = Interaction(
+                key=key,
+                method=method.upper(),
+                url=clean_url(resp.url),
+                status=resp.status,
+                headers={h: resp.headers[h] for h in KEPT_HEADERS if h in resp.headers},
+                body_b64=base64.b64encode(body).decode("ascii"),
+                elapsed=round(time.perf_counter() - started, 4),
+            )
+        self.cassette.add(interaction)
+        return CassetteResponse(interaction)
+
+
+_active: Optional[Cassette] = None
+_active_loaded = False
+
+
+def active_cassette() -> Optional[Cassette]:
+    """行程內共用的 cassette（依 HTTP_CASSETTE 建立一次）；未設定則 None。"""
+    global _active, _active_loaded
+    if not _active_loaded:
+        _active = Cassette.from_settings()
+        _active_loaded = True
+    return _active
+
+
+def use_cassette(cassette: Optional[Cassette]) -> None:
+    """指定（或以 None 取消）行程內 cassette；測試與 benchmark 用。"""
+    global _active, _active_loaded
+    _active = cassette
+    _active_loaded = True
@@ -0,0 +1,77 @@
+"""aiohttp 連線池與逾時設定：FPG／PCC client 與 Notion 服務的 ClientSession 都由這裡建立。
+
+預設每個 session 自帶 connector（關閉 session 一併關閉）；HTTP_SHARE_CONNECTOR
+開啟或呼叫端明確傳入 connector 時，多個 session 共用同一組 keep-alive 連線，
+省下重複的 TCP／TLS 握手。設定 HTTP_CASSETTE 時 session 改經 cassette 錄製／重播。
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Optional, Union
+
+import aiohttp
+
+from app.core.config import settings
+from app.services.http_cassette import CassetteSession, active_cassette
+
+logger = logging.getLogger(__name__)
+
+_shared: Optional[aiohttp.TCPConnector] = None
+_shared_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def build_connector() -> aiohttp.TCPConnector:
+    return aiohttp.TCPConnector(
+        limit=settings.HTTP_POOL_LIMIT,
+        limit_per_host=settings.HTTP_LIMIT_PER_HOST,
+        keepalive_timeout=settings.HTTP_KEEPALIVE_SECONDS,
+        ttl_dns_cache=settings.HTTP_DNS_TTL,
+    )
+
+
+def client_timeout(total: float) -> aiohttp.ClientTimeout:
+    """連線建立與單次 socket 讀取分開計時；死連線不必等到 total 才失敗。"""
+    return aiohttp.ClientTimeout(
+        total=total,
+        connect=settings.HTTP_CONNECT_TIMEOUT,
+        sock_read=settings.HTTP_READ_TIMEOUT,
+    )
+
+
+def shared_connector() -> aiohttp.TCPConnector:
+    """行程內共用的 connector；需在 event loop 內呼叫，換 loop 或已關閉時重建。"""
+    global _shared, _shared_loop
+    loop = asyncio.get_running_loop()
+    if _shared is None or _shared.closed or _shared_loop is not loop:
+        _shared = build_connector()
+        _shared_loop = loop
+    return _shared
+
+
+async def close_shared_connector() -> None:
+    global _shared, _shared_loop
+    if _shared is not None and not _shared.closed:
+        await _shared.close()
+    _shared = None
+    _shared_loop = None
+
+
+def create_session(
+    *,
+    total_timeout: float,
+    connector: Optional[aiohttp.BaseConnector] = None,
+    **kwargs,
+) -> Union[aiohttp.ClientSession, CassetteSession]:
+    """建立 ClientSession；傳入 connector（或 HTTP_SHARE_CONNECTOR）時 session 不擁有它。"""
+    if connector is None and settings.HTTP_SHARE_CONNECTOR:
+        connector = shared_connector()
+    owner = connector is None
+    session = aiohttp.ClientSession(
+        connector=connector or build_connector(),
+        connector_owner=owner,
+        timeout=client_timeout(total_timeout),
+        **kwargs,
+    )
+    cassette = active_cassette()
+    return CassetteSession(cassette, session) if cassette else session
@@ -0,0 +1,164 @@
+"""FPG 請求量測：依 endpoint 統計次數、延遲分布、狀態碼、回應位元組與重試次數。
+
+整批執行共用一個 HttpMetrics（session pool 內所有 client），結束時寫成 JSON，
+用來找出慢的 servlet、比較各次執行與調整併發／限速設定。
+"""
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# 延遲直方圖上界（毫秒）；超過最後一格計入 "+Inf"
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+DOWNLOAD_ENDPOINT = "j202_download"
+
+
+def endpoint_label(url: str) -> str:
+    """servlet 取類別名（Cj202c12）、附件統一為 j202_download，其餘取 /j202/ 之後的路徑。"""
+    path = urlsplit(url).path
+    if f"/{DOWNLOAD_ENDPOINT}/" in path:
+        return DOWNLOAD_ENDPOINT
+    if "/servlet/" in path:
+        return path.rsplit("/servlet/", 1)[1].rsplit(".", 1)[-1]
+    return path.split("/j202/", 1)[-1].strip("/") or "/"
+
+
+@dataclass
+class EndpointStats:
+    count: int = 0
+    errors: int = 0
+    retries: int = 0
+    bytes: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    statuses: dict[str, int] = field(default_factory=dict)
+    buckets: list[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1)
+    )
+
+    def observe(self, seconds: float, status: Optional[int], nbytes: int) -> None:
+        self.count += 1
+        self.bytes += nbytes
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        key = str(status) if status is not None else "error"
+        self.statuses[key] = self.statuses.get(key, 0) + 1
+        if status is None:
+            self.errors += 1
+        millis = seconds * 1000
+        for index, bound in enumerate(LATENCY_BUCKETS_MS):
+            if millis <= bound:
+                self.buckets[index] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+
+    def quantile_ms(self, q: float) -> float:
+        """由直方圖估計分位數（取所在桶的上界；最後一桶以最大值代替）。"""
+        if not self.count:
+            return 0.0
+        max_ms = self.max_seconds * 1000
+        target = q * self.count
+        seen = 0
+        for bound, hits in zip(LATENCY_BUCKETS_MS, self.buckets):
+            seen += hits
+            if seen >= target:
+                return min(float(bound), max_ms)
+        return max_ms
+
+    def to_dict(self) -> dict:
+        labels = [f"le_{bound}ms" for bound in LATENCY_BUCKETS_MS] + ["+Inf"]
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "retries": self.retries,
+            "bytes": self.bytes,
+            "avg_ms": round(self.total_seconds * 1000 / self.count, 1) if self.count else 0.0,
+            "p50_ms": round(self.quantile_ms(0.5), 1),
+            "p95_ms": round(self.quantile_ms(0.95), 1),
+            "max_ms": round(self.max_seconds * 1000, 1),
+            "total_s": round(self.total_seconds, 3),
+            "statuses": dict(sorted(self.statuses.items())),
+            "latency_histogram": dict(zip(labels, self.buckets)),
+        }
+
+
+class HttpMetrics:
+    """單次執行的請求統計；單一 event loop 內使用，不需上鎖。"""
+
+    def __init__(self) -> None:
+        self.endpoints: dict[str, EndpointStats] = {}
+
+    def _stats(self, endpoint: str) -> EndpointStats:
+        stats = self.endpoints.get(endpoint)
+        if stats is None:
+            stats = self.endpoints[endpoint] = EndpointStats()
+        return stats
+
+    def observe(
+        self,
+        endpoint: str,
+        *,
+        seconds: float,
+        status: Optional[int],
+        nbytes: int = 0,
+    ) -> None:
+        """status=None 代表沒拿到回應（連線中斷、逾時）。"""
+        self._stats(endpoint).observe(seconds, status, nbytes)
+
+    def record_retry(self, endpoint: str) -> None:
+        self._stats(endpoint).retries += 1
+
+    def summary(self) -> dict:
+        totals = EndpointStats()
+        for stats in self.endpoints.values():
+            totals.count += stats.count
+            totals.errors += stats.errors
+            totals.retries += stats.retries
+            totals.bytes += stats.bytes
+            totals.total_seconds += stats.total_seconds
+        return {
+            "requests": totals.count,
+            "errors": totals.errors,
+            "retries": totals.retries,
+            "bytes": totals.bytes,
+            "request_seconds": round(totals.total_seconds, 3),
+            "endpoints": {
+                name: stats.to_dict()
+                for name, stats in sorted(
+                    self.endpoints.items(),
+                    key=lambda item: item[1].total_seconds,
+                    reverse=True,
+                )
+            },
+        }
+
+    def write(self, path: Path, **extra) -> Path:
+        """寫出 JSON；extra 併入最上層（如 announce 區間、總耗時）。"""
+        payload = {**extra, **self.summary()}
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps(payload, ensure_ascii=False, indent=1) + "\n",
+            encoding="utf-8",
+        )
+        return path
+
+    def log_summary(self) -> None:
+        for name, stats in self.summary()["endpoints"].items():
+            logger.info(
+                "[HTTP] %s 次數=%s 平均=%.0fms p95=%.0fms 最大=%.0fms 重試=%s 錯誤=%s bytes=%s",
+                name,
+                stats["count"],
+                stats["avg_ms"],
+                stats["p95_ms"],
+                stats["max_ms"],
+                stats["retries"],
+                stats["errors"],
+                stats["bytes"],
+            )
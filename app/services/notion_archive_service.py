@@ -14,6 +14,7 @@ import aiohttp
 
 from app.core.config import settings
 from app.models.case_record import CaseRecord
+from app.services.http_connector import create_session
 from app.services.notion_zip_contents import (
     ATTACHMENT_MARKER_PREFIX,
     block_plain_text,
@@ -99,6 +100,13 @@ def rich_text(content: str) -> list[dict]:
     return [{"type": "text", "text": {"content": (content or "")[:1800]}}]
 
 
+def _rich_text_value(page: dict, name: str) -> str:
+    texts = (page.get("properties", {}).get(name) or {}).get("rich_text") or []
+    if not texts:
+        return ""
+    return texts[0].get("plain_text") or texts[0].get("text", {}).get("content", "")
+
+
 class NotionArchiveService:
     def __init__(
         self,
@@ -120,9 +128,7 @@ class NotionArchiveService:
         self._session: Optional[aiohttp.ClientSession] = None
 
     async def __aenter__(self) -> "NotionArchiveService":
-        self._session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=120)
-        )
+        self._session = create_session(total_timeout=120)
         return self
 
     async def __aexit__(self, *exc) -> None:
@@ -210,6 +216,7 @@ class NotionArchiveService:
             "有附件": {"checkbox": {}},
             "附件": {"files": {}},
             "SHA-256": {"rich_text": {}},
+            "公報指紋": {"rich_text": {}},
             "狀態": {
                 "select": {
                     "options": [
@@ -313,11 +320,66 @@ class NotionArchiveService:
         return upload_id
 
     def _existing_sha(self, page: dict) -> str:
-        prop = page.get("properties", {}).get("SHA-256", {})
-        texts = prop.get("rich_text") or []
-        if not texts:
-            return ""
-        return texts[0].get("plain_text") or texts[0].get("text", {}).get("content", "")
+        return _rich_text_value(page, "SHA-256")
+
+    async def archived_fingerprints(
+        self,
+        announce_from: str,
+        announce_to: str,
+    ) -> dict[str, dict]:
+        """公告日區間內已歸檔頁面：case_key → {page_id, url, fingerprint, status, source_url}。
+
+        公告日為 YYYY-MM-DD；沒有公告日的頁面查不到，視同未歸檔。
+        """
+        archived: dict[str, dict] = {}
+        cursor: Optional[str] = None
+        while True:
+            body: dict = {
+                "filter": {
+                    "and": [
+                        {"property": "公告日", "date": {"on_or_after": announce_from}},
+                        {"property": "公告日", "date": {"on_or_before": announce_to}},
+                    ]
+                },
+                "page_size": 100,
+            }
+            if cursor:
+                body["start_cursor"] = cursor
+            data = await self.request(
+                "POST",
+                f"/databases/{self.database_id}/query",
+                json_body=body,
+            )
+            for page in data.get("results", []):
+                props = page.get("properties", {})
+                title = (props.get("標售案號", {}).get("title") or [{}])[0]
+                tndsalno = title.get("plain_text") or title.get("text", {}).get("content", "")
+                inqcnt = _rich_text_value(page, "公告次數")
+                if not tndsalno:
+                    continue
+                archived[f"{tndsalno}/{inqcnt}"] = {
+                    "page_id": page.get("id"),
+                    "url": page.get("url"),
+                    "fingerprint": _rich_text_value(page, "公報指紋"),
+                    "status": ((props.get("狀態") or {}).get("select") or {}).get("name", ""),
+                    "source_url": (props.get("來源 URL") or {}).get("url") or "",
+                }
+            if not data.get("has_more"):
+                return archived
+            cursor = data.get("next_cursor")
+            await asyncio.sleep(NOTION_REQUEST_PAUSE)
+
+    async def confirm_unchanged(self, page_id: str) -> dict:
+        """公報資料未變的案只更新「最後確認」。"""
+        page = await self.request(
+            "PATCH",
+            f"/pages/{page_id}",
+            json_body={
+                "properties": {"最後確認": {"date": {"start": date.today().isoformat()}}}
+            },
+        )
+        await asyncio.sleep(NOTION_REQUEST_PAUSE)
+        return page
 
     async def _list_block_children(self, block_id: str) -> list[dict]:
         results: list[dict] = []
@@ -461,6 +523,7 @@ class NotionArchiveService:
             "報價明細摘要": {"rich_text": rich_text("\n".join(summary_parts))},
             "有附件": {"checkbox": has_attachment},
             "SHA-256": {"rich_text": rich_text(record.zip_sha256)},
+            "公報指紋": {"rich_text": rich_text(record.bulletin_fingerprint)},
             "狀態": {"select": {"name": status_name}},
             "最後確認": {"date": {"start": today}},
             "來源 URL": {"url": record.source_url or None},
@@ -0,0 +1,84 @@
+"""HTML 解析執行器：FPG／PCC client 把 fpg_parser／pcc_parser 的工作送出 event loop。
+
+PARSE_EXECUTOR 決定在哪裡解析：
+  inline  ：直接在 event loop 內呼叫（舊行為，除錯用）
+  thread  ：執行緒池；解析期間 loop 仍能收送其他請求（re 不釋放 GIL，解析本身不並行）
+  process ：行程池；併發抓取的多頁可在其他 CPU 核心同時解析，函式與參數需可 pickle
+
+送出的函式一律以回傳值為準：process 模式下對參數的原地修改不會帶回來。
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+R = TypeVar("R")
+
+MODES = ("inline", "thread", "process")
+
+
+class ParseExecutor:
+    def __init__(self, mode: str = "thread", *, workers: int = 0) -> None:
+        if mode not in MODES:
+            raise ValueError(f"PARSE_EXECUTOR 只能是 {MODES}：{mode!r}")
+        self.mode = mode
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self._pool: Optional[Executor] = None
+
+    @classmethod
+    def from_settings(cls) -> "ParseExecutor":
+        return cls(settings.PARSE_EXECUTOR, workers=settings.PARSE_WORKERS)
+
+    def _executor(self) -> Executor:
+        # 第一次解析時才建立；inline 模式不會走到這裡
+        if self._pool is None:
+            if self.mode == "process":
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="html-parse"
+                )
+            logger.info("HTML 解析執行器：%s × %s", self.mode, self.workers)
+        return self._pool
+
+    async def run(self, func: Callable[..., R], *args) -> R:
+        """在執行器上呼叫 func(*args) 並等待結果。"""
+        if self.mode == "inline":
+            return func(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor(), func, *args)
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+
+_shared: Optional[ParseExecutor] = None
+
+
+def shared_parse_executor() -> ParseExecutor:
+    """行程內共用的執行器（依 PARSE_EXECUTOR／PARSE_WORKERS 建立一次）。"""
+    global _shared
+    if _shared is None:
+        _shared = ParseExecutor.from_settings()
+    return _shared
+
+
+def use_parse_executor(executor: Optional[ParseExecutor]) -> None:
+    """指定（或以 None 重設為依設定建立）行程內執行器；測試與 benchmark 用。"""
+    global _shared
+    if _shared is not None and _shared is not executor:
+        _shared.shutdown()
+    _shared = executor
+
+
+def shutdown_parse_executor() -> None:
+    use_parse_executor(None)
@@ -10,6 +10,10 @@ from typing import Optional
 import aiohttp
 
 from app.models.pcc_asset_record import PccAssetRecord
+from app.services.html_snapshot_store import HtmlSnapshotStore, snapshot_case
+from app.services.http_connector import create_session
+from app.services.parse_executor import ParseExecutor, shared_parse_executor
+from app.services.response_decoder import ResponseDecoder
 from app.services.pcc_parser import (
     BASE,
     parse_csrf,
@@ -42,16 +46,35 @@ def displaytag_page_number(url: str) -> int:
     return int(m.group(1)) if m else 0
 
 
+def _parse_search_page(html: str) -> tuple[int, list[PccAssetRecord], list[str]]:
+    """搜尋結果第 1 頁：(總筆數, 本頁摘要, 其餘分頁 URL)。"""
+    return parse_result_total(html), parse_search_summaries(html), parse_displaytag_pages(html)
+
+
 class PccHttpClient:
-    def __init__(self, *, request_pause: float = REQUEST_PAUSE) -> None:
+    def __init__(
+        self,
+        *,
+        request_pause: float = REQUEST_PAUSE,
+        connector: Optional[aiohttp.BaseConnector] = None,
+        decoder: Optional[ResponseDecoder] = None,
+        snapshots: Optional[HtmlSnapshotStore] = None,
+        parser: Optional[ParseExecutor] = None,
+    ) -> None:
         self.request_pause = request_pause
+        self.connector = connector
+        self.decoder = decoder or ResponseDecoder()
+        self.snapshots = snapshots
+        # 搜尋結果／詳情頁解析移出 event loop；預設行程內共用（PARSE_EXECUTOR）
+        self.parser = parser or shared_parse_executor()
         self._session: Optional[aiohttp.ClientSession] = None
         self._csrf = ""
 
     async def __aenter__(self) -> "PccHttpClient":
-        self._session = aiohttp.ClientSession(
+        self._session = create_session(
+            total_timeout=90,
+            connector=self.connector,
             cookie_jar=aiohttp.CookieJar(unsafe=True),
-            timeout=aiohttp.ClientTimeout(total=90),
             headers={
                 "User-Agent": (
                     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
@@ -74,9 +97,25 @@ class PccHttpClient:
             raise RuntimeError("PccHttpClient 尚未進入 async context")
         return self._session
 
+    async def _read_html(self, resp: aiohttp.ClientResponse) -> str:
+        """以 endpoint（路徑最後一段）已知編碼直接解碼 body。"""
+        body = await resp.read()
+        endpoint = resp.url.path.rstrip("/").rsplit("/", 1)[-1]
+        html = self.decoder.decode(endpoint, body, resp.charset)
+        if self.snapshots is not None:
+            self.snapshots.record(
+                source="pcc",
+                endpoint=endpoint,
+                url=str(resp.url),
+                status=resp.status,
+                html=html,
+                method=resp.method,
+            )
+        return html
+
     async def _refresh_csrf(self) -> str:
         async with self.session.get(INDEX) as resp:
-            html = await resp.text(errors="replace")
+            html = await self._read_html(resp)
         self._csrf = parse_csrf(html)
         if not self._csrf:
             raise RuntimeError("PCC 找不到 _csrf")
@@ -87,7 +126,7 @@ class PccHttpClient:
         async with self.session.get(
             url, params=params, headers={"Referer": INDEX}
         ) as resp:
-            return resp.status, await resp.text(errors="replace")
+            return resp.status, await self._read_html(resp)
 
     async def _search(
         self,
@@ -121,10 +160,9 @@ class PccHttpClient:
                 "Content-Type": "application/x-www-form-urlencoded",
             },
         ) as resp:
-            html = await resp.text(errors="replace")
+            html = await self._read_html(resp)
 
-        total = parse_result_total(html)
-        records = parse_search_summaries(html)
+        total, records, page_urls = await self.parser.run(_parse_search_page, html)
         seen = {r.pk for r in records}
         logger.info(
             "PCC %s：共 %s 筆，本頁 %s 筆",
@@ -133,7 +171,7 @@ class PccHttpClient:
             len(records),
         )
 
-        for page_url in parse_displaytag_pages(html):
+        for page_url in page_urls:
             page_no = displaytag_page_number(page_url)
             if page_no <= 1:
                 continue
@@ -142,7 +180,7 @@ class PccHttpClient:
                 logger.warning("PCC 分頁失敗 status=%s url=%s", status, page_url)
                 continue
             added = 0
-            for rec in parse_search_summaries(page_html):
+            for rec in await self.parser.run(parse_search_summaries, page_html):
                 if rec.pk in seen:
                     continue
                 seen.add(rec.pk)
@@ -211,10 +249,11 @@ class PccHttpClient:
         if not self._csrf:
             await self._refresh_csrf()
         try:
-            html, kind, source_url = await self._load_detail_html(base)
+            with snapshot_case(base.pk):
+                html, kind, source_url = await self._load_detail_html(base)
             if "財物名稱" not in html:
                 raise RuntimeError("詳情頁缺少財物名稱")
-            record = parse_detail(html, base)
+            record = await self.parser.run(parse_detail, html, base)
             record.detail_kind = kind
             record.source_url = source_url
             record.status = "ok"
@@ -12,6 +12,7 @@ import aiohttp
 
 from app.core.config import settings
 from app.models.pcc_asset_record import PccAssetRecord
+from app.services.http_connector import create_session
 from app.services.notion_archive_service import (
     NOTION_REQUEST_PAUSE,
     announce_month_filter,
@@ -194,9 +195,7 @@ class PccNotionArchiveService:
         self._session: Optional[aiohttp.ClientSession] = None
 
     async def __aenter__(self) -> "PccNotionArchiveService":
-        self._session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=120)
-        )
+        self._session = create_session(total_timeout=120)
         return self
 
     async def __aexit__(self, *exc) -> None:
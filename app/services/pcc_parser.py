@@ -18,22 +18,35 @@ _DETAIL_PATH = {
 }
 _DETAIL_KIND = {"New": "old", "Old": "new", "Normal": "normal"}
 
+# 載入時編譯一次
+_ROC_DATE = re.compile(r"^(\d{2,3})/(\d{1,2})/(\d{1,2})(?:\s+(\d{1,2}):(\d{2})(?::(\d{2}))?)?")
+_WESTERN_DATE = re.compile(r"^(\d{4})-(\d{2})-(\d{2})(?:[T\s](\d{2}):(\d{2}))?")
+_PAGE_CODE = re.compile(r'pageCode2Img\("([^"]+)"\)')
+_SCRIPT = re.compile(r"<script[\s\S]*?</script>", re.I)
+_TAG = re.compile(r"<[^>]+>")
+_SPACES = re.compile(r"\s+")
+_CSRF = re.compile(r'name="_csrf"\s+value="([^"]+)"')
+_RESULT_TOTAL = re.compile(r"共有[\s\S]{0,80}?(\d+)[\s\S]{0,40}?筆資料")
+_ROW = re.compile(r"<tr[^>]*>([\s\S]*?)</tr>", re.I)
+_FORM_VIEW = re.compile(r"formView(New|Old|Normal)\((\d+),")
+_CELL = re.compile(r"<t[dh][^>]*>([\s\S]*?)</t[dh]>", re.I)
+_PAGE_HREF = re.compile(r'href="(/opas/aspam/public/readAspam\?[^"]+)"')
+_PAGE_PARAM = re.compile(r"d-\d+-p=\d+")
+_FIELD_PAIR = re.compile(
+    r"<(?:th|td)[^>]*>\s*([^<]{1,40}?)\s*</(?:th|td)>\s*<td[^>]*>([\s\S]*?)</td>", re.I
+)
+_PK = (re.compile(r'name="pk"\s+value="(\d+)"'), re.compile(r"[?&]pk=(\d+)"))
+
 
 def roc_to_iso(raw: str) -> str:
     """115/07/21 或 115/07/28 09:00 → ISO date / datetime。"""
     text = (raw or "").strip()
     if not text:
         return ""
-    m = re.match(
-        r"^(\d{2,3})/(\d{1,2})/(\d{1,2})(?:\s+(\d{1,2}):(\d{2})(?::(\d{2}))?)?",
-        text,
-    )
+    m = _ROC_DATE.match(text)
     if not m:
         # 已是西元
-        m2 = re.match(
-            r"^(\d{4})-(\d{2})-(\d{2})(?:[T\s](\d{2}):(\d{2}))?",
-            text,
-        )
+        m2 = _WESTERN_DATE.match(text)
         if m2:
             if m2.group(4):
                 return (
@@ -61,22 +74,22 @@ def decode_page_code(text: str) -> str:
     """解開 pageCode2Img(\"...\") 包裝；否則回傳去標籤後文字。"""
     if not text:
         return ""
-    m = re.search(r'pageCode2Img\("([^"]+)"\)', text)
+    m = _PAGE_CODE.search(text)
     if m:
         return html_lib.unescape(m.group(1))
-    cleaned = re.sub(r"<script[\s\S]*?</script>", " ", text, flags=re.I)
-    cleaned = re.sub(r"<[^>]+>", " ", cleaned)
+    cleaned = _SCRIPT.sub(" ", text)
+    cleaned = _TAG.sub(" ", cleaned)
     cleaned = html_lib.unescape(cleaned)
-    return re.sub(r"\s+", " ", cleaned).strip()
+    return _SPACES.sub(" ", cleaned).strip()
 
 
 def parse_csrf(html: str) -> str:
-    m = re.search(r'name="_csrf"\s+value="([^"]+)"', html)
+    m = _CSRF.search(html)
     return m.group(1) if m else ""
 
 
 def parse_result_total(html: str) -> int:
-    m = re.search(r"共有[\s\S]{0,80}?(\d+)[\s\S]{0,40}?筆資料", html)
+    m = _RESULT_TOTAL.search(html)
     return int(m.group(1)) if m else 0
 
 
@@ -85,14 +98,14 @@ def parse_search_summaries(html: str) -> list[PccAssetRecord]:
     records: list[PccAssetRecord] = []
     seen: set[str] = set()
     # 以含 formView* 的 <tr> 為一列
-    for tr in re.findall(r"<tr[^>]*>([\s\S]*?)</tr>", html, flags=re.I):
-        m = re.search(r"formView(New|Old|Normal)\((\d+),", tr)
+    for tr in _ROW.findall(html):
+        m = _FORM_VIEW.search(tr)
         if not m:
             continue
         view_type, pk = m.group(1), m.group(2)
         if pk in seen:
             continue
-        cells = re.findall(r"<t[dh][^>]*>([\s\S]*?)</t[dh]>", tr, flags=re.I)
+        cells = _CELL.findall(tr)
         plain: list[str] = []
         for cell in cells:
             text = decode_page_code(cell)
@@ -125,8 +138,8 @@ def parse_search_summaries(html: str) -> list[PccAssetRecord]:
 def parse_displaytag_pages(html: str) -> list[str]:
     """回傳其他分頁完整 URL（若有）。"""
     urls: list[str] = []
-    for href in re.findall(r'href="(/opas/aspam/public/readAspam\?[^"]+)"', html):
-        if re.search(r"d-\d+-p=\d+", href):
+    for href in _PAGE_HREF.findall(html):
+        if _PAGE_PARAM.search(href):
             urls.append(html_lib.unescape(href))
     # 去重保序
     seen: set[str] = set()
@@ -142,13 +155,8 @@ def parse_displaytag_pages(html: str) -> list[str]:
 def _field_map(html: str) -> dict[str, str]:
     """詳情頁 label → raw html/value。"""
     fields: dict[str, str] = {}
-    pairs = re.findall(
-        r"<(?:th|td)[^>]*>\s*([^<]{1,40}?)\s*</(?:th|td)>\s*<td[^>]*>([\s\S]*?)</td>",
-        html,
-        flags=re.I,
-    )
-    for label, raw in pairs:
-        key = re.sub(r"\s+", "", label.strip())
+    for label, raw in _FIELD_PAIR.findall(html):
+        key = _SPACES.sub("", label.strip())
         if key and key not in fields:
             fields[key] = raw
     return fields
@@ -193,9 +201,7 @@ def parse_detail(html: str, base: Optional[PccAssetRecord] = None) -> PccAssetRe
     record.document_howto = get("招標文件領取方式及地點")
     record.extra_notes = get("附加說明")
     if not record.pk:
-        m = re.search(r'name="pk"\s+value="(\d+)"', html) or re.search(
-            r"[?&]pk=(\d+)", html
-        )
+        m = _PK[0].search(html) or _PK[1].search(html)
         if m:
             record.pk = m.group(1)
     return record
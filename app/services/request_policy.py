@@ -0,0 +1,171 @@
+"""對外站台的請求政策：節流（每秒請求預算）、暫時性錯誤重試、斷路器。
+
+RateLimiter／CircuitBreaker 可由多個 client（session pool）共用同一個實例。
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
+import aiohttp
+from tenacity import (
+    AsyncRetrying,
+    RetryCallState,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 站台忙碌／閘道錯誤，視同暫時性失敗
+RETRYABLE_STATUS = frozenset({429, 502, 503, 504})
+
+
+class TransientStatusError(aiohttp.ClientError):
+    def __init__(self, status: int, url: str) -> None:
+        super().__init__(f"HTTP {status} {url}")
+        self.status = status
+        self.url = url
+
+
+class CircuitOpenError(RuntimeError):
+    """站台持續失敗，斷路器多次跳脫仍未恢復。"""
+
+
+# 連線中斷、逾時、body 截斷、忙碌狀態碼
+TRANSIENT_ERRORS: tuple[type[BaseException], ...] = (
+    aiohttp.ClientConnectionError,
+    aiohttp.ClientPayloadError,
+    asyncio.TimeoutError,
+    TransientStatusError,
+)
+
+
+class RateLimiter:
+    """以最小間隔排隊的每秒請求上限；rate <= 0 代表不限速。
+
+    多個 worker 共用同一個 limiter 時，總請求速率仍維持在 rate 以內。
+    """
+
+    def __init__(self, rate_per_second: float) -> None:
+        self.rate_per_second = rate_per_second
+        self._interval = 1.0 / rate_per_second if rate_per_second > 0 else 0.0
+        self._next_slot = 0.0
+
+    async def acquire(self) -> None:
+        if not self._interval:
+            return
+        # 單一 event loop 內此段無 await，預約時段不需另外上鎖
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self._interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """冪等讀取用的指數退避＋jitter 重試（tenacity）。"""
+
+    attempts: int = 3
+    backoff_initial: float = 1.0
+    backoff_max: float = 20.0
+    jitter: float = 1.0
+
+    @classmethod
+    def from_settings(cls) -> "RetryPolicy":
+        return cls(
+            attempts=max(1, settings.FPG_RETRY_ATTEMPTS),
+            backoff_initial=settings.FPG_RETRY_BACKOFF,
+            backoff_max=settings.FPG_RETRY_BACKOFF_MAX,
+        )
+
+    def retrying(self, *, idempotent: bool = True) -> AsyncRetrying:
+        """非冪等請求（goSave、登入）只送一次。"""
+        return AsyncRetrying(
+            stop=stop_after_attempt(self.attempts if idempotent else 1),
+            wait=wait_exponential_jitter(
+                initial=self.backoff_initial,
+                max=self.backoff_max,
+                jitter=self.jitter,
+            ),
+            retry=retry_if_exception_type(TRANSIENT_ERRORS),
+            before_sleep=_log_retry,
+            reraise=True,
+        )
+
+
+def _log_retry(state: RetryCallState) -> None:
+    exc = state.outcome.exception() if state.outcome else None
+    logger.warning(
+        "暫時性錯誤，第 %s 次重試前等待 %.1fs：%s",
+        state.attempt_number,
+        state.next_action.sleep if state.next_action else 0.0,
+        exc,
+    )
+
+
+class CircuitBreaker:
+    """連續失敗達門檻即跳脫：所有共用此實例的 worker 暫停 cooldown 秒再試。
+
+    連續跳脫 max_trips 次仍未有任何成功請求，改丟 CircuitOpenError，
+    避免持續打一個已掛掉的站台、把剩下的案件全耗成 error。
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 8,
+        cooldown_seconds: float = 60.0,
+        max_trips: int = 3,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.max_trips = max_trips
+        self._failures = 0
+        self._trips = 0
+        self._open_until = 0.0
+
+    @classmethod
+    def from_settings(cls) -> "CircuitBreaker":
+        return cls(
+            failure_threshold=settings.FPG_BREAKER_THRESHOLD,
+            cooldown_seconds=settings.FPG_BREAKER_COOLDOWN,
+            max_trips=settings.FPG_BREAKER_MAX_TRIPS,
+        )
+
+    @property
+    def is_open(self) -> bool:
+        return time.monotonic() < self._open_until
+
+    async def wait_until_closed(self) -> None:
+        if self.max_trips and self._trips >= self.max_trips:
+            raise CircuitOpenError(
+                f"站台連續 {self._trips} 次斷路仍未恢復，停止送出請求"
+            )
+        wait = self._open_until - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._trips = 0
+
+    def record_failure(self) -> None:
+        if self.failure_threshold <= 0:
+            return
+        self._failures += 1
+        if self._failures < self.failure_threshold or self.is_open:
+            return
+        self._failures = 0
+        self._trips += 1
+        self._open_until = time.monotonic() + self.cooldown_seconds
+        logger.error(
+            "站台連續失敗，斷路 %.0fs（第 %s 次）",
+            self.cooldown_seconds,
+            self._trips,
+        )
@@ -0,0 +1,100 @@
+"""HTML 回應解碼：依 endpoint 記住已知編碼，直接以 bytes.decode 解碼。
+
+Content-Type 沒帶 charset 時，aiohttp 的 resp.text() 會對整個 body 做編碼偵測，
+大型公報頁相當耗 CPU。這裡每個 endpoint 只偵測一次（header → <meta> → 試解），
+之後直接套用；已知編碼解不開（出現非法位元組）才重新偵測。全部都解不開時，
+以宣告／已知／<meta> 編碼替代解碼，只犧牲壞掉的位元組。
+"""
+from __future__ import annotations
+
+import codecs
+import logging
+import re
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# 試解順序：台塑頁面多為 Big5（以超集 CP950 解），採購網為 UTF-8
+CANDIDATE_ENCODINGS = ("utf-8", "cp950")
+# Big5 家族一律以 CP950 解碼，避免缺字
+ENCODING_ALIASES = {"big5": "cp950", "big5hkscs": "cp950", "ms950": "cp950"}
+META_SNIFF_BYTES = 2048
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?([A-Za-z0-9_\-]+)""", re.I)
+
+
+def normalize_encoding(name: Optional[str]) -> Optional[str]:
+    """回傳 Python codec 名稱；無法辨識則 None。"""
+    if not name:
+        return None
+    try:
+        codec = codecs.lookup(name.strip().strip("\"'")).name
+    except LookupError:
+        return None
+    return ENCODING_ALIASES.get(codec, codec)
+
+
+def _sniff_meta(body: bytes) -> Optional[str]:
+    meta = _META_CHARSET.search(body[:META_SNIFF_BYTES])
+    return normalize_encoding(meta.group(1).decode("ascii")) if meta else None
+
+
+class ResponseDecoder:
+    def __init__(self, known: Optional[dict[str, str]] = None) -> None:
+        # endpoint → codec；可預先指定（例如 {"Cj202c12": "cp950"}）
+        self.known: dict[str, str] = dict(known or {})
+        self.detections = 0
+        self.fallbacks = 0
+
+    def decode(self, endpoint: str, body: bytes, charset: Optional[str] = None) -> str:
+        """charset 為回應 header 宣告的編碼（resp.charset），可為 None。"""
+        declared = normalize_encoding(charset)
+        if declared:
+            text = self._strict(body, declared)
+            if text is not None:
+                self.known[endpoint] = declared
+                return text
+        encoding = self.known.get(endpoint)
+        if encoding:
+            text = self._strict(body, encoding)
+            if text is not None:
+                return text
+            self.fallbacks += 1
+            logger.warning("%s 以已知編碼 %s 解碼失敗，重新偵測", endpoint, encoding)
+        sniffed = _sniff_meta(body)
+        text = self._detect(endpoint, body, sniffed)
+        if text is not None:
+            return text
+        # 都解不開（頁面夾雜個別壞位元組）：依 header → 已知 → <meta> 的編碼以替代字元解碼，
+        # 只壞掉那幾個字；改用 UTF-8 會把整頁 Big5 變亂碼
+        lossy = declared or encoding or sniffed or CANDIDATE_ENCODINGS[0]
+        logger.warning("%s 回應含非法位元組，以 %s 替代解碼", endpoint, lossy)
+        return body.decode(lossy, errors="replace")
+
+    def _detect(
+        self, endpoint: str, body: bytes, sniffed: Optional[str]
+    ) -> Optional[str]:
+        self.detections += 1
+        candidates: list[str] = [sniffed] if sniffed else []
+        candidates.extend(c for c in CANDIDATE_ENCODINGS if c not in candidates)
+        for encoding in candidates:
+            text = self._strict(body, encoding)
+            if text is not None:
+                if self.known.get(endpoint) != encoding:
+                    logger.info("%s 回應編碼判定為 %s", endpoint, encoding)
+                self.known[endpoint] = encoding
+                return text
+        return None
+
+    @staticmethod
+    def _strict(body: bytes, encoding: str) -> Optional[str]:
+        try:
+            return body.decode(encoding)
+        except (UnicodeDecodeError, LookupError):
+            return None
+
+    def stats(self) -> dict:
+        return {
+            "encodings": dict(sorted(self.known.items())),
+            "detections": self.detections,
+            "fallbacks": self.fallbacks,
+        }
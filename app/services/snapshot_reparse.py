@@ -0,0 +1,297 @@
+"""離線重新解析：從 HTML 快照重建 CaseRecord／PccAssetRecord，不連 FPG／PCC。
+
+parser 修正後，以同一批原始頁面重跑 parse_bulletin_cases、parse_inquiry_form、
+parse_quote_form、parse_detail；各頁解析分散到多個行程（CPU 核心）。
+頁面的挑選規則比照線上流程：公報取每個 (公告日區間, 頁碼) 最後一次抓到的頁，
+enrichment 取最後一個找到報價單的 channel。
+"""
+from __future__ import annotations
+
+import logging
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, Optional, TypeVar
+
+from app.models.case_record import CaseRecord
+from app.models.pcc_asset_record import PccAssetRecord
+from app.services.attachment_store import AttachmentStore
+from app.services.bulletin_snapshot import bulletin_page_records
+from app.services.fpg_parser import (
+    fill_missing_announce_dates,
+    is_login_page,
+    merge_records,
+    parse_bid_go_detail,
+    parse_inquiry_form,
+    parse_quote_form,
+)
+from app.services.fpg_urls import (
+    BID_POST_PATH,
+    BULLETIN_POST_PATH,
+    CMP_BID_POST_PATH,
+)
+from app.services.html_snapshot_store import HtmlSnapshotStore, SnapshotEntry
+from app.services.http_metrics import endpoint_label
+from app.services.pcc_parser import parse_detail, parse_search_summaries
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+BULLETIN_ENDPOINT = endpoint_label(BULLETIN_POST_PATH)
+CHANNEL_ENDPOINTS = {
+    endpoint_label(BID_POST_PATH): "gen",
+    endpoint_label(CMP_BID_POST_PATH): "cmp",
+}
+BULLETIN_BUTTONS = ("goList", "goPage")
+PCC_SEARCH_ENDPOINT = "readAspam"
+PCC_DETAIL_KINDS = {
+    "readOneAspamDetailOld": "old",
+    "readOneAspamDetailNew": "new",
+    "readOneAspamDetail": "normal",
+}
+
+
+def latest_run_id(store: HtmlSnapshotStore, source: str) -> str:
+    """最近一次 <source> 執行的 run_id；沒有則空字串。"""
+    runs = [run for run in store.run_ids() if run.endswith(f"-{source}")]
+    return runs[-1] if runs else ""
+
+
+def parallel_map(
+    func: Callable[[T], R],
+    jobs: list[T],
+    *,
+    workers: Optional[int] = None,
+) -> list[R]:
+    """依序回傳結果；workers <= 1 或工作太少時直接在本行程執行。"""
+    count = workers if workers and workers > 0 else (os.cpu_count() or 1)
+    count = min(count, len(jobs))
+    if count <= 1:
+        return [func(job) for job in jobs]
+    chunksize = max(1, len(jobs) // (count * 4))
+    with ProcessPoolExecutor(max_workers=count) as executor:
+        return list(executor.map(func, jobs, chunksize=chunksize))
+
+
+# ---- FPG ----
+
+
+@dataclass
+class FpgCaseJob:
+    """單案 enrichment 頁面：(channel, sha)，依抓取順序。"""
+
+    root: str
+    base: CaseRecord
+    pages: list[tuple[str, str]] = field(default_factory=list)
+
+
+def _parse_bulletin_page(job: tuple[str, str]) -> list[CaseRecord]:
+    root, sha = job
+    return bulletin_page_records(HtmlSnapshotStore(Path(root)).read(sha))
+
+
+def _reparse_fpg_case(job: FpgCaseJob) -> CaseRecord:
+    """比照 FpgHttpClient.enrich_case：取最後一個 goList 找到報價單的 channel。"""
+    base = job.base
+    store = HtmlSnapshotStore(Path(job.root))
+    by_channel: dict[str, list[str]] = defaultdict(list)
+    for channel, sha in job.pages:
+        html = store.read(sha)
+        if not is_login_page(html):
+            by_channel[channel].append(html)
+    found = None
+    for channel, pages in by_channel.items():
+        detail = next(filter(None, map(parse_bid_go_detail, pages)), None)
+        if detail is not None:
+            found = channel, detail, pages
+    if found is None:
+        if base.mark_incomplete_shell():
+            return base
+        base.status = "new"
+        return base
+
+    channel, (blocid, tnd, inq), pages = found
+    record = CaseRecord(tndsalno=tnd, inqcnt=inq, bid_channel=channel)
+    record.blocid = blocid
+    quote_html = next((h for h in reversed(pages) if "七、報價明細" in h), "")
+    inquiry_html = next((h for h in reversed(pages) if "委託公司" in h), "")
+    parse_inquiry_form(inquiry_html, record)
+    parse_quote_form(quote_html, record)
+    record.status = "new"
+    return merge_records(base, record)
+
+
+def _bulletin_pages(entries: Iterable[SnapshotEntry]) -> dict[tuple[str, str], dict[int, str]]:
+    """(date_f, date_e) → 頁碼 → 最後一次抓到的頁面 sha（goSave 後重抓會覆蓋舊頁）。"""
+    ranges: dict[tuple[str, str], dict[int, str]] = defaultdict(dict)
+    for entry in entries:
+        form = entry.form or {}
+        if form.get("BTN") not in BULLETIN_BUTTONS:
+            continue
+        try:
+            page = int(form.get("page") or 1)
+        except ValueError:
+            page = 1
+        ranges[(form.get("date_f", ""), form.get("date_e", ""))][page] = entry.sha256
+    return ranges
+
+
+def reparse_fpg_run(
+    store: HtmlSnapshotStore,
+    run_id: str,
+    *,
+    workers: Optional[int] = None,
+    download_dir: Optional[Path] = None,
+) -> list[CaseRecord]:
+    """重建某次 FPG 執行中做過 enrichment 的案件（依公報順序）。
+
+    公報頁只提供摘要底稿；附件若仍在本機 store 則重新連結，不重新下載。
+    """
+    root = str(store.root)
+    bulletin: list[SnapshotEntry] = []
+    case_pages: dict[str, list[SnapshotEntry]] = defaultdict(list)
+    for entry in store.iter_entries(run_id):
+        if entry.status >= 400:
+            continue
+        if entry.endpoint == BULLETIN_ENDPOINT and not entry.case_key:
+            bulletin.append(entry)
+        elif entry.case_key and entry.endpoint in CHANNEL_ENDPOINTS:
+            case_pages[entry.case_key].append(entry)
+
+    ranges = _bulletin_pages(bulletin)
+    page_jobs = [
+        (root, sha) for pages in ranges.values() for _, sha in sorted(pages.items())
+    ]
+    parsed = iter(parallel_map(_parse_bulletin_page, page_jobs, workers=workers))
+    bases: dict[str, CaseRecord] = {}
+    for (date_f, date_e), pages in ranges.items():
+        range_records: list[CaseRecord] = []
+        for _ in pages:
+            for record in next(parsed):
+                if record.case_key not in bases:
+                    bases[record.case_key] = record
+                    range_records.append(record)
+        fill_missing_announce_dates(range_records, date_f, date_e)
+    for record in bases.values():
+        record.bulletin_fingerprint = record.compute_bulletin_fingerprint()
+
+    jobs: list[FpgCaseJob] = []
+    for case_key, entries in case_pages.items():
+        base = bases.get(case_key)
+        if base is None:
+            # 公報來自快取（未存快照）：只能以案號為底
+            tnd, _, inq = case_key.partition("/")
+            base = CaseRecord(tndsalno=tnd, inqcnt=inq)
+        job = FpgCaseJob(
+            root=root,
+            base=base,
+            pages=[(CHANNEL_ENDPOINTS[e.endpoint], e.sha256) for e in entries],
+        )
+        jobs.append(job)
+    logger.info(
+        "快照 %s：公報 %s 頁、%s 案，enrichment 快照 %s 案",
+        run_id,
+        len(page_jobs),
+        len(bases),
+        len(jobs),
+    )
+
+    enriched = {
+        record.case_key: record
+        for record in parallel_map(_reparse_fpg_case, jobs, workers=workers)
+    }
+    # 原執行沒有 enrichment 的案（大陸案、--limit、差異模式略過）不重建，避免以公報摘要覆蓋
+    records = [enriched[key] for key in bases if key in enriched]
+    records += [record for key, record in enriched.items() if key not in bases]
+    _relink_attachments(records, download_dir)
+    return records
+
+
+def _relink_attachments(records: list[CaseRecord], download_dir: Optional[Path]) -> None:
+    downloads = download_dir or Path("app/utils/screenshots/archive_downloads")
+    attachments = AttachmentStore(downloads / "store")
+    for record in records:
+        if not record.zip_url:
+            continue
+        entry = attachments.lookup(record.zip_url)
+        if entry is None or not attachments.blob_path(entry.sha256).is_file():
+            logger.info("附件未在本機 store，略過 %s", record.case_key)
+            continue
+        name = f"{record.tndsalno}_{record.inqcnt}.ZIP"
+        record.zip_path = str(attachments.materialize(entry.sha256, downloads / name))
+        record.zip_sha256 = entry.sha256
+
+
+# ---- PCC ----
+
+
+def _parse_pcc_search(job: tuple[str, str]) -> list[PccAssetRecord]:
+    root, sha = job
+    return parse_search_summaries(HtmlSnapshotStore(Path(root)).read(sha))
+
+
+def _reparse_pcc_detail(
+    job: tuple[str, PccAssetRecord, list[tuple[str, str]]]
+) -> PccAssetRecord:
+    """比照 PccHttpClient.fetch_detail：依抓取順序取第一個含財物名稱的詳情頁。"""
+    from app.services.pcc_http_client import DETAIL_BY_KIND
+
+    root, base, pages = job
+    store = HtmlSnapshotStore(Path(root))
+    for sha, kind in pages:
+        html = store.read(sha)
+        if "財物名稱" not in html:
+            continue
+        record = parse_detail(html, base)
+        record.detail_kind = kind
+        record.source_url = f"{DETAIL_BY_KIND[kind]}?pk={base.pk}"
+        record.status = "ok"
+        return record
+    base.status = "error"
+    base.error = "詳情頁缺少財物名稱"
+    return base
+
+
+def reparse_pcc_run(
+    store: HtmlSnapshotStore,
+    run_id: str,
+    *,
+    workers: Optional[int] = None,
+) -> list[PccAssetRecord]:
+    """重建某次 PCC 執行的案件：搜尋結果頁 → 摘要，詳情頁 → parse_detail。"""
+    root = str(store.root)
+    searches: list[str] = []
+    details: dict[str, list[tuple[str, str]]] = defaultdict(list)
+    for entry in store.iter_entries(run_id):
+        if entry.status >= 400:
+            continue
+        if entry.endpoint == PCC_SEARCH_ENDPOINT:
+            searches.append(entry.sha256)
+        elif entry.endpoint in PCC_DETAIL_KINDS and entry.case_key:
+            details[entry.case_key].append(
+                (entry.sha256, PCC_DETAIL_KINDS[entry.endpoint])
+            )
+
+    bases: dict[str, PccAssetRecord] = {}
+    for page in parallel_map(
+        _parse_pcc_search, [(root, sha) for sha in searches], workers=workers
+    ):
+        for record in page:
+            bases.setdefault(record.pk, record)
+    logger.info(
+        "快照 %s：搜尋頁 %s 頁、%s 案，詳情頁 %s 案",
+        run_id,
+        len(searches),
+        len(bases),
+        len(details),
+    )
+    # 原執行沒抓詳情頁的案（--limit、中斷）不重建，避免以搜尋摘要覆蓋
+    jobs = [
+        (root, bases.get(pk) or PccAssetRecord(pk=pk), pages)
+        for pk, pages in details.items()
+    ]
+    return parallel_map(_reparse_pcc_detail, jobs, workers=workers)
@@ -115,6 +115,7 @@ def build_fpg_digest(
     max_items: int = MAX_ITEMS,
     shells: Sequence[CaseRecord] | None = None,
     actions_url: str | None = None,
+    unchanged: int = 0,
 ) -> str:
     shell_list = list(shells) if shells is not None else [
         r for r in records if r.is_incomplete_shell
@@ -132,6 +133,8 @@ def build_fpg_digest(
         _metrics_line(ok=ok, err=err, elapsed_s=elapsed_s),
         "",
     ]
+    if unchanged:
+        lines.insert(-1, f"未變更 {unchanged} 案（僅更新最後確認）")
     if shell_list:
         lines.append(
             f"⚠ <b>空殼未寫入 Notion（{len(shell_list)}）</b>："
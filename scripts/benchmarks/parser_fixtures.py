@@ -0,0 +1,120 @@
+"""parser benchmark 用的合成 FPG／PCC 頁面（結構比照實際頁面的標記與欄位順序）。
+
+各產生器以列數（公報案件、報價品項、搜尋結果列、詳情頁附註列）決定頁面大小，
+parser_suite.py 以 10～5000 列量測。
+"""
+from __future__ import annotations
+
+CENTER = '<td><div align="center"><font size="2">{}</font></div></td>'
+
+
+def bulletin_item(no: int) -> str:
+    auction = "<br><font color=red>競標案件</font>" if no % 4 == 0 else " "
+    return (
+        f'<tr><td width="8%">\n <div align="center"><font size="2">{no}{auction}</font></div></td>\n'
+        + "<tr>"
+        + CENTER.format(f"2026/07/{no % 28 + 1:02d}")
+        + CENTER.format(("台塑", "南亞", "台化")[no % 3])
+        + CENTER.format(f"{no % 50 + 1} 噸")
+        + "</tr>\n"
+        f'<tr><td colspan="5"><font size="2">\n 廢鐵 HMS 第 {no} 批<br>規格說明</font></td></tr>\n'
+        '<tr><td><font size="2">環保法定代碼：</font></td>'
+        '<td width="30%"><font color="blue">D-0299</font></td></tr>\n'
+        "<tr>"
+        + CENTER.format("2026/08/15 ")
+        + "\n  "
+        + CENTER.format(f"0{no % 9 + 1}-UT{no:04d}/01")
+        + CENTER.format("麥寮")
+        + '<td width="20%"><font size="2">王小明(05-6811234)</font></td></tr>\n'
+        f'<input type="checkbox" name="item" value="B{no:05d},0{no % 9 + 1}-UT{no:04d},01">\n'
+    )
+
+
+def bulletin_page(items: int) -> str:
+    body = "".join(bulletin_item(no) for no in range(1, items + 1))
+    return (
+        "<html><table><tr><td>序號</td></tr>"
+        f"{body}</table>"
+        "<a href=\"javascript:goNPage(this.form,'" + str(items) + "','gtpage1')\">1/1頁</a></html>"
+    )
+
+
+def inquiry_page(quote_items: int = 0) -> str:
+    """詢價單；quote_items > 0 時後接報價明細（goQuo 回傳的合併頁）。"""
+    quote = quote_page(quote_items) if quote_items > 0 else ""
+    return (
+        "<html><table>"
+        "<tr><td><font>標售案號/詢價次數： 01-UT0001/01</font></td></tr>"
+        '<input type="hidden" name="blocid" value="B00001">'
+        "<tr><td><font>二、委託公司：台灣塑膠工業股份有限公司</font></td></tr>"
+        "<tr><td><font>委託部門：</font></td>\n <td width=\"30%\"><font size=\"2\">麥寮廠 採購組</font></td></tr>"
+        "<tr><td><font>三、存放地點：雲林縣麥寮鄉台塑工業園區 1 號</font></td></tr>"
+        "<tr><td><font>四、公告日：2026/07/20</font></td></tr>"
+        "<tr><td><font>五、報價截止日：2026/07/27</font></td></tr>"
+        "<tr><td><font>七、提貨期限：得標後\n 30 日內</font></td></tr>"
+        "<tr><td><font>廠區</font></td>\n <td><font size=\"2\">王小明</font></td>\n"
+        " <td><font size=\"2\">聯絡電話</font></td>\n <td><font size=\"2\">05-6811234</font></td></tr>"
+        "</table>"
+        f"{quote}</html>"
+    )
+
+
+QUOTE_ITEM = (
+    '<tr><td colspan="6"><font size="2">材料編號:M{no:05d}<br>\n  &lt;廢鐵 HMS 第 {no} 批&gt;</font></td></tr>\n'
+    '<tr><td><div align="center"><font size="2">標售數量</font></div>\n </td>'
+    '<td><div align="center"><font size="2">單位</font></div></td></tr>\n'
+    "<!-- 數量列 -->\n"
+    '<tr>\n <td width="10%"><div align="center"><font size="2">{no} 噸</font></div></td>'
+    '<td><div align="center"><font size="2">噸</font></div></td></tr>\n'
+    '<tr><td colspan="6"><font size="2">品質說明</font><font color="blue">：含雜質 5% 以下</font></td></tr>\n'
+)
+
+
+def quote_page(items: int) -> str:
+    body = "".join(QUOTE_ITEM.format(no=no) for no in range(1, items + 1))
+    return (
+        "<html><font>四、廠商配合事項：自行清運</font><font>五、環保代碼：D-0299</font>"
+        '<a href="/j202/share/j202_download/01-UT0001_01.ZIP">附件</a>'
+        f"<font>七、報價明細</font><table>{body}</table><font>八、報價說明</font></html>"
+    )
+
+
+PCC_DETAIL_FIELDS = (
+    ("機關名稱", "臺北市政府工務局"),
+    ("機關代碼", "3.79.5"),
+    ("機關地址", "臺北市信義區市府路 1 號"),
+    ("標案案號", "A-115-0001"),
+    ("公告次數", "1"),
+    ("財物名稱", '<script>pageCode2Img("報廢電腦 &amp; 周邊")</script>'),
+    ("聯絡人", "陳先生"),
+    ("電子郵件信箱", "a@example.gov.tw"),
+    ("聯絡電話", "(02)2720-8889"),
+    ("公告日期", "115/07/20"),
+    ("截止投標", "115/07/28 09:00"),
+    ("開標時間", "115/07/28 10:00"),
+    ("開標地點", "本局 3 樓會議室"),
+    ("變賣標的所在地", "臺北市信義區"),
+    ("底價金額", "新臺幣 12,000 元"),
+    ("投標資格摘要", "<p>一般廠商</p>"),
+    ("招標文件領取方式及地點", "網站下載"),
+    ("附加說明", "無"),
+)
+
+
+def pcc_detail_page(extra_rows: int = 0) -> str:
+    rows = [f"<tr><th>\n {label} </th><td>{value}</td></tr>" for label, value in PCC_DETAIL_FIELDS]
+    rows += [f"<tr><th>附註{n}</th><td>說明 {n}</td></tr>" for n in range(extra_rows)]
+    return '<html><input name="pk" value="778"><table>' + "\n".join(rows) + "</table></html>"
+
+
+def pcc_search_page(rows: int) -> str:
+    body = "".join(
+        f"<tr><td>{n}</td><td>臺北市政府</td><td>A-{n:04d}</td><td>1</td>"
+        f'<td><script>pageCode2Img("電腦 {n}")</script></td><td>115/07/{n % 28 + 1:02d}</td>'
+        f"<td><a onclick=\"formView{('Old', 'New', 'Normal')[n % 3]}({1000 + n},'x')\">檢視</a></td></tr>\n"
+        for n in range(1, rows + 1)
+    )
+    return (
+        f"<html><p>共有 {rows} 筆資料</p><table>{body}</table>"
+        '<a href="/opas/aspam/public/readAspam?d-1-p=2&amp;x=1">2</a></html>'
+    )
@@ -0,0 +1,71 @@
+"""fpg_parser／pcc_parser 單頁解析耗時（公報、詢價單、報價單、PCC 詳情頁）。
+
+  python scripts/benchmarks/parser_micro.py --output bench/parser_before.json
+  （改 parser 後）
+  python scripts/benchmarks/parser_micro.py --baseline bench/parser_before.json
+
+每種頁面重複解析 --number 次、取 --repeat 輪中最快一輪換算成每頁微秒；
+給 --baseline 時另列與基準相比的增益（正值＝變快）。
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import timeit
+from pathlib import Path
+from typing import Callable
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from app.models.case_record import CaseRecord
+from app.services.fpg_parser import parse_bulletin_cases, parse_inquiry_form, parse_quote_form
+from app.services.pcc_parser import parse_detail
+from parser_fixtures import bulletin_page, inquiry_page, pcc_detail_page, quote_page
+
+
+def cases() -> dict[str, Callable[[], object]]:
+    bulletin = bulletin_page(20)
+    inquiry = inquiry_page()
+    quote = quote_page(20)
+    detail = pcc_detail_page()
+    return {
+        "bulletin": lambda: parse_bulletin_cases(bulletin),
+        "inquiry": lambda: parse_inquiry_form(inquiry, CaseRecord("01-UT0001", "01")),
+        "quote": lambda: parse_quote_form(quote, CaseRecord("01-UT0001", "01")),
+        "pcc_detail": lambda: parse_detail(detail),
+    }
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="parser 單頁耗時")
+    parser.add_argument("--number", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", type=Path, default=None, help="先前 --output 的 JSON")
+    parser.add_argument("--output", type=Path, default=None, help="結果 JSON 輸出路徑")
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["per_page_us"]
+    per_page: dict[str, float] = {}
+    gain: dict[str, str] = {}
+    for name, func in cases().items():
+        best = min(timeit.repeat(func, number=args.number, repeat=args.repeat))
+        per_page[name] = round(best / args.number * 1e6, 2)
+        if name in baseline:
+            gain[name] = f"{(1 - per_page[name] / baseline[name]) * 100:+.1f}%"
+    result = {"per_page_us": per_page}
+    if gain:
+        result["gain_vs_baseline"] = gain
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    print(text)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(text + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,200 @@
+"""FPG／PCC parser 吞吐量：合成頁面 10～5000 列，量每頁／每列耗時與尖峰記憶體。
+
+  python scripts/benchmarks/parser_suite.py --output bench/parsers.json
+  （改 parser 後）
+  python scripts/benchmarks/parser_suite.py --baseline bench/parsers.json --max-slowdown 20
+
+每個 (parser, 列數) 重複解析到至少 --min-time 秒為一輪，取 --repeat 輪中最快一輪；
+尖峰記憶體以 tracemalloc 另跑一次量測（不計入耗時）。給 --baseline 時任一組合
+每頁耗時比基準慢超過 --max-slowdown 百分比（且多出 --min-delta-ms 以上）即 exit 1，
+供 CI 把關；小頁面單次只要零點幾毫秒，百分比本身容易被雜訊放大。
+
+基準與比較請在同一台機器上前後執行；共用主機忙碌時單輪耗時可能飄 10% 以上，
+可加大 --repeat 或 --min-time。
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from app.models.case_record import CaseRecord
+from app.services.fpg_parser import (
+    parse_bulletin_cases,
+    parse_bulletin_claim_items,
+    parse_inquiry_form,
+    parse_quote_form,
+)
+from app.services.pcc_parser import parse_detail, parse_search_summaries
+from parser_fixtures import (
+    bulletin_page,
+    inquiry_page,
+    pcc_detail_page,
+    pcc_search_page,
+    quote_page,
+)
+
+DEFAULT_ROWS = (10, 100, 1000, 5000)
+
+
+@dataclass(frozen=True)
+class ParserCase:
+    """page(rows) 產生頁面；parse(html) 解析並回傳實際列數供核對。"""
+
+    page: Callable[[int], str]
+    parse: Callable[[str], int]
+    # 頁面列數與解析結果列數不必相同（詢價單只取表頭欄位、詳情頁只取固定欄位）
+    counts_rows: bool = True
+
+
+def _quote_items(html: str) -> int:
+    return len(parse_quote_form(html, CaseRecord("01-UT0001", "01")).items)
+
+
+def _inquiry_fields(html: str) -> int:
+    return int(bool(parse_inquiry_form(html, CaseRecord("01-UT0001", "01")).company))
+
+
+def _detail_fields(html: str) -> int:
+    return int(bool(parse_detail(html).assets_name))
+
+
+PARSERS: dict[str, ParserCase] = {
+    "parse_bulletin_cases": ParserCase(bulletin_page, lambda h: len(parse_bulletin_cases(h))),
+    "parse_bulletin_claim_items": ParserCase(
+        bulletin_page, lambda h: len(parse_bulletin_claim_items(h))
+    ),
+    "parse_quote_form": ParserCase(quote_page, _quote_items),
+    "parse_inquiry_form": ParserCase(inquiry_page, _inquiry_fields, counts_rows=False),
+    "parse_search_summaries": ParserCase(
+        pcc_search_page, lambda h: len(parse_search_summaries(h))
+    ),
+    "parse_detail": ParserCase(pcc_detail_page, _detail_fields, counts_rows=False),
+}
+
+
+def _best_per_page(
+    parse: Callable[[str], int],
+    html: str,
+    *,
+    min_time: float,
+    repeat: int,
+) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        runs = 0
+        started = time.perf_counter()
+        elapsed = 0.0
+        while runs == 0 or elapsed < min_time:
+            parse(html)
+            runs += 1
+            elapsed = time.perf_counter() - started
+        best = min(best, elapsed / runs)
+    return best
+
+
+def _peak_bytes(parse: Callable[[str], int], html: str) -> int:
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        parse(html)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return max(0, peak - before)
+
+
+def measure(name: str, rows: int, *, min_time: float, repeat: int) -> dict:
+    case = PARSERS[name]
+    html = case.page(rows)
+    parsed = case.parse(html)
+    expected = rows if case.counts_rows else 1
+    if parsed != expected:
+        raise SystemExit(f"{name}@{rows}：解析結果 {parsed} 筆，預期 {expected}")
+    per_page = _best_per_page(case.parse, html, min_time=min_time, repeat=repeat)
+    return {
+        "parser": name,
+        "rows": rows,
+        "html_kib": round(len(html.encode("utf-8")) / 1024, 1),
+        "per_page_ms": round(per_page * 1000, 4),
+        "per_row_us": round(per_page / rows * 1e6, 3),
+        "peak_kib": round(_peak_bytes(case.parse, html) / 1024, 1),
+    }
+
+
+def regressions(
+    results: list[dict],
+    baseline: list[dict],
+    max_slowdown: float,
+    *,
+    min_delta_ms: float = 0.0,
+) -> list[str]:
+    """每頁耗時比基準慢超過 max_slowdown% 且多出 min_delta_ms 的組合（結果另記 vs_baseline）。"""
+    before = {(r["parser"], r["rows"]): r["per_page_ms"] for r in baseline}
+    slow: list[str] = []
+    for result in results:
+        old = before.get((result["parser"], result["rows"]))
+        if not old:
+            continue
+        change = (result["per_page_ms"] / old - 1) * 100
+        result["vs_baseline"] = f"{change:+.1f}%"
+        if change > max_slowdown and result["per_page_ms"] - old > min_delta_ms:
+            slow.append(f"{result['parser']}@{result['rows']} 慢了 {change:.1f}%")
+    return slow
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="FPG／PCC parser 吞吐量")
+    parser.add_argument("--parsers", nargs="+", choices=sorted(PARSERS), default=list(PARSERS))
+    parser.add_argument("--rows", type=int, nargs="+", default=list(DEFAULT_ROWS))
+    parser.add_argument("--min-time", type=float, default=0.2, help="每輪最少秒數")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", type=Path, default=None, help="先前 --output 的 JSON")
+    parser.add_argument("--max-slowdown", type=float, default=20.0, help="容許變慢百分比")
+    parser.add_argument(
+        "--min-delta-ms", type=float, default=0.05, help="每頁至少多出幾毫秒才算變慢"
+    )
+    parser.add_argument("--output", type=Path, default=None, help="結果 JSON 輸出路徑")
+    args = parser.parse_args(argv)
+
+    results = [
+        measure(name, rows, min_time=args.min_time, repeat=args.repeat)
+        for name in args.parsers
+        for rows in sorted(args.rows)
+    ]
+    slow: list[str] = []
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["results"]
+        slow = regressions(
+            results, baseline, args.max_slowdown, min_delta_ms=args.min_delta_ms
+        )
+
+    for r in results:
+        print(
+            f"{r['parser']:<28}{r['rows']:>6} 列 {r['html_kib']:>9} KiB "
+            f"{r['per_page_ms']:>10.3f} ms/頁 {r['per_row_us']:>9.3f} us/列 "
+            f"peak {r['peak_kib']:>9} KiB {r.get('vs_baseline', '')}"
+        )
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(
+            json.dumps({"results": results}, ensure_ascii=False, indent=2) + "\n",
+            encoding="utf-8",
+        )
+    if slow:
+        print("超過容許變慢幅度：" + "；".join(slow), file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
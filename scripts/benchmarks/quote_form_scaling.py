@@ -0,0 +1,67 @@
+"""parse_quote_form 隨品項數的耗時：合成報價明細頁，確認每品項成本不隨頁面變大而增加。
+
+  python scripts/benchmarks/quote_form_scaling.py
+  python scripts/benchmarks/quote_form_scaling.py --items 10 100 1000 5000 --max-growth 2
+
+輸出每種品項數的中位耗時與每品項耗時（微秒）；最大頁的每品項耗時超過最小頁的
+--max-growth 倍即 exit 1（非線性成長），供 CI 把關。
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from app.models.case_record import CaseRecord
+from app.services.fpg_parser import parse_quote_form
+from parser_fixtures import quote_page
+
+
+def measure(items: int, repeat: int) -> dict:
+    html = quote_page(items)
+    timings: list[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        record = parse_quote_form(html, CaseRecord(tndsalno="01-UT0001", inqcnt="01"))
+        timings.append(time.perf_counter() - started)
+    if len(record.items) != items:
+        raise SystemExit(f"解析品項數不符：預期 {items}，實得 {len(record.items)}")
+    median = statistics.median(timings)
+    return {
+        "items": items,
+        "html_chars": len(html),
+        "median_ms": round(median * 1000, 3),
+        "per_item_us": round(median / items * 1e6, 3),
+    }
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="parse_quote_form 品項數擴展性")
+    parser.add_argument("--items", type=int, nargs="+", default=[10, 50, 200, 1000, 3000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-growth", type=float, default=None, help="每品項耗時成長倍數上限")
+    parser.add_argument("--output", type=Path, default=None, help="結果 JSON 輸出路徑")
+    args = parser.parse_args(argv)
+
+    rows = [measure(items, args.repeat) for items in sorted(args.items)]
+    growth = rows[-1]["per_item_us"] / rows[0]["per_item_us"] if rows[0]["per_item_us"] else 0.0
+    result = {"rows": rows, "per_item_growth": round(growth, 2)}
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    print(text)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(text + "\n", encoding="utf-8")
+    if args.max_growth is not None and growth > args.max_growth:
+        print(f"每品項耗時成長 {growth:.2f} 倍，超過上限 {args.max_growth}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
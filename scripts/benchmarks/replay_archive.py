@@ -0,0 +1,123 @@
+"""以 HTTP cassette 重播計時 run_archive／run_pcc_archive（不連 FPG／PCC／Notion）。
+
+先錄一次（照常連線，回應寫入 cassette）:
+  HTTP_CASSETTE=bench/fpg.json HTTP_CASSETTE_MODE=record \
+    python -m app.scripts.run_archive --fresh-login --date 2026/07/22
+
+再重播計時（-- 之後的參數原樣交給歸檔腳本，需與錄製時相同）:
+  python scripts/benchmarks/replay_archive.py fpg bench/fpg.json --repeat 5 -- --fresh-login --date 2026/07/22
+  python scripts/benchmarks/replay_archive.py pcc bench/pcc.json --latency 1 -- --date 2026/07/22
+
+--latency 為錄製耗時的倍率（0＝不等待，只量本機 CPU）；--max-seconds 超過即 exit 1，供 CI 把關。
+
+每輪在新的暫存工作目錄執行，FPG_CACHE_DIR／HTML_SNAPSHOT_DIR 也指向其中：登入 session、
+公報快取、channel 路由、附件 store 都從零開始，各輪走相同的請求路徑，耗時才能比較
+（錄製時請同樣用 --fresh-login、空的快取目錄）。傳給歸檔腳本的相對路徑（如 --digest-file）
+會寫進該暫存目錄。
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from app.core.config import settings
+from app.scripts import run_archive, run_pcc_archive
+from app.services.http_cassette import Cassette, use_cassette
+
+RUNNERS = {
+    "fpg": (run_archive.parse_args, run_archive.run_archive),
+    "pcc": (run_pcc_archive.parse_args, run_pcc_archive.run_pcc_archive),
+}
+
+# 會影響下一輪請求路徑的本機狀態目錄
+STATE_SETTINGS = ("FPG_CACHE_DIR", "HTML_SNAPSHOT_DIR")
+
+
+@contextmanager
+def fresh_state() -> Iterator[Path]:
+    """切到空的暫存工作目錄（預設附件目錄等相對路徑）並把狀態目錄設定指向其中。"""
+    saved = {name: getattr(settings, name) for name in STATE_SETTINGS}
+    cwd = Path.cwd()
+    with tempfile.TemporaryDirectory(prefix="replay-archive-") as tmp:
+        root = Path(tmp)
+        for name in STATE_SETTINGS:
+            setattr(settings, name, str(root / name.lower()))
+        os.chdir(root)
+        try:
+            yield root
+        finally:
+            os.chdir(cwd)
+            for name, value in saved.items():
+                setattr(settings, name, value)
+
+
+def parse_args(argv: list[str]) -> tuple[argparse.Namespace, list[str]]:
+    own, passthrough = argv, []
+    if "--" in argv:
+        split = argv.index("--")
+        own, passthrough = argv[:split], argv[split + 1 :]
+    parser = argparse.ArgumentParser(description="cassette 重播歸檔計時")
+    parser.add_argument("source", choices=sorted(RUNNERS))
+    parser.add_argument("cassette", type=Path)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.0, help="錄製耗時倍率")
+    parser.add_argument("--max-seconds", type=float, default=None, help="中位數上限")
+    parser.add_argument("--output", type=Path, default=None, help="結果 JSON 輸出路徑")
+    return parser.parse_args(own), passthrough
+
+
+def main(argv: list[str]) -> int:
+    args, passthrough = parse_args(argv)
+    logging.getLogger().setLevel(logging.WARNING)
+    parse, run = RUNNERS[args.source]
+    cassette_path = args.cassette.resolve()
+    timings: list[float] = []
+    exit_codes: list[int] = []
+    replayed: list[int] = []
+    for _ in range(args.repeat):
+        cassette = Cassette(cassette_path, mode="replay", latency_scale=args.latency)
+        use_cassette(cassette)
+        with fresh_state():
+            started = time.perf_counter()
+            exit_codes.append(asyncio.run(run(parse(passthrough))))
+            timings.append(time.perf_counter() - started)
+        replayed.append(cassette.replayed)
+    use_cassette(None)
+
+    result = {
+        "source": args.source,
+        "cassette": str(args.cassette),
+        # 各輪重播的請求數；不一致表示各輪走了不同路徑，耗時不可比
+        "interactions": replayed,
+        "latency_scale": args.latency,
+        "runs_s": [round(t, 3) for t in timings],
+        "median_s": round(statistics.median(timings), 3),
+        "min_s": round(min(timings), 3),
+        "exit_codes": exit_codes,
+    }
+    print(json.dumps(result, ensure_ascii=False, indent=1))
+    if len(set(replayed)) > 1:
+        print(f"各輪重播請求數不同 {replayed}，耗時不可比", file=sys.stderr)
+    if args.output:
+        args.output.write_text(json.dumps(result, ensure_ascii=False), encoding="utf-8")
+    if args.max_seconds is not None and result["median_s"] > args.max_seconds:
+        print(f"重播中位數 {result['median_s']}s 超過上限 {args.max_seconds}s", file=sys.stderr)
+        return 1
+    return 0 if all(code == 0 for code in exit_codes) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,8 @@
+"""pytest 共用設定：Settings 必填欄位給假值，測試不需 .env 也不連網。"""
+from __future__ import annotations
+
+import os
+
+os.environ.setdefault("FPG_USERNAME", "test-user")
+os.environ.setdefault("FPG_PASSWORD", "test-pass")
+os.environ.setdefault("LOGIN_URL", "https://fpg.example.test/j202/mgt/mgt_logon.jsp")
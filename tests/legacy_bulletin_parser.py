@@ -0,0 +1,102 @@
+"""fpg_parser.parse_bulletin_cases 改寫前的舊版實作，供等價測試對照。"""
+from __future__ import annotations
+
+import re
+
+from app.models.case_record import CaseRecord, QuoteItem
+from app.services.fpg_parser import _split_contact, strip_html, to_iso_date
+
+
+def parse_bulletin_cases(html: str) -> list[CaseRecord]:
+    """舊版：re.split＋每案往前 6500 字元視窗再跑三個 regex。"""
+    records: list[CaseRecord] = []
+    seen: set[tuple[str, str]] = set()
+
+    # 依清單序號切開；競標案項次會多 <br><font color=red>競標案件</font>
+    parts = re.split(
+        r'<td width="8%">\s*<div align="center"><font size="2">\s*\d+\s*'
+        r"(?:<br>[\s\S]*?)?</font>",
+        html,
+    )
+    # 序號區塊（含是否標示競標案件）與 parts[1:] 對齊
+    markers = re.findall(
+        r'<td width="8%">\s*<div align="center"><font size="2">\s*\d+\s*'
+        r"((?:<br>[\s\S]*?)?)</font>",
+        html,
+    )
+    for index, chunk in enumerate(parts[1:]):
+        is_auction = index < len(markers) and "競標案件" in markers[index]
+        for case_m in re.finditer(
+            r'<font size="2">(\d{4}/\d{2}/\d{2})\s*</font></div>\s*</td>\s*'
+            r'<td[^>]*>\s*<div align="center"><font size="2">'
+            r"([A-Z0-9]{2}-[A-Z0-9]+)/(\d{2})</font></div>\s*</td>\s*"
+            r'<td[^>]*>\s*<div align="center"><font size="2">([^<]*)</font></div>\s*</td>\s*'
+            r'<td[^>]*><font size="2">([^<]*)</font></td>',
+            chunk,
+        ):
+            deadline, tndsalno, inqcnt, location, contact_raw = case_m.groups()
+            key = (tndsalno, inqcnt)
+            if key in seen:
+                continue
+            seen.add(key)
+
+            # 每個案號往前取區塊，避免多案同段時欄位錯位
+            local = chunk[max(0, case_m.start() - 6500) : case_m.start()]
+            # 若本段開頭即本案說明，再以項次後全文補強
+            if is_auction or "競標案件" in local:
+                is_auction = True
+
+            announce = ""
+            quantity = ""
+            rows = re.findall(
+                r'<font size="2">(\d{4}/\d{2}/\d{2})</font></div>\s*</td>\s*'
+                r'<td[^>]*>\s*<div align="center"><font size="2">([^<]*)</font></div>\s*</td>\s*'
+                r'<td[^>]*>\s*<div align="center"><font size="2">([^<]*)</font></div>',
+                local,
+            )
+            if rows:
+                announce, _supplier, quantity = rows[-1]
+
+            description = ""
+            desc_matches = re.findall(
+                r'<td colspan="5"><font size="2">\s*([\s\S]*?)<br>',
+                local,
+            )
+            if desc_matches:
+                description = strip_html(desc_matches[-1])
+
+            eco = ""
+            eco_m = re.search(
+                r"環保法定代碼：</font></td>\s*<td[^>]*><font[^>]*>([^<]+)",
+                local,
+            )
+            if eco_m:
+                eco = strip_html(eco_m.group(1))
+                if eco in {"--", "-"}:
+                    eco = ""
+
+            contact_name, contact_phone = _split_contact(contact_raw)
+            items = []
+            if description or quantity:
+                items = [
+                    QuoteItem(
+                        description=description or "(公報品名未解析)",
+                        quantity=strip_html(quantity),
+                    )
+                ]
+
+            records.append(
+                CaseRecord(
+                    tndsalno=tndsalno,
+                    inqcnt=inqcnt,
+                    bid_channel="cmp" if is_auction else "gen",
+                    location=strip_html(location),
+                    announce_date=to_iso_date(announce),
+                    quote_deadline=to_iso_date(deadline),
+                    plant_contact=contact_name,
+                    plant_phone=contact_phone,
+                    eco_code=eco,
+                    items=items,
+                )
+            )
+    return records
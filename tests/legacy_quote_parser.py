@@ -0,0 +1,60 @@
+"""fpg_parser.parse_quote_form 改寫前的舊版實作，供等價測試對照。"""
+from __future__ import annotations
+
+import re
+
+from app.models.case_record import CaseRecord, QuoteItem
+from app.services.fpg_parser import strip_html
+
+
+def parse_quote_form(html: str, record: CaseRecord) -> CaseRecord:
+    """舊版：每品項 lazy lookahead 切段，段內再 lazy 比對標售數量。"""
+    zips = re.findall(r'(/j202/share/j202_download/[^"\']+\.ZIP)', html, re.I)
+    if zips:
+        record.zip_url = zips[0]
+
+    vendor = re.search(r"四、廠商配合事項[：:]?\s*(.*?)</font>", html, re.S)
+    if vendor:
+        record.vendor_notes = strip_html(vendor.group(1))
+
+    eco = re.search(r"五、環保代碼[：:]?\s*([^<]+)", html)
+    if eco:
+        record.eco_code = strip_html(eco.group(1))
+        if record.eco_code in {"--", "-"}:
+            record.eco_code = ""
+
+    items: list[QuoteItem] = []
+    for m in re.finditer(
+        r"材料編號:([^<\s]+)<br>\s*((?:&lt;|<)[^<&]+(?:&gt;|>))\s*</font>"
+        r"([\s\S]*?)(?=材料編號:|八、報價說明|$)",
+        html,
+    ):
+        desc = strip_html(m.group(2))
+        chunk = m.group(3)
+        qty = ""
+        qty_m = re.search(
+            r"標售數量</font></div>\s*</td>[\s\S]*?</tr>\s*(?:<!--[\s\S]*?-->\s*)?<tr>\s*"
+            r'<td[^>]*>\s*<div align="center"><font size="2">([^<]+)</font>',
+            chunk,
+        )
+        if qty_m:
+            qty = strip_html(qty_m.group(1))
+        quality = ""
+        q_m = re.search(r"品質說明</font><font[^>]*>：([^<]+)", chunk)
+        if q_m:
+            quality = strip_html(q_m.group(1))
+        items.append(QuoteItem(description=desc, quantity=qty, quality_note=quality))
+
+    # 若沒有 <> 格式，退而求其次抓材料編號後文字
+    if not items:
+        for m in re.finditer(
+            r"材料編號:([^<\s]+)<br>\s*([\s\S]*?)</font>",
+            html,
+        ):
+            desc = strip_html(m.group(2))
+            if desc:
+                items.append(QuoteItem(description=desc))
+
+    if items:
+        record.items = items
+    return record
@@ -0,0 +1,76 @@
+"""差異歸檔：公報指紋比對；不需網路。"""
+from __future__ import annotations
+
+from app.models.case_record import CaseRecord, QuoteItem
+from app.services.archive_delta import split_unchanged
+from app.utils.telegram_digest import build_fpg_digest
+
+
+def _base(tnd: str, quantity: str = "10 噸") -> CaseRecord:
+    record = CaseRecord(
+        tndsalno=tnd,
+        inqcnt="01",
+        location="麥寮",
+        quote_deadline="2026-07-29",
+        items=[QuoteItem(description="廢鐵", quantity=quantity)],
+    )
+    record.bulletin_fingerprint = record.compute_bulletin_fingerprint()
+    return record
+
+
+def test_fingerprint_ignores_enrichment_fields() -> None:
+    record = _base("01-UT1")
+    before = record.bulletin_fingerprint
+    record.zip_sha256 = "abc"
+    record.vendor_notes = "自備吊車"
+    record.items[0].quality_note = "含油"
+    assert record.compute_bulletin_fingerprint() == before
+    record.quote_deadline = "2026-07-30"
+    assert record.compute_bulletin_fingerprint() != before
+
+
+BID_POST = "https://fpg.test/j202/servlet/com.fpg.j202.Cj202c13"
+BULLETIN_POST = "https://fpg.test/j202/servlet/com.fpg.j202.Cj202c12"
+
+
+def test_split_unchanged() -> None:
+    same, changed, errored, new, shell = (
+        _base("01-SAME"),
+        _base("01-CHG"),
+        _base("01-ERR"),
+        _base("01-NEW"),
+        _base("01-SHELL"),
+    )
+    archived = {
+        "01-SAME/01": {
+            "page_id": "p1",
+            "fingerprint": same.bulletin_fingerprint,
+            "status": "updated",
+            "source_url": BID_POST,
+        },
+        "01-CHG/01": {"page_id": "p2", "fingerprint": _base("01-CHG", "20 噸").bulletin_fingerprint},
+        "01-ERR/01": {"page_id": "p3", "fingerprint": errored.bulletin_fingerprint, "status": "error"},
+        # 上次只寫入公報摘要（例如 --skip-claim，報價單尚未出現）：仍要重跑
+        "01-SHELL/01": {
+            "page_id": "p4",
+            "fingerprint": shell.bulletin_fingerprint,
+            "status": "new",
+            "source_url": BULLETIN_POST,
+        },
+    }
+    todo, skipped = split_unchanged([same, changed, errored, new, shell], archived)
+    assert [r.tndsalno for r in todo] == ["01-CHG", "01-ERR", "01-NEW", "01-SHELL"]
+    assert [(r.tndsalno, page["page_id"]) for r, page in skipped] == [("01-SAME", "p1")]
+
+
+def test_digest_reports_unchanged_count() -> None:
+    text = build_fpg_digest(
+        announce_label="2026/07/22",
+        records=[],
+        page_urls=[],
+        ok=0,
+        err=0,
+        elapsed_s=3,
+        unchanged=5,
+    )
+    assert "未變更 5 案" in text
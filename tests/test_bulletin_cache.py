@@ -0,0 +1,120 @@
+"""單日公報快取：過去公告日讀快取、今天／昨天重抓、TTL 到期；不需網路。"""
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import date, timedelta
+from pathlib import Path
+
+from app.models.case_record import CaseRecord, QuoteItem
+from app.services.bulletin_cache import BulletinCache
+from app.services.bulletin_snapshot import BulletinPage, BulletinSnapshot
+from app.services.fpg_http_client import FpgHttpClient
+
+
+def _slash(days_ago: int) -> str:
+    return (date.today() - timedelta(days=days_ago)).strftime("%Y/%m/%d")
+
+
+def _record() -> CaseRecord:
+    return CaseRecord(
+        tndsalno="01-UT1",
+        inqcnt="01",
+        announce_date="2026-07-22",
+        items=[QuoteItem(description="廢鐵", quantity="10 噸")],
+    )
+
+
+def test_case_record_round_trip_ignores_unknown_fields() -> None:
+    data = _record().to_dict()
+    data["removed_field"] = "x"
+    restored = CaseRecord.from_dict(data)
+    assert restored == _record()
+    assert isinstance(restored.items[0], QuoteItem)
+
+
+def test_past_days_cached_recent_days_refreshed(tmp_path: Path) -> None:
+    cache = BulletinCache(tmp_path, ttl_seconds=3600)
+    for days_ago in (0, 1, 2):
+        cache.put(_slash(days_ago), [_record()])
+    assert cache.get(_slash(0)) is None
+    assert cache.get(_slash(1)) is None
+    assert cache.get(_slash(2)) == [_record()]
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+
+def test_expired_entry_ignored(tmp_path: Path) -> None:
+    cache = BulletinCache(tmp_path, ttl_seconds=60)
+    day = _slash(10)
+    cache.put(day, [_record()])
+    path = next(tmp_path.glob("*.json"))
+    data = json.loads(path.read_text(encoding="utf-8"))
+    data["fetched_at"] -= 120
+    path.write_text(json.dumps(data), encoding="utf-8")
+    assert cache.get(day) is None
+
+
+def test_search_uses_cache_without_fpg_traffic(tmp_path: Path) -> None:
+    cache = BulletinCache(tmp_path, ttl_seconds=3600)
+    day = _slash(5)
+    cache.put(day, [_record()])
+
+    # 未進入 async context：若真的送出請求會丟 RuntimeError
+    client = FpgHttpClient(bulletin_cache=cache)
+    records = asyncio.run(client.search_bulletin_by_announce_date(day, day))
+    assert [r.case_key for r in records] == ["01-UT1/01"]
+    assert client.bulletin_snapshot is None
+
+
+def test_claim_planning_skips_bulletin_when_nothing_pending(tmp_path: Path) -> None:
+    cache = BulletinCache(tmp_path, ttl_seconds=3600)
+    day = _slash(5)
+    # 當日唯一未選取的是不在本次清單內的案（例如大陸案）
+    cache.put(day, [_record()], [("B9", "01-UT9", "01")])
+    client = FpgHttpClient(bulletin_cache=cache)
+
+    async def run():
+        await client.search_bulletin_by_announce_date(day, day)
+        return await client.plan_claims(day, day, allowed_keys={("01-UT1", "01")})
+
+    # 未進入 async context：若重抓公報會丟 RuntimeError
+    snapshot, selectable = asyncio.run(run())
+    assert selectable == []
+    assert snapshot.pages == []
+
+
+def test_claim_planning_refetches_and_updates_cached_claims(
+    tmp_path: Path, monkeypatch
+) -> None:
+    monkeypatch.setattr("app.services.fpg_http_client.CLAIM_BATCH_PAUSE", 0)
+    cache = BulletinCache(tmp_path, ttl_seconds=3600)
+    day = _slash(5)
+    pending = ("B1", "01-UT1", "01")
+    cache.put(day, [_record()], [pending])
+    client = FpgHttpClient(bulletin_cache=cache)
+    loads: list[str] = []
+
+    async def load_bulletin_snapshot(start, end, **kwargs):
+        loads.append(start)
+        page = BulletinPage(page=1, html="", claim_items=[pending])
+        return BulletinSnapshot(start_date=start, end_date=end, itemnum="9", pages=[page])
+
+    async def post_go_save(start, end, items, *, itemnum):
+        return ""
+
+    client.load_bulletin_snapshot = load_bulletin_snapshot
+    client._post_go_save = post_go_save
+    claimed = asyncio.run(
+        client.claim_unselected_cases(day, day, allowed_keys={("01-UT1", "01")})
+    )
+    assert claimed == [pending]
+    assert loads == [day]
+    # goSave 後快取不再列為待轉報價，下次不必重抓
+    assert cache.get_claim_items(day) == []
+
+
+def test_cache_without_claim_items_falls_back_to_bulletin(tmp_path: Path) -> None:
+    cache = BulletinCache(tmp_path, ttl_seconds=3600)
+    day = _slash(5)
+    cache.put(day, [_record()])
+    assert cache.get_claim_items(day) is None
@@ -0,0 +1,112 @@
+"""公報分頁併發抓取：依頁序合併並去重，不需網路。"""
+from __future__ import annotations
+
+import asyncio
+
+from app.services.fpg_http_client import FpgHttpClient
+from app.services.request_policy import RateLimiter
+
+PAGES = {
+    1: ">01-UT0001/01< >01-UT0002/01< 第1/4頁 goNPage(this.form,'8','gtpage1')",
+    2: ">01-UT0003/01< >01-UT0002/01<",
+    3: ">01-UT0004/01< >01-UT0005/02<",
+    4: ">01-UT0006/01<",
+}
+
+
+class _FakeBulletinClient(FpgHttpClient):
+    def __init__(self) -> None:
+        super().__init__(rate_limiter=RateLimiter(0))
+        self.active = 0
+        self.peak = 0
+        self.itemnums: list[str] = []
+
+    async def _get(self, url: str, **kwargs) -> str:
+        return ""
+
+    async def _bulletin_list(self, start_date, end_date, *, page, itemnum, btn="goList"):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        self.itemnums.append(itemnum)
+        try:
+            # 越前面的頁越慢回來
+            await asyncio.sleep(0.01 * (5 - int(page)))
+            return PAGES[int(page)]
+        finally:
+            self.active -= 1
+
+
+def test_pages_fetched_concurrently_and_merged_in_order() -> None:
+    client = _FakeBulletinClient()
+    records = asyncio.run(
+        client.search_bulletin_by_announce_date(
+            "2026/08/10", "2026/08/10", page_concurrency=3
+        )
+    )
+    assert [r.case_key for r in records] == [
+        "01-UT0001/01",
+        "01-UT0002/01",
+        "01-UT0003/01",
+        "01-UT0004/01",
+        "01-UT0005/02",
+        "01-UT0006/01",
+    ]
+    assert client.peak == 3
+    assert client.itemnums == ["", "8", "8", "8"]
+    assert all(r.announce_date == "2026-08-10" for r in records)
+
+
+CLAIM_PAGES = {
+    1: (
+        ">01-UT0001/01< 第1/2頁 goNPage(this.form,'3','gtpage1')"
+        '<input type="checkbox" name="item" value="75708007,01-UT0001,01">'
+    ),
+    2: (
+        ">01-UT0002/01< >01-UT0003/01<"
+        '<input type="checkbox" name="item" value="75708007,01-UT0003,01">'
+    ),
+}
+
+
+class _FakeClaimClient(_FakeBulletinClient):
+    def __init__(self) -> None:
+        super().__init__()
+        self.list_pages: list[str] = []
+        self.saved: list[list[tuple[str, str, str]]] = []
+
+    async def _bulletin_list(self, start_date, end_date, *, page, itemnum, btn="goList"):
+        self.list_pages.append(page)
+        return CLAIM_PAGES[int(page)]
+
+    async def _post_go_save(self, start_date, end_date, items, *, itemnum):
+        self.saved.append(list(items))
+        return ""
+
+
+def test_claim_reuses_search_snapshot_and_refetches_only_changed_pages() -> None:
+    client = _FakeClaimClient()
+
+    async def run() -> None:
+        bases = await client.search_bulletin_by_announce_date("2026/08/10", "2026/08/10")
+        assert len(bases) == 3
+        assert client.list_pages == ["1", "2"]
+
+        allowed = {(r.tndsalno, r.inqcnt) for r in bases}
+        claimed = await client.claim_unselected_cases(
+            "2026/08/10", "2026/08/10", allowed_keys=allowed
+        )
+        assert claimed == [
+            ("75708007", "01-UT0001", "01"),
+            ("75708007", "01-UT0003", "01"),
+        ]
+        # 轉報價沿用快照：不再抓公報分頁
+        assert client.list_pages == ["1", "2"]
+        assert client.bulletin_snapshot.stale_pages == [1, 2]
+
+        # 同區間再轉報價：只重抓被 goSave 變動過的頁
+        await client.claim_unselected_cases(
+            "2026/08/10", "2026/08/10", allowed_keys=allowed
+        )
+        assert client.list_pages == ["1", "2", "1", "2"]
+
+    asyncio.run(run())
@@ -0,0 +1,94 @@
+"""改寫後的 parse_bulletin_cases 與舊版等價：合成公報頁語料＋本機 HTML 快照（若有）。"""
+from __future__ import annotations
+
+import random
+from dataclasses import asdict
+
+import pytest
+
+from app.services.fpg_parser import parse_bulletin_cases
+from app.services.html_snapshot_store import HtmlSnapshotStore
+from tests.legacy_bulletin_parser import parse_bulletin_cases as legacy_parse
+
+CENTER = '<td{attr}><div align="center"><font size="2">{text}</font></div></td>'
+
+
+def _case_row(rng: random.Random, tnd: str, inq: str) -> str:
+    deadline = f"2026/08/{rng.randint(1, 28):02d}" + rng.choice(["", " ", "\n  "])
+    contact = rng.choice(["王小明(05-6811234)", "李組長", "陳先生(0912-345678)", ""])
+    return (
+        "<tr>"
+        + CENTER.format(attr="", text=deadline)
+        + "\n  "
+        + CENTER.format(attr=' width="12%"', text=f"{tnd}/{inq}")
+        + CENTER.format(attr="", text=rng.choice(["麥寮", "仁武", "林園廠", ""]))
+        + f'<td width="20%"><font size="2">{contact}</font></td></tr>'
+    )
+
+
+def _item(rng: random.Random, no: int, keys: list[tuple[str, str]]) -> str:
+    auction = rng.random() < 0.3
+    parts = [
+        '<tr><td width="8%">\n <div align="center"><font size="2">'
+        f"{no}{'<br><font color=red>競標案件</font>' if auction else ' '}</font></div></td>"
+    ]
+    for tnd, inq in keys:
+        if rng.random() < 0.85:
+            parts.append(
+                "<tr>"
+                + CENTER.format(attr="", text=f"2026/07/{rng.randint(1, 28):02d}")
+                + CENTER.format(attr="", text=rng.choice(["台塑", "南亞", "台化"]))
+                + CENTER.format(attr="", text=rng.choice(["10 噸", "3 批", "", "1,200 KG"]))
+                + "</tr>"
+            )
+        if rng.random() < 0.8:
+            desc = rng.choice(["廢鐵 HMS", "廢銅線 &amp; 電纜", "<b>廢塑膠</b>", "競標案件 廢料"])
+            parts.append(f'<tr><td colspan="5"><font size="2">\n {desc}<br>規格說明</font></td></tr>')
+        if rng.random() < 0.7:
+            eco = rng.choice(["D-0299", "--", "-", "R-1101"])
+            parts.append(
+                '<tr><td><font size="2">環保法定代碼：</font></td>'
+                f'<td width="30%"><font color="blue">{eco}</font></td></tr>'
+            )
+        if rng.random() < 0.2:
+            # 長段備註：超出往前視窗時舊版取不到更早的欄位
+            parts.append("<!-- " + "備註" * rng.randint(1000, 4000) + " -->")
+        parts.append(_case_row(rng, tnd, inq))
+    return "\n".join(parts)
+
+
+def synthetic_bulletin_page(seed: int) -> str:
+    rng = random.Random(seed)
+    pool = [(f"0{rng.randint(1, 9)}-UT{n:04d}", f"{rng.randint(1, 3):02d}") for n in range(40)]
+    items = []
+    for no in range(1, rng.randint(2, 25)):
+        count = 1 if rng.random() < 0.8 else rng.randint(2, 3)
+        items.append(_item(rng, no, rng.sample(pool, count)))
+    return "<html><table><tr><td>序號</td></tr>" + "\n".join(items) + "</table></html>"
+
+
+def _as_dicts(records) -> list[dict]:
+    return [asdict(record) for record in records]
+
+
+@pytest.mark.parametrize("seed", range(120))
+def test_matches_legacy_parser_on_synthetic_pages(seed: int) -> None:
+    html = synthetic_bulletin_page(seed)
+    expected = legacy_parse(html)
+    assert expected, "語料頁應至少解析出一案"
+    assert _as_dicts(parse_bulletin_cases(html)) == _as_dicts(expected)
+
+
+def test_matches_legacy_parser_on_local_snapshots() -> None:
+    store = HtmlSnapshotStore.from_settings()
+    pages = {
+        entry.sha256
+        for run_id in store.run_ids()
+        for entry in store.iter_entries(run_id)
+        if entry.endpoint == "Cj202c12"
+    }
+    if not pages:
+        pytest.skip("本機沒有公報頁快照（--snapshots 保存後可納入比對）")
+    for sha in sorted(pages):
+        html = store.read(sha)
+        assert _as_dicts(parse_bulletin_cases(html)) == _as_dicts(legacy_parse(html)), sha
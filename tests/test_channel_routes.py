@@ -0,0 +1,71 @@
+"""標案／競標 channel 路由記憶：不需網路。"""
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+from app.models.case_record import CaseRecord
+from app.services.channel_routes import ChannelRouteBook
+from app.services.fpg_http_client import FpgHttpClient
+from app.services.request_policy import RateLimiter
+
+
+class _RoutingClient(FpgHttpClient):
+    """gen 永遠沒有報價單，cmp 才有；記錄每次嘗試的 channel。"""
+
+    def __init__(self, routes: ChannelRouteBook) -> None:
+        super().__init__(rate_limiter=RateLimiter(0), channel_routes=routes)
+        self.tried: list[str] = []
+
+    async def _enrich_via_channel(self, base: CaseRecord, channel: str):
+        self.tried.append(channel)
+        if channel != "cmp":
+            return None
+        base.bid_channel = channel
+        return base
+
+
+def test_learned_channel_is_tried_first_on_next_run(tmp_path: Path) -> None:
+    path = tmp_path / "routes.json"
+    case = CaseRecord(tndsalno="01-UT1AAA", inqcnt="01", bid_channel="gen")
+
+    first = _RoutingClient(ChannelRouteBook(path))
+    asyncio.run(first.fetch_cases([case], delay_seconds=0))
+    assert first.tried == ["gen", "cmp"]
+    assert path.is_file()
+
+    second = _RoutingClient(ChannelRouteBook(path))
+    again = CaseRecord(tndsalno="01-UT1AAA", inqcnt="02", bid_channel="gen")
+    asyncio.run(second.fetch_cases([again], delay_seconds=0))
+    assert second.tried == ["cmp"]
+
+
+class _PageCountingClient(FpgHttpClient):
+    def __init__(self) -> None:
+        super().__init__(rate_limiter=RateLimiter(0))
+        self.gets: list[str] = []
+
+    async def _get(self, url: str, **kwargs) -> str:
+        self.gets.append(url)
+        return ""
+
+    async def _post_form(self, url: str, data: dict, *, referer: str) -> str:
+        return ""  # 無 goDetail → 此 channel 無報價單
+
+
+def test_channel_search_page_loaded_once_while_staying_on_channel() -> None:
+    client = _PageCountingClient()
+
+    async def run() -> None:
+        for tnd in ("01-UT1", "01-UT2", "01-UT3"):
+            await client._enrich_via_channel(CaseRecord(tndsalno=tnd, inqcnt="01"), "gen")
+        await client._enrich_via_channel(CaseRecord(tndsalno="01-UT4", inqcnt="01"), "cmp")
+        await client._enrich_via_channel(CaseRecord(tndsalno="01-UT5", inqcnt="01"), "gen")
+
+    asyncio.run(run())
+    assert [url.rsplit("/j202/", 1)[1] for url in client.gets] == [
+        "prc/prc_bid_gen_srh.jsp",
+        "cmp/prc_bid_gen_srh.jsp",
+        "prc/prc_bid_gen_srh.jsp",
+    ]
+
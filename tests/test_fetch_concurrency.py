@@ -0,0 +1,55 @@
+"""逐案 enrichment 與共用節流：不需網路。"""
+from __future__ import annotations
+
+import asyncio
+import time
+
+from app.models.case_record import CaseRecord
+from app.services.fpg_http_client import FpgHttpClient
+from app.services.request_policy import RateLimiter
+
+
+class _FakeClient(FpgHttpClient):
+    def __init__(self) -> None:
+        super().__init__(rate_limiter=RateLimiter(0))
+        self.active = 0
+        self.peak = 0
+
+    async def enrich_case(self, base: CaseRecord) -> CaseRecord:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            # 各案耗時不同，輸出仍照輸入順序
+            await asyncio.sleep(0.01 * (10 - int(base.inqcnt)))
+            if base.tndsalno == "01-BOOM":
+                raise RuntimeError("boom")
+            base.status = "new"
+            return base
+        finally:
+            self.active -= 1
+
+
+def test_fetch_cases_runs_one_case_at_a_time_and_isolates_errors() -> None:
+    bases = [
+        CaseRecord(tndsalno="01-BOOM" if i == 3 else f"01-UT{i}", inqcnt=f"{i:02d}")
+        for i in range(1, 9)
+    ]
+    client = _FakeClient()
+    records = asyncio.run(client.fetch_cases(bases, delay_seconds=0))
+    assert [r.inqcnt for r in records] == [b.inqcnt for b in bases]
+    # 報價單表單狀態綁在 session：同一 session 不可交錯兩案
+    assert client.peak == 1
+    assert records[2].status == "error" and "boom" in records[2].error
+    assert all(r.status == "new" for i, r in enumerate(records) if i != 2)
+
+
+def test_rate_limiter_spaces_shared_requests() -> None:
+    limiter = RateLimiter(50)
+
+    async def burst() -> float:
+        started = time.monotonic()
+        await asyncio.gather(*(limiter.acquire() for _ in range(6)))
+        return time.monotonic() - started
+
+    # 6 次取得 → 至少 5 個 20ms 間隔
+    assert asyncio.run(burst()) >= 0.09
@@ -0,0 +1,70 @@
+"""逐日回填：shard 切分、併發分派與 checkpoint 接續；不需網路。"""
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from app.services.fpg_backfill import BackfillCheckpoint, day_shards, run_day_shards
+from app.services.fpg_session_pool import FpgSessionPool
+from app.services.request_policy import CircuitOpenError
+
+
+def test_day_shards_inclusive_and_across_months() -> None:
+    assert day_shards("2026/07/30", "2026/08/02") == [
+        "2026/07/30",
+        "2026/07/31",
+        "2026/08/01",
+        "2026/08/02",
+    ]
+    assert day_shards("2026/07/22", "2026/07/22") == ["2026/07/22"]
+    assert day_shards("2026/07/23", "2026/07/22") == ["2026/07/22", "2026/07/23"]
+
+
+def test_run_day_shards_resumes_and_checkpoints(tmp_path: Path) -> None:
+    path = tmp_path / "backfill.json"
+    BackfillCheckpoint(path).mark_done("2026/07/01")
+    days = day_shards("2026/07/01", "2026/07/05")
+    pool = FpgSessionPool(2, use_session_cache=False)
+    active = {"now": 0, "peak": 0}
+    seen: list[str] = []
+
+    async def process_day(client, day: str):
+        active["now"] += 1
+        active["peak"] = max(active["peak"], active["now"])
+        try:
+            await asyncio.sleep(0.01)
+            seen.append(day)
+            if day == "2026/07/03":
+                raise RuntimeError("boom")
+            # 07/04 有失敗案件：回傳結果但不標記完成
+            return f"records-{day}", day != "2026/07/04"
+        finally:
+            active["now"] -= 1
+
+    checkpoint = BackfillCheckpoint(path)
+    results = asyncio.run(
+        run_day_shards(pool, days, process_day, checkpoint=checkpoint)
+    )
+
+    assert "2026/07/01" not in seen
+    assert active["peak"] == 2
+    assert list(results) == ["2026/07/02", "2026/07/04", "2026/07/05"]
+    assert BackfillCheckpoint(path).pending(days) == ["2026/07/03", "2026/07/04"]
+
+
+def test_run_day_shards_aborts_when_breaker_gives_up(tmp_path: Path) -> None:
+    days = day_shards("2026/07/01", "2026/07/05")
+    pool = FpgSessionPool(1, use_session_cache=False)
+    seen: list[str] = []
+
+    async def process_day(client, day: str):
+        seen.append(day)
+        raise CircuitOpenError("站台連續 3 次斷路仍未恢復")
+
+    checkpoint = BackfillCheckpoint(tmp_path / "backfill.json")
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(run_day_shards(pool, days, process_day, checkpoint=checkpoint))
+    assert seen == ["2026/07/01"]
+    assert checkpoint.pending(days) == days
@@ -0,0 +1,65 @@
+"""FPG 登入 session 快取：cookie 存取與登入頁判定，不需網路。"""
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+
+import aiohttp
+from yarl import URL
+
+from app.services.fpg_parser import is_login_page
+from app.services.fpg_session_cache import (
+    FpgSessionCache,
+    dump_cookies,
+    restore_cookies,
+)
+from app.services.fpg_urls import fpg_base_url
+
+
+async def _round_trip(cache: FpgSessionCache) -> str:
+    jar = aiohttp.CookieJar(unsafe=True)
+    jar.update_cookies(
+        {"JSESSIONID": "abc123"}, response_url=URL(fpg_base_url() + "/j202/")
+    )
+    cache.save(dump_cookies(jar))
+
+    fresh = aiohttp.CookieJar(unsafe=True)
+    cookies = cache.load()
+    assert cookies
+    restore_cookies(fresh, cookies, response_url=fpg_base_url())
+    sent = fresh.filter_cookies(URL(fpg_base_url() + "/j202/prc/x.jsp"))
+    return sent["JSESSIONID"].value
+
+
+def test_file_cache_round_trip(tmp_path: Path) -> None:
+    cache = FpgSessionCache(tmp_path / "session.json", username="u1")
+    assert asyncio.run(_round_trip(cache)) == "abc123"
+    assert cache.path and cache.path.is_file()
+
+
+def test_memory_cache_round_trip() -> None:
+    cache = FpgSessionCache(None, username="mem-user")
+    try:
+        assert asyncio.run(_round_trip(cache)) == "abc123"
+    finally:
+        cache.clear()
+    assert cache.load() is None
+
+
+def test_cache_rejects_expired_or_other_account(tmp_path: Path) -> None:
+    path = tmp_path / "session.json"
+    FpgSessionCache(path, username="u1").save([{"name": "a", "value": "b"}])
+    assert FpgSessionCache(path, username="u2").load() is None
+
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    payload["saved_at"] -= 7200
+    path.write_text(json.dumps(payload), encoding="utf-8")
+    assert FpgSessionCache(path, username="u1", max_age_seconds=3600).load() is None
+
+
+def test_is_login_page() -> None:
+    form = '<input name="id"><input name="passwd"><input name="vcode">'
+    assert is_login_page(form)
+    assert is_login_page("", "https://x/j202/mgt/mgt_logon.jsp")
+    assert not is_login_page("<td>標售公報</td>", "https://x/j202/prc/prc_anno_comp_srh.jsp")
@@ -0,0 +1,204 @@
+"""多 session pool：案件分派與登入失敗隔離，不需網路。"""
+from __future__ import annotations
+
+import asyncio
+
+from app.models.case_record import CaseRecord
+from app.services.attachment_store import AttachmentStore
+from app.services.fpg_session_pool import FpgSessionPool
+from app.services.request_policy import RateLimiter
+
+
+def _pool(size: int) -> FpgSessionPool:
+    return FpgSessionPool(size, rate_limiter=RateLimiter(0), use_session_cache=False)
+
+
+def test_pool_spreads_cases_one_per_session_and_keeps_order() -> None:
+    pool = _pool(3)
+    busy: dict[int, int] = {}
+    handled_by: dict[str, int] = {}
+
+    for slot, client in enumerate(pool.clients):
+
+        async def enrich(base: CaseRecord, slot: int = slot) -> CaseRecord:
+            busy[slot] = busy.get(slot, 0) + 1
+            # 同一 session 不可同時跑兩案（表單狀態會互相覆蓋）
+            assert busy[slot] == 1
+            await asyncio.sleep(0.01)
+            busy[slot] -= 1
+            handled_by[base.tndsalno] = slot
+            return base
+
+        client.enrich_case = enrich
+
+    bases = [CaseRecord(tndsalno=f"01-UT{i}", inqcnt="01") for i in range(9)]
+    records = asyncio.run(pool.fetch_cases(bases))
+    assert [r.tndsalno for r in records] == [b.tndsalno for b in bases]
+    assert set(handled_by.values()) == {0, 1, 2}
+
+
+def test_login_all_drops_failed_secondary_sessions() -> None:
+    pool = _pool(3)
+
+    async def ok() -> bool:
+        return False
+
+    async def fail() -> bool:
+        raise RuntimeError("驗證碼重試耗盡")
+
+    pool.clients[0].ensure_login = ok
+    pool.clients[1].ensure_login = fail
+    pool.clients[2].ensure_login = ok
+    survivor = pool.clients[2]
+    asyncio.run(pool.login_all())
+    assert pool.clients == [pool.primary, survivor]
+
+
+def test_claim_and_fetch_overlaps_go_save_with_enrichment(monkeypatch) -> None:
+    monkeypatch.setattr("app.services.fpg_session_pool.CLAIM_BATCH_PAUSE", 0)
+    pool = _pool(2)
+    primary = pool.primary
+    events: list[str] = []
+    bases = [CaseRecord(tndsalno=f"01-UT{i}", inqcnt="01") for i in range(4)]
+    # 01-UT0 已選取；其餘三案分三批 goSave
+    selectable = [(f"B{i}", f"01-UT{i}", "01") for i in range(1, 4)]
+
+    async def plan_claims(start, end, *, allowed_keys, snapshot=None):
+        assert allowed_keys == {(b.tndsalno, b.inqcnt) for b in bases}
+        return object(), selectable
+
+    async def claim_batch(snapshot, batch):
+        await asyncio.sleep(0.03)
+        events.append(f"claimed {batch[0][1]}")
+
+    primary.plan_claims = plan_claims
+    primary.claim_batch = claim_batch
+    for client in pool.clients:
+
+        async def enrich(base: CaseRecord) -> CaseRecord:
+            events.append(f"enrich {base.tndsalno}")
+            await asyncio.sleep(0.005)
+            base.status = "new"
+            return base
+
+        client.enrich_case = enrich
+
+    records, claimed = asyncio.run(
+        pool.claim_and_fetch("2026/07/22", "2026/07/22", bases, batch_size=1)
+    )
+    assert [r.tndsalno for r in records] == [b.tndsalno for b in bases]
+    assert claimed == selectable
+    # 已選取案先擷取；第一批轉報價完成後，不必等最後一批就開始擷取
+    assert events[0] == "enrich 01-UT0"
+    assert events.index("enrich 01-UT1") < events.index("claimed 01-UT3")
+
+
+def test_pool_clients_share_one_attachment_index(tmp_path) -> None:
+    pool = FpgSessionPool(
+        2, rate_limiter=RateLimiter(0), use_session_cache=False, download_dir=tmp_path
+    )
+    first, second = pool.clients
+    assert first.attachment_store is second.attachment_store
+
+    # 兩個 session 各下載一個附件，索引都要留下
+    for client, name in ((first, "a"), (second, "b")):
+        url = f"https://x.test/{name}.ZIP"
+        tmp = client.attachment_store.temp_path(name)
+        tmp.write_bytes(url.encode())
+        client.attachment_store.commit(url, tmp, sha256=name * 64, size=len(url))
+
+    reloaded = AttachmentStore(tmp_path / "store")
+    assert reloaded.lookup_sha("https://x.test/a.ZIP") == "a" * 64
+    assert reloaded.lookup_sha("https://x.test/b.ZIP") == "b" * 64
+
+
+def _track_claims_and_enrichment(pool: FpgSessionPool, selectable, events: list):
+    """goSave 期間主 session 若有擷取就記下 "primary enrich during claim"。"""
+    primary = pool.primary
+    in_flight = False
+
+    async def plan_claims(start, end, *, allowed_keys, snapshot=None):
+        return object(), selectable
+
+    async def claim_batch(snapshot, batch):
+        nonlocal in_flight
+        in_flight = True
+        await asyncio.sleep(0.02)
+        in_flight = False
+        events.append(f"claimed {batch[0][1]}")
+
+    primary.plan_claims = plan_claims
+    primary.claim_batch = claim_batch
+    for client in pool.clients:
+
+        async def enrich(base: CaseRecord, client=client) -> CaseRecord:
+            if client is primary and in_flight:
+                events.append("primary enrich during claim")
+            events.append(f"enrich {base.tndsalno}")
+            await asyncio.sleep(0.005)
+            return base
+
+        client.enrich_case = enrich
+
+
+def test_primary_does_not_enrich_while_claiming(monkeypatch) -> None:
+    monkeypatch.setattr("app.services.fpg_session_pool.CLAIM_BATCH_PAUSE", 0)
+    pool = _pool(2)
+    events: list[str] = []
+    bases = [CaseRecord(tndsalno=f"01-UT{i}", inqcnt="01") for i in range(8)]
+    selectable = [(f"B{i}", f"01-UT{i}", "01") for i in range(4, 8)]
+    _track_claims_and_enrichment(pool, selectable, events)
+
+    records, _ = asyncio.run(
+        pool.claim_and_fetch("2026/07/22", "2026/07/22", bases, batch_size=1)
+    )
+    assert [r.tndsalno for r in records] == [b.tndsalno for b in bases]
+    assert "primary enrich during claim" not in events
+    # 第二個 session 仍與 goSave 重疊
+    assert events.index("enrich 01-UT0") < events.index("claimed 01-UT4")
+
+
+def test_single_session_claims_everything_before_fetching(monkeypatch) -> None:
+    monkeypatch.setattr("app.services.fpg_session_pool.CLAIM_BATCH_PAUSE", 0)
+    pool = _pool(1)
+    events: list[str] = []
+    bases = [CaseRecord(tndsalno=f"01-UT{i}", inqcnt="01") for i in range(4)]
+    selectable = [(f"B{i}", f"01-UT{i}", "01") for i in range(2, 4)]
+    _track_claims_and_enrichment(pool, selectable, events)
+
+    records, claimed = asyncio.run(
+        pool.claim_and_fetch("2026/07/22", "2026/07/22", bases, batch_size=1)
+    )
+    assert [r.tndsalno for r in records] == [b.tndsalno for b in bases]
+    assert claimed == selectable
+    assert events[:2] == ["claimed 01-UT2", "claimed 01-UT3"]
+    assert sorted(events[2:]) == [f"enrich 01-UT{i}" for i in range(4)]
+
+
+def test_claim_keys_are_claimed_but_not_fetched(monkeypatch) -> None:
+    monkeypatch.setattr("app.services.fpg_session_pool.CLAIM_BATCH_PAUSE", 0)
+    pool = _pool(2)
+    events: list[str] = []
+    bases = [CaseRecord(tndsalno="01-UT1", inqcnt="01")]
+    # 01-UT9 為差異模式未變更的案：只轉報價
+    selectable = [("B1", "01-UT1", "01"), ("B9", "01-UT9", "01")]
+    _track_claims_and_enrichment(pool, selectable, events)
+
+    records, claimed = asyncio.run(
+        pool.claim_and_fetch(
+            "2026/07/22", "2026/07/22", bases, claim_keys=[("01-UT9", "01")]
+        )
+    )
+    assert [r.tndsalno for r in records] == ["01-UT1"]
+    assert claimed == selectable
+    assert "enrich 01-UT9" not in events
+
+
+def test_archive_concurrency_opens_one_session_per_worker(monkeypatch) -> None:
+    from app.scripts.run_archive import _session_count, parse_args
+
+    monkeypatch.setattr("app.core.config.settings.FPG_SESSION_POOL_SIZE", 1)
+    monkeypatch.setattr("app.core.config.settings.FPG_ENRICH_CONCURRENCY", 1)
+    assert _session_count(parse_args([])) == 1
+    assert _session_count(parse_args(["--concurrency", "4"])) == 4
+    assert _session_count(parse_args(["--concurrency", "2", "--sessions", "3"])) == 3
@@ -0,0 +1,63 @@
+"""原始 HTML 快照：gzip 去重、索引、案號 contextvar 與表單欄位過濾；不需網路。"""
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.services.fpg_http_client import FpgHttpClient
+from app.services.html_snapshot_store import HtmlSnapshotStore, snapshot_case
+from app.services.request_policy import RateLimiter
+
+PAGE = "<html>" + "標售公報 廢鐵 10 噸 " * 200 + "</html>"
+
+
+def test_record_dedups_blobs_and_indexes_every_request(tmp_path: Path) -> None:
+    store = HtmlSnapshotStore(tmp_path, run_id="r1")
+    with snapshot_case("01-UT1/01"):
+        store.record(source="fpg", endpoint="Cj202c13", url="u1", status=200, html=PAGE)
+    store.record(
+        source="fpg",
+        endpoint="Cj202c12",
+        url="u2",
+        status=200,
+        html=PAGE,
+        method="POST",
+        form={"BTN": "goPage", "page": "2", "passwd": "secret"},
+    )
+
+    blobs = list((tmp_path / "blobs").rglob("*.html.gz"))
+    assert len(blobs) == 1
+    assert blobs[0].stat().st_size < len(PAGE.encode("utf-8")) / 5
+
+    entries = list(store.iter_entries())
+    assert [e.case_key for e in entries] == ["01-UT1/01", ""]
+    assert entries[1].form == {"BTN": "goPage", "page": "2"}
+    assert store.read(entries[0].sha256) == PAGE
+    assert store.run_ids() == ["r1"]
+
+
+def test_client_snapshots_fetched_pages(tmp_path: Path) -> None:
+    async def handler(_request: web.Request) -> web.Response:
+        return web.Response(text=PAGE, content_type="text/html", charset="utf-8")
+
+    app = web.Application()
+    app.router.add_post("/j202/servlet/com.fpg.j202.Cj202c13", handler)
+    store = HtmlSnapshotStore(tmp_path, run_id="r2")
+
+    async def run() -> None:
+        async with TestServer(app) as server:
+            async with FpgHttpClient(rate_limiter=RateLimiter(0), snapshots=store) as client:
+                with snapshot_case("01-UT2/03"):
+                    await client._post_form(
+                        str(server.make_url("/j202/servlet/com.fpg.j202.Cj202c13")),
+                        {"BTN": "goList", "tndsalno": "01-UT2"},
+                        referer="x",
+                    )
+
+    asyncio.run(run())
+    (entry,) = list(store.iter_entries())
+    assert (entry.endpoint, entry.method, entry.case_key) == ("Cj202c13", "POST", "01-UT2/03")
+    assert entry.form == {"BTN": "goList", "tndsalno": "01-UT2"}
@@ -0,0 +1,130 @@
+"""HTTP cassette 錄製／重播：本機 TestServer 錄製，重播時完全不連線。"""
+from __future__ import annotations
+
+import asyncio
+from datetime import date
+from pathlib import Path
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.services import pcc_http_client
+from app.services.http_cassette import Cassette, CassetteMiss, request_key, use_cassette
+from app.services.http_connector import create_session
+from app.services.pcc_http_client import PccHttpClient
+
+
+@pytest.fixture(autouse=True)
+def _reset_cassette():
+    yield
+    use_cassette(None)
+
+
+def test_request_key_ignores_credentials_and_volatile_params() -> None:
+    a = request_key("post", "https://x.test/login?rrr=1", data={"passwd": "a", "BTN": "go"})
+    b = request_key("POST", "https://x.test/login?rrr=2", data={"passwd": "b", "BTN": "go"})
+    assert a == b == "POST https://x.test/login BTN=go"
+
+
+def test_record_then_replay_without_server(tmp_path: Path) -> None:
+    path = tmp_path / "cassette.json"
+    hits: list[str] = []
+
+    async def page(request: web.Request) -> web.Response:
+        hits.append(request.method)
+        form = await request.post()
+        return web.Response(
+            text=f"<html>第 {request.query.get('page', form.get('page'))} 頁</html>",
+            content_type="text/html",
+            charset="big5",
+        )
+
+    app = web.Application()
+    app.router.add_route("*", "/list", page)
+
+    async def record() -> str:
+        use_cassette(Cassette(path, mode="record"))
+        async with TestServer(app) as server:
+            session = create_session(total_timeout=10)
+            try:
+                async with session.get(server.make_url("/list"), params={"page": "1", "_csrf": "t"}):
+                    pass
+                async with session.post(
+                    server.make_url("/list"), data={"page": "2", "passwd": "secret"}
+                ):
+                    pass
+            finally:
+                await session.close()
+            return str(server.make_url("/list"))
+
+    url = asyncio.run(record())
+    assert hits == ["GET", "POST"]
+    assert "secret" not in path.read_text(encoding="utf-8")
+
+    async def replay() -> tuple[int, str, str]:
+        use_cassette(Cassette(path, mode="replay"))
+        session = create_session(total_timeout=10)
+        try:
+            async with session.post(url, data={"page": "2", "passwd": "other"}) as resp:
+                return resp.status, resp.charset, await resp.text()
+        finally:
+            await session.close()
+
+    assert asyncio.run(replay()) == (200, "big5", "<html>第 2 頁</html>")
+    assert hits == ["GET", "POST"]
+
+    async def miss() -> None:
+        use_cassette(Cassette(path, mode="replay"))
+        session = create_session(total_timeout=10)
+        try:
+            async with session.get(url, params={"page": "9"}):
+                pass
+        finally:
+            await session.close()
+
+    with pytest.raises(CassetteMiss):
+        asyncio.run(miss())
+
+
+def test_pcc_client_records_and_replays_end_to_end(tmp_path: Path, monkeypatch) -> None:
+    search_html = (
+        "<p>共有 1 筆資料</p><table><tr><td>1</td><td>臺北市政府</td><td>A-1</td>"
+        "<td>1</td><td>電腦</td><td>115/07/20</td>"
+        "<td><a onclick=\"formViewOld(778,'x')\">檢視</a></td></tr></table>"
+    )
+    pages = {
+        "/index": '<input name="_csrf" value="tok">',
+        "/read": search_html,
+        "/detailNew": "<table><tr><th>財物名稱</th><td>報廢電腦</td></tr></table>",
+    }
+
+    async def handler(request: web.Request) -> web.Response:
+        return web.Response(text=pages[request.path], content_type="text/html", charset="utf-8")
+
+    app = web.Application()
+    app.router.add_route("*", "/{name}", handler)
+    path = tmp_path / "pcc.json"
+
+    async def archive(mode: str):
+        use_cassette(Cassette(path, mode=mode))
+        async with PccHttpClient(request_pause=0) as pcc:
+            bases = await pcc.search_by_announce_date(date(2026, 7, 20), date(2026, 7, 20))
+            return await pcc.fetch_cases(bases)
+
+    async def record():
+        async with TestServer(app) as server:
+            monkeypatch.setattr(pcc_http_client, "INDEX", str(server.make_url("/index")))
+            monkeypatch.setattr(pcc_http_client, "SEARCH", str(server.make_url("/read")))
+            monkeypatch.setitem(
+                pcc_http_client.DETAIL_BY_KIND, "new", str(server.make_url("/detailNew"))
+            )
+            return await archive("record")
+
+    recorded = asyncio.run(record())
+    # 伺服器已關閉：重播結果須與錄製時相同
+    replayed = asyncio.run(archive("replay"))
+    assert recorded == replayed
+    (record,) = replayed
+    assert (record.pk, record.assets_name, record.detail_kind) == ("778", "報廢電腦", "new")
+    assert record.status == "ok"
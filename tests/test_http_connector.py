@@ -0,0 +1,87 @@
+"""連線池設定與共用 connector：不需網路。"""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.scripts import run_archive, run_pcc_archive
+from app.services import http_connector
+from app.services.fpg_http_client import FpgHttpClient
+from app.services.fpg_session_pool import FpgSessionPool
+from app.services.http_connector import build_connector, create_session
+from app.services.pcc_http_client import PccHttpClient
+
+
+def test_session_uses_configured_timeouts_and_limits() -> None:
+    async def run() -> None:
+        session = create_session(total_timeout=42)
+        try:
+            assert session.timeout.total == 42
+            assert session.timeout.connect == settings.HTTP_CONNECT_TIMEOUT
+            assert session.timeout.sock_read == settings.HTTP_READ_TIMEOUT
+            assert session.connector.limit_per_host == settings.HTTP_LIMIT_PER_HOST
+        finally:
+            await session.close()
+        assert session.connector is None or session.connector.closed
+
+    asyncio.run(run())
+
+
+def test_fpg_and_pcc_share_connector_without_closing_it() -> None:
+    async def run() -> None:
+        connector = build_connector()
+        async with FpgHttpClient(connector=connector) as fpg, PccHttpClient(
+            connector=connector
+        ) as pcc:
+            assert fpg.session.connector is connector
+            assert pcc.session.connector is connector
+        assert not connector.closed
+        await connector.close()
+
+    asyncio.run(run())
+
+
+def test_share_connector_setting(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "HTTP_SHARE_CONNECTOR", True)
+
+    async def run() -> None:
+        async with FpgHttpClient() as fpg, PccHttpClient() as pcc:
+            assert fpg.session.connector is pcc.session.connector
+            shared = fpg.session.connector
+        assert not shared.closed
+        await http_connector.close_shared_connector()
+        assert shared.closed
+
+    asyncio.run(run())
+
+
+def test_pool_sessions_share_one_connector() -> None:
+    async def run() -> None:
+        pool = FpgSessionPool(2, use_session_cache=False)
+        async with pool:
+            first, second = (client.session.connector for client in pool.clients)
+            assert first is second
+        assert first.closed
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize(
+    "module, name",
+    [(run_archive, "run_archive"), (run_pcc_archive, "run_pcc_archive")],
+)
+def test_archive_scripts_close_shared_connector(monkeypatch, module, name) -> None:
+    monkeypatch.setattr(settings, "HTTP_SHARE_CONNECTOR", True)
+    opened = []
+
+    async def body(args) -> int:
+        async with PccHttpClient() as pcc:
+            opened.append(pcc.session.connector)
+        raise RuntimeError("歸檔中斷")
+
+    monkeypatch.setattr(module, f"_{name}", body)
+    with pytest.raises(RuntimeError):
+        asyncio.run(getattr(module, name)(None))
+    assert opened[0].closed
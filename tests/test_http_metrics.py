@@ -0,0 +1,75 @@
+"""請求量測：endpoint 命名、直方圖與 JSON 輸出；本機 test server，不需網路。"""
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.services.fpg_http_client import FpgHttpClient
+from app.services.http_metrics import HttpMetrics, endpoint_label
+from app.services.request_policy import CircuitBreaker, RateLimiter, RetryPolicy
+
+
+def test_endpoint_label() -> None:
+    base = "https://fpg.example.test"
+    assert endpoint_label(f"{base}/j202/servlet/com.fpg.j202.Cj202c12") == "Cj202c12"
+    assert endpoint_label(f"{base}/j202/share/j202_download/A/01-UT.ZIP") == "j202_download"
+    assert (
+        endpoint_label(f"{base}/j202/cmp/prc_bid_gen_srh.jsp?x=1")
+        == "cmp/prc_bid_gen_srh.jsp"
+    )
+
+
+def test_metrics_histogram_and_summary(tmp_path: Path) -> None:
+    metrics = HttpMetrics()
+    metrics.observe("Cj202c12", seconds=0.03, status=200, nbytes=100)
+    metrics.observe("Cj202c12", seconds=0.4, status=200, nbytes=300)
+    metrics.observe("Cj202c12", seconds=45.0, status=None)
+    metrics.record_retry("Cj202c12")
+
+    path = metrics.write(tmp_path / "fpg_metrics.json", announce="2026/07/22")
+    data = json.loads(path.read_text(encoding="utf-8"))
+    stats = data["endpoints"]["Cj202c12"]
+    assert data["announce"] == "2026/07/22"
+    assert (data["requests"], data["errors"], data["retries"], data["bytes"]) == (3, 1, 1, 400)
+    assert stats["statuses"] == {"200": 2, "error": 1}
+    assert stats["latency_histogram"]["le_50ms"] == 1
+    assert stats["latency_histogram"]["le_500ms"] == 1
+    assert stats["latency_histogram"]["+Inf"] == 1
+    assert stats["p50_ms"] == 500.0
+    assert stats["max_ms"] == 45000.0
+
+
+def test_client_records_retries_and_bytes() -> None:
+    hits = [0]
+
+    async def handler(_request: web.Request) -> web.Response:
+        hits[0] += 1
+        if hits[0] == 1:
+            return web.Response(status=503)
+        return web.Response(text="標售公報")
+
+    app = web.Application()
+    app.router.add_get("/j202/servlet/com.fpg.j202.Cj202c12", handler)
+
+    async def run() -> HttpMetrics:
+        metrics = HttpMetrics()
+        async with TestServer(app) as server:
+            async with FpgHttpClient(
+                rate_limiter=RateLimiter(0),
+                retry_policy=RetryPolicy(attempts=2, backoff_initial=0.01, jitter=0),
+                circuit_breaker=CircuitBreaker(failure_threshold=0),
+                metrics=metrics,
+            ) as client:
+                await client._get(
+                    str(server.make_url("/j202/servlet/com.fpg.j202.Cj202c12"))
+                )
+        return metrics
+
+    stats = asyncio.run(run()).summary()["endpoints"]["Cj202c12"]
+    assert stats["count"] == 2 and stats["retries"] == 1
+    assert stats["statuses"] == {"200": 1, "503": 1}
+    assert stats["bytes"] == len("標售公報".encode("utf-8"))
@@ -0,0 +1,27 @@
+"""詢價單欄位：有編號標籤優先，沒有時退回不帶編號的標籤。"""
+from __future__ import annotations
+
+from app.models.case_record import CaseRecord
+from app.services.fpg_parser import parse_inquiry_form
+
+INQUIRY = (
+    "<font>標售案號/詢價次數： 01-UT0001/02</font>"
+    '<input type="hidden" name="blocid" value="B00001">'
+    "<font>二、委託公司：台灣塑膠</font>"
+    '<font>委託部門：</font></td>\n <td width="30%"><font size="2">麥寮廠 採購組</font>'
+    "<font>存放地點：麥寮</font>"
+    "<font>四、公告日：2026/7/20</font>"
+    "<font>報價截止日：2026/07/27</font>"
+    "<font>提貨期限：30 日內</font>"
+    '<font>廠區</font></td> <td><font size="2">王小明</font></td>\n'
+    ' <td><font size="2">聯絡電話</font></td> <td><font size="2">05-6811234</font>'
+)
+
+
+def test_parse_inquiry_form_fields() -> None:
+    record = parse_inquiry_form(INQUIRY, CaseRecord(tndsalno="", inqcnt=""))
+    assert (record.tndsalno, record.inqcnt, record.blocid) == ("01-UT0001", "02", "B00001")
+    assert (record.company, record.department, record.location) == ("台灣塑膠", "麥寮廠 採購組", "麥寮")
+    assert (record.announce_date, record.quote_deadline) == ("2026-07-20", "2026-07-27")
+    assert record.pickup_period == "30 日內"
+    assert (record.plant_contact, record.plant_phone) == ("王小明", "05-6811234")
@@ -0,0 +1,82 @@
+"""HTML 解析執行器：inline／thread／process 結果一致，thread 模式解析時 event loop 不被卡住。"""
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import asdict
+
+import pytest
+
+from app.models.case_record import CaseRecord
+from app.services.bulletin_snapshot import BulletinPage
+from app.services.fpg_http_client import _parse_case_forms
+from app.services.parse_executor import ParseExecutor
+from app.services.pcc_http_client import _parse_search_page
+from tests.test_bulletin_parser_equivalence import synthetic_bulletin_page
+from tests.test_quote_form_parser import synthetic_quote_page
+
+SEARCH = (
+    "<p>共有 2 筆資料</p><table><tr><td>1</td><td>臺北市政府</td><td>A-1</td>"
+    "<td>1</td><td>電腦</td><td>115/07/20</td>"
+    "<td><a onclick=\"formViewOld(778,'x')\">檢視</a></td></tr></table>"
+)
+
+
+def _run(executor: ParseExecutor, func, *args):
+    async def go():
+        try:
+            return await executor.run(func, *args)
+        finally:
+            executor.shutdown()
+
+    return asyncio.run(go())
+
+
+def test_rejects_unknown_mode() -> None:
+    with pytest.raises(ValueError):
+        ParseExecutor("fork")
+
+
+@pytest.mark.parametrize("mode", ["inline", "thread", "process"])
+def test_client_parse_jobs_match_direct_call(mode: str) -> None:
+    bulletin = synthetic_bulletin_page(7)
+    quote = synthetic_quote_page(3)
+    executor = ParseExecutor(mode, workers=2)
+
+    page = _run(executor, BulletinPage.parse, 3, bulletin)
+    assert asdict(page) == asdict(BulletinPage.parse(3, bulletin))
+
+    record = _run(executor, _parse_case_forms, quote, quote, CaseRecord("01-UT1", "01"))
+    expected = _parse_case_forms(quote, quote, CaseRecord("01-UT1", "01"))
+    assert asdict(record) == asdict(expected)
+
+    total, records, pages = _run(executor, _parse_search_page, SEARCH)
+    assert (total, [r.pk for r in records], pages) == (2, ["778"], [])
+
+
+@pytest.mark.parametrize("mode, blocked", [("inline", True), ("thread", False)])
+def test_event_loop_keeps_running_while_parsing(mode: str, blocked: bool) -> None:
+    executor = ParseExecutor(mode, workers=1)
+
+    async def go() -> int:
+        ticks = 0
+        done = asyncio.Event()
+
+        async def heartbeat() -> None:
+            nonlocal ticks
+            while not done.is_set():
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(heartbeat())
+        await asyncio.sleep(0)
+        before = ticks
+        await executor.run(time.sleep, 0.2)
+        during = ticks - before
+        done.set()
+        await task
+        executor.shutdown()
+        return during
+
+    during = asyncio.run(go())
+    assert (during == 0) is blocked
@@ -0,0 +1,81 @@
+"""改寫後的 parse_quote_form 與舊版等價：隨機報價明細頁（缺欄、註解、非 <> 品名、報價說明後殘段）。"""
+from __future__ import annotations
+
+import random
+from dataclasses import asdict
+
+import pytest
+
+from app.models.case_record import CaseRecord
+from app.services.fpg_parser import parse_quote_form
+from tests.legacy_quote_parser import parse_quote_form as legacy_parse
+
+
+def _quote_item(rng: random.Random, no: int) -> str:
+    name = rng.choice(["&lt;廢鐵 HMS&gt;", "<廢銅線>", "&lt;廢塑膠 PP&gt;", "廢木材（無括號）"])
+    parts = [
+        f'<tr><td colspan="6"><font size="2">材料編號:M{no:05d}<br>\n  {name}'
+        f"{rng.choice(['', ' ', chr(10)])}</font></td></tr>"
+    ]
+    if rng.random() < 0.85:
+        parts.append(
+            '<tr><td><div align="center"><font size="2">標售數量</font></div>\n </td>'
+            '<td><div align="center"><font size="2">單位</font></div></td></tr>'
+        )
+        if rng.random() < 0.3:
+            parts.append("<!-- 數量列 -->")
+        if rng.random() < 0.9:
+            parts.append(
+                '<tr>\n <td width="10%"><div align="center"><font size="2">'
+                f"{rng.choice(['10 噸', '1,200 KG', '3 批', '&nbsp;5 只'])}</font></div></td></tr>"
+            )
+    if rng.random() < 0.7:
+        note = rng.choice(["含雜質 5% 以下", "需自備機具", "&lt;依現況&gt;"])
+        parts.append(f'<tr><td><font size="2">品質說明</font><font color="blue">：{note}</font></td></tr>')
+    if rng.random() < 0.15:
+        filler = [
+            "<tr></tr>",
+            "</tr><!-- 空列 -->x",
+            "</tr>\n<!-- a --> <!-- b -->",
+            "</tr> <tr><td>",
+            '<!-- c --> <tr><td><div align="center"><font size="2">7 件</font>',
+        ]
+        parts.append("".join(rng.choice(filler) for _ in range(rng.randint(1, 50))))
+    return "\n".join(parts)
+
+
+def synthetic_quote_page(seed: int) -> str:
+    rng = random.Random(seed)
+    items = [_quote_item(rng, no) for no in range(1, rng.randint(1, 30))]
+    if rng.random() < 0.3:
+        items.insert(rng.randrange(len(items) + 1), "<font>八、報價說明</font>")
+    return (
+        "<html><font>四、廠商配合事項：自行清運</font><font>五、環保代碼：D-0299</font>"
+        "<font>七、報價明細</font><table>" + "\n".join(items) + "</table>"
+        + rng.choice(["<font>八、報價說明</font></html>", "</html>", "\n"])
+    )
+
+
+@pytest.mark.parametrize("seed", range(150))
+def test_matches_legacy_parser_on_synthetic_pages(seed: int) -> None:
+    html = synthetic_quote_page(seed)
+    expected = legacy_parse(html, CaseRecord(tndsalno="01-UT1", inqcnt="01"))
+    actual = parse_quote_form(html, CaseRecord(tndsalno="01-UT1", inqcnt="01"))
+    assert asdict(actual) == asdict(expected)
+
+
+def test_quantity_and_quality_stay_within_their_item() -> None:
+    html = (
+        "<font>材料編號:M1<br>&lt;廢鐵&gt;</font>"
+        '<font>品質說明</font><font color="blue">：乾淨</font>'
+        "<font>材料編號:M2<br>&lt;廢銅&gt;</font>"
+        '<div align="center"><font size="2">標售數量</font></div></td></tr>'
+        '<tr><td><div align="center"><font size="2">3 噸</font></div></td></tr>'
+        "<font>八、報價說明</font>"
+        '<font>品質說明</font><font color="blue">：說明段</font>'
+    )
+    record = parse_quote_form(html, CaseRecord(tndsalno="01-UT1", inqcnt="01"))
+    assert [(i.description, i.quantity, i.quality_note) for i in record.items] == [
+        ("<廢鐵>", "", "乾淨"),
+        ("<廢銅>", "3 噸", ""),
+    ]
@@ -0,0 +1,131 @@
+"""重試與斷路器：本機 test server 模擬站台忙碌，不連外網。"""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.models.case_record import CaseRecord
+from app.services.fpg_http_client import FpgHttpClient
+from app.services.fpg_session_pool import FpgSessionPool
+from app.services.request_policy import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RateLimiter,
+    RetryPolicy,
+    TransientStatusError,
+)
+
+FAST_RETRY = RetryPolicy(attempts=3, backoff_initial=0.01, backoff_max=0.02, jitter=0)
+
+
+def _flaky_app(failures: int) -> tuple[web.Application, list[int]]:
+    hits = [0]
+
+    async def handler(_request: web.Request) -> web.Response:
+        hits[0] += 1
+        if hits[0] <= failures:
+            return web.Response(status=503)
+        return web.Response(text="<html>標售公報</html>")
+
+    app = web.Application()
+    app.router.add_route("*", "/page", handler)
+    return app, hits
+
+
+async def _call(failures: int, *, idempotent: bool = True, breaker=None):
+    app, hits = _flaky_app(failures)
+    async with TestServer(app) as server:
+        async with FpgHttpClient(
+            rate_limiter=RateLimiter(0),
+            retry_policy=FAST_RETRY,
+            circuit_breaker=breaker or CircuitBreaker(failure_threshold=0),
+        ) as client:
+            try:
+                return await client._request(
+                    "GET", str(server.make_url("/page")), idempotent=idempotent
+                ), hits[0]
+            except Exception as exc:  # noqa: BLE001
+                return exc, hits[0]
+
+
+def test_idempotent_read_retries_transient_status() -> None:
+    (status_html, hits) = asyncio.run(_call(2))
+    assert status_html == (200, "<html>標售公報</html>")
+    assert hits == 3
+
+
+def test_non_idempotent_request_is_sent_once() -> None:
+    exc, hits = asyncio.run(_call(1, idempotent=False))
+    assert isinstance(exc, TransientStatusError) and exc.status == 503
+    assert hits == 1
+
+
+def test_breaker_pauses_then_gives_up_after_max_trips() -> None:
+    breaker = CircuitBreaker(failure_threshold=2, cooldown_seconds=0.05, max_trips=2)
+
+    async def run() -> float:
+        breaker.record_failure()
+        assert not breaker.is_open
+        breaker.record_failure()
+        assert breaker.is_open
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await breaker.wait_until_closed()
+        return loop.time() - started
+
+    assert asyncio.run(run()) >= 0.04
+    breaker.record_failure()
+    breaker.record_failure()
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(breaker.wait_until_closed())
+    breaker.record_success()
+    asyncio.run(breaker.wait_until_closed())
+
+
+def _given_up_breaker() -> CircuitBreaker:
+    breaker = CircuitBreaker(failure_threshold=1, cooldown_seconds=0, max_trips=1)
+    breaker.record_failure()
+    return breaker
+
+
+class _BreakerClient(FpgHttpClient):
+    """每個 channel 嘗試都先經過斷路器（比照 _request）。"""
+
+    def __init__(self, breaker: CircuitBreaker) -> None:
+        super().__init__(rate_limiter=RateLimiter(0), circuit_breaker=breaker)
+        self.attempts = 0
+
+    async def _enrich_via_channel(self, base: CaseRecord, channel: str):
+        self.attempts += 1
+        await self.circuit_breaker.wait_until_closed()
+        return base
+
+
+def test_fetch_cases_aborts_when_breaker_gives_up() -> None:
+    client = _BreakerClient(_given_up_breaker())
+    bases = [CaseRecord(tndsalno=f"01-UT{i}", inqcnt="01") for i in range(3)]
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(client.fetch_cases(bases, delay_seconds=0))
+    # 沒有任何案被改成 error 後繼續往下跑
+    assert all(base.status != "error" for base in bases)
+    assert client.attempts == 1
+
+
+def test_pool_fetch_aborts_when_breaker_gives_up() -> None:
+    breaker = _given_up_breaker()
+    pool = FpgSessionPool(2, rate_limiter=RateLimiter(0), use_session_cache=False)
+    for client in pool.clients:
+        client.circuit_breaker = breaker
+
+        async def enrich_via_channel(base, channel):
+            await breaker.wait_until_closed()
+            return base
+
+        client._enrich_via_channel = enrich_via_channel
+    bases = [CaseRecord(tndsalno=f"01-UT{i}", inqcnt="01") for i in range(4)]
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(pool.fetch_cases(bases))
+    assert all(base.status != "error" for base in bases)
@@ -0,0 +1,64 @@
+"""回應解碼：header／meta／試解判定編碼、記憶 endpoint、解不開時重新偵測。"""
+from __future__ import annotations
+
+from app.services.response_decoder import ResponseDecoder, normalize_encoding
+
+BIG5_PAGE = "<html><body>標售公報 廢鐵 10 噸</body></html>".encode("cp950")
+
+
+def test_normalize_encoding_maps_big5_family() -> None:
+    assert normalize_encoding("Big5") == "cp950"
+    assert normalize_encoding("MS950") == "cp950"
+    assert normalize_encoding("UTF8") == "utf-8"
+    assert normalize_encoding("no-such-codec") is None
+
+
+def test_detects_once_then_reuses_endpoint_encoding() -> None:
+    decoder = ResponseDecoder()
+    assert "標售公報" in decoder.decode("Cj202c12", BIG5_PAGE)
+    assert decoder.known["Cj202c12"] == "cp950"
+    assert "標售公報" in decoder.decode("Cj202c12", BIG5_PAGE)
+    assert decoder.detections == 1
+
+
+def test_header_charset_skips_detection() -> None:
+    decoder = ResponseDecoder()
+    assert "標售公報" in decoder.decode("Cj202c13", BIG5_PAGE, "big5")
+    assert decoder.detections == 0
+    assert decoder.known["Cj202c13"] == "cp950"
+
+
+def test_meta_charset_sniffed() -> None:
+    body = b'<meta http-equiv="Content-Type" content="text/html; charset=big5">' + BIG5_PAGE
+    decoder = ResponseDecoder()
+    assert "廢鐵" in decoder.decode("prc_anno_comp_srh.jsp", body)
+    assert decoder.known["prc_anno_comp_srh.jsp"] == "cp950"
+
+
+def test_falls_back_when_learned_encoding_breaks() -> None:
+    decoder = ResponseDecoder()
+    # 純 ASCII 頁先被判成 UTF-8
+    decoder.decode("Cj202c12", b"<html>ok</html>")
+    assert decoder.known["Cj202c12"] == "utf-8"
+    text = decoder.decode("Cj202c12", BIG5_PAGE)
+    assert "標售公報" in text and "�" not in text
+    assert decoder.fallbacks == 1
+    assert decoder.known["Cj202c12"] == "cp950"
+
+
+# 中間夾一個非法 Big5 位元組（0x80 不是合法前導位元組，UTF-8 也解不開）
+BROKEN_BIG5 = "標售公報".encode("cp950") + b"\x80" + "廢鐵測試".encode("cp950")
+
+
+def test_declared_big5_with_bad_byte_keeps_rest_of_page() -> None:
+    decoder = ResponseDecoder()
+    text = decoder.decode("Cj202c12", BROKEN_BIG5, "big5")
+    assert text.startswith("標售公報")
+    assert text.endswith("廢鐵測試")
+
+
+def test_known_encoding_used_for_lossy_decode_without_header() -> None:
+    decoder = ResponseDecoder({"Cj202c12": "cp950"})
+    text = decoder.decode("Cj202c12", BROKEN_BIG5)
+    assert "標售公報" in text and "廢鐵測試" in text
+    assert decoder.known["Cj202c12"] == "cp950"
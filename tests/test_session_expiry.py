@@ -0,0 +1,87 @@
+"""session 逾時自動重登：single-flight 與重送，不需網路。"""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.services.fpg_http_client import FpgHttpClient, FpgSessionExpired
+from app.services.request_policy import RateLimiter
+
+LOGIN_HTML = '<form><input name="id"><input name="passwd"><input name="vcode"></form>'
+
+
+class _ExpiringClient(FpgHttpClient):
+    def __init__(self, *, login_fixes: bool = True) -> None:
+        super().__init__(rate_limiter=RateLimiter(0))
+        self.logged_in = False
+        self.login_calls = 0
+        self.login_fixes = login_fixes
+        self.sent: list[str] = []
+
+    @property
+    def session(self):  # 只需 cookie_jar.clear()
+        class _Jar:
+            def clear(self) -> None:
+                pass
+
+        class _Session:
+            cookie_jar = _Jar()
+
+        return _Session()
+
+    async def _send(self, method: str, url: str, **kwargs):
+        self.sent.append(url)
+        await asyncio.sleep(0.01)
+        if not self.logged_in:
+            return 200, LOGIN_HTML, "https://x/j202/mgt/mgt_logon.jsp"
+        return 200, f"<html>ok {url}</html>", url
+
+    async def login(self) -> None:
+        self.login_calls += 1
+        await asyncio.sleep(0.02)
+        if not self.login_fixes:
+            raise RuntimeError("FPG 登入失敗：驗證碼重試耗盡")
+        self.logged_in = True
+        self._login_generation += 1
+
+
+def test_concurrent_expiry_triggers_single_relogin_and_replays() -> None:
+    client = _ExpiringClient()
+
+    async def run() -> list[str]:
+        return list(
+            await asyncio.gather(
+                *(client._get(f"https://x/page{i}") for i in range(5))
+            )
+        )
+
+    pages = asyncio.run(run())
+    assert client.login_calls == 1
+    assert pages == [f"<html>ok https://x/page{i}</html>" for i in range(5)]
+
+
+def test_failed_relogin_is_not_retried_by_every_request() -> None:
+    client = _ExpiringClient(login_fixes=False)
+
+    async def run() -> list:
+        return list(
+            await asyncio.gather(
+                *(client._get(f"https://x/page{i}") for i in range(4)),
+                return_exceptions=True,
+            )
+        )
+
+    results = asyncio.run(run())
+    assert client.login_calls == 1
+    assert all(isinstance(r, Exception) for r in results)
+    assert sum(isinstance(r, FpgSessionExpired) for r in results) == 3
+
+
+def test_login_requests_do_not_trigger_relogin() -> None:
+    client = _ExpiringClient(login_fixes=False)
+    html = asyncio.run(client._get("https://x/login", check_session=False))
+    assert html == LOGIN_HTML
+    assert client.login_calls == 0
+    with pytest.raises(RuntimeError):
+        asyncio.run(client._get("https://x/page"))
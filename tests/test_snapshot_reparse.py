@@ -0,0 +1,127 @@
+"""HTML 快照離線重新解析：自快照重建 FPG／PCC 案件，不需網路。"""
+from __future__ import annotations
+
+from pathlib import Path
+
+from app.services.fpg_urls import BID_POST_PATH, BULLETIN_POST_PATH
+from app.services.html_snapshot_store import HtmlSnapshotStore, snapshot_case
+from app.services.snapshot_reparse import latest_run_id, reparse_fpg_run, reparse_pcc_run
+
+CELL = '<td><div align="center"><font size="2">{}</font></div></td>'
+
+
+def _bulletin_row(no: int, tnd: str, desc: str) -> str:
+    return (
+        f'<tr><td width="8%"><div align="center"><font size="2">{no}</font></div></td>'
+        '<td><div align="center"><font size="2">2026/07/20</font></div></td>'
+        + CELL.format("台塑")
+        + CELL.format("10 噸")
+        + f'</tr><tr><td colspan="5"><font size="2">{desc}<br></font></td></tr>'
+        '<tr><td><div align="center"><font size="2">2026/07/25 </font></div></td>'
+        + CELL.format(f"{tnd}/01")
+        + CELL.format("麥寮")
+        + '<td><font size="2">王小明(05-6811234)</font></td></tr>'
+    )
+
+
+BULLETIN = "<table>" + _bulletin_row(1, "01-UT1", "廢鐵") + _bulletin_row(2, "01-UT2", "廢銅") + "</table>"
+GO_LIST = "<a href=\"javascript:goDetail(this.form,'B1','01-UT1','01')\">明細</a>"
+QUOTE = (
+    "<font>二、委託公司：台灣塑膠</font>"
+    "<font>七、報價明細</font>"
+    "<font>材料編號:M001<br>&lt;廢鐵 HMS&gt;</font>"
+    "<font>八、報價說明</font>"
+)
+
+
+def _fpg_run(root: Path) -> HtmlSnapshotStore:
+    store = HtmlSnapshotStore(root, run_id="20260720T080000-fpg")
+    bulletin_url = "https://fpg.example.test" + BULLETIN_POST_PATH
+    bid_url = "https://fpg.example.test" + BID_POST_PATH
+    store.record(
+        source="fpg",
+        endpoint="Cj202c12",
+        url=bulletin_url,
+        status=200,
+        html=BULLETIN,
+        method="POST",
+        form={"BTN": "goList", "page": "1", "date_f": "2026/07/20", "date_e": "2026/07/20"},
+    )
+    with snapshot_case("01-UT1/01"):
+        store.record(source="fpg", endpoint="Cj202c13", url=bid_url, status=200, html=GO_LIST)
+        store.record(source="fpg", endpoint="Cj202c13", url=bid_url, status=200, html=QUOTE)
+    return store
+
+
+def test_reparse_fpg_rebuilds_enriched_cases_only(tmp_path: Path) -> None:
+    store = _fpg_run(tmp_path / "snapshots")
+    assert latest_run_id(store, "fpg") == "20260720T080000-fpg"
+
+    records = reparse_fpg_run(
+        store, "20260720T080000-fpg", workers=2, download_dir=tmp_path / "downloads"
+    )
+
+    # 01-UT2 原執行沒有 enrichment 頁，不重建
+    assert [r.case_key for r in records] == ["01-UT1/01"]
+    (record,) = records
+    assert (record.blocid, record.bid_channel, record.company) == ("B1", "gen", "台灣塑膠")
+    assert record.quote_deadline == "2026-07-25"
+    assert record.announce_date == "2026-07-20"
+    assert [item.description for item in record.items] == ["<廢鐵 HMS>"]
+    assert record.bulletin_fingerprint
+    assert record.status == "new"
+
+
+DETAIL = (
+    "<table><tr><th>機關名稱</th><td>臺北市政府</td></tr>"
+    "<tr><th>財物名稱</th><td>報廢電腦</td></tr>"
+    "<tr><th>公告日期</th><td>115/07/20</td></tr></table>"
+)
+SEARCH = (
+    "<table><tr><td>1</td><td>臺北市政府</td><td>A-1</td><td>1</td><td>電腦</td>"
+    "<td>115/07/20</td><td><a onclick=\"formViewNew(778,'x')\">檢視</a></td></tr></table>"
+)
+
+
+def test_reparse_pcc_uses_first_detail_page_with_assets(tmp_path: Path) -> None:
+    store = HtmlSnapshotStore(tmp_path, run_id="20260720T090000-pcc")
+    base = "https://web.pcc.gov.tw/opas/aspam/public/"
+    store.record(source="pcc", endpoint="readAspam", url=base + "readAspam", status=200, html=SEARCH)
+    with snapshot_case("778"):
+        for endpoint, html in (
+            ("readOneAspamDetailOld", "<html>查無資料</html>"),
+            ("readOneAspamDetailNew", DETAIL),
+        ):
+            store.record(source="pcc", endpoint=endpoint, url=base + endpoint, status=200, html=html)
+
+    (record,) = reparse_pcc_run(store, "20260720T090000-pcc", workers=1)
+
+    assert record.pk == "778"
+    assert record.case_no == "A-1"
+    assert record.assets_name == "報廢電腦"
+    assert record.detail_kind == "new"
+    assert record.source_url.endswith("readOneAspamDetailNew?pk=778")
+    assert record.status == "ok"
+
+
+def test_reparse_pcc_skips_cases_without_detail_snapshot(tmp_path: Path) -> None:
+    store = HtmlSnapshotStore(tmp_path, run_id="20260720T090000-pcc")
+    base = "https://web.pcc.gov.tw/opas/aspam/public/"
+    # 搜尋頁有 778、779 兩案，原執行只抓到 778 的詳情頁
+    search = SEARCH.replace("</table>", "") + (
+        "<tr><td>2</td><td>新北市政府</td><td>A-2</td><td>1</td><td>桌椅</td>"
+        "<td>115/07/20</td><td><a onclick=\"formViewNew(779,'x')\">檢視</a></td></tr></table>"
+    )
+    store.record(source="pcc", endpoint="readAspam", url=base + "readAspam", status=200, html=search)
+    with snapshot_case("778"):
+        store.record(
+            source="pcc",
+            endpoint="readOneAspamDetailNew",
+            url=base + "readOneAspamDetailNew",
+            status=200,
+            html=DETAIL,
+        )
+
+    records = reparse_pcc_run(store, "20260720T090000-pcc", workers=1)
+
+    assert [(r.pk, r.status) for r in records] == [("778", "ok")]
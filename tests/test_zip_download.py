@@ -0,0 +1,90 @@
+"""附件串流下載與 content-addressed store（本機 test server，不連外網）。"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from pathlib import Path
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.services.fpg_http_client import FpgHttpClient
+from app.services.request_policy import RateLimiter
+
+ZIP_BODY = b"PK\x03\x04" + b"x" * 300_000
+NOT_ZIP = b"<html>session expired</html>"
+ETAG = '"v1"'
+
+
+async def _ok(_request: web.Request) -> web.Response:
+    return web.Response(body=ZIP_BODY)
+
+
+async def _bad(_request: web.Request) -> web.Response:
+    return web.Response(body=NOT_ZIP)
+
+
+async def _etag(request: web.Request) -> web.Response:
+    if request.headers.get("If-None-Match") == ETAG:
+        return web.Response(status=304)
+    return web.Response(body=ZIP_BODY, headers={"ETag": ETAG})
+
+
+async def _download(tmp_path: Path, *calls: tuple[str, str]):
+    app = web.Application()
+    app.router.add_get("/ok.ZIP", _ok)
+    app.router.add_get("/bad.ZIP", _bad)
+    app.router.add_get("/etag.ZIP", _etag)
+    results = []
+    async with TestServer(app) as server:
+        for route, inqcnt in calls:
+            # 每次新 client：模擬不同次執行共用同一 store 索引
+            async with FpgHttpClient(
+                download_dir=tmp_path, rate_limiter=RateLimiter(0)
+            ) as client:
+                results.append(
+                    await client.download_zip(
+                        str(server.make_url(route)), "01-UT1", inqcnt
+                    )
+                )
+    return results
+
+
+def _files(root: Path) -> list[Path]:
+    return [p for p in root.rglob("*") if p.is_file()]
+
+
+def test_download_zip_streams_and_hashes(tmp_path: Path) -> None:
+    (result,) = asyncio.run(_download(tmp_path, ("/ok.ZIP", "")))
+    assert result is not None and not result.reused
+    assert result.path == tmp_path / "01-UT1.ZIP"
+    assert result.size == len(ZIP_BODY)
+    assert result.sha256 == hashlib.sha256(ZIP_BODY).hexdigest()
+    assert result.path.read_bytes() == ZIP_BODY
+    assert not list(tmp_path.rglob("*.part"))
+
+
+def test_download_zip_rejects_non_zip(tmp_path: Path) -> None:
+    assert asyncio.run(_download(tmp_path, ("/bad.ZIP", ""))) == [None]
+    assert _files(tmp_path) == []
+
+
+def test_conditional_request_skips_unchanged_body(tmp_path: Path) -> None:
+    first, second = asyncio.run(
+        _download(tmp_path, ("/etag.ZIP", "01"), ("/etag.ZIP", "02"))
+    )
+    assert not first.reused and second.reused
+    assert first.sha256 == second.sha256
+    # 兩輪詢價各有易讀檔名，實體 blob 只有一份
+    assert first.path.name == "01-UT1_01.ZIP"
+    assert second.path.name == "01-UT1_02.ZIP"
+    assert second.path.read_bytes() == ZIP_BODY
+    assert len(list((tmp_path / "store" / "blobs").rglob("*.zip"))) == 1
+
+
+def test_size_check_skips_when_server_has_no_validators(tmp_path: Path) -> None:
+    first, second = asyncio.run(
+        _download(tmp_path, ("/ok.ZIP", "01"), ("/ok.ZIP", "01"))
+    )
+    assert not first.reused and second.reused
+    assert second.size == len(ZIP_BODY)